@@ -1,14 +1,85 @@
-from flask import Flask, render_template, request
-import pickle
-import re
-import string
-from prometheus_client import Counter, Histogram, generate_latest, CollectorRegistry, CONTENT_TYPE_LATEST
 import time
-import spacy
-nlp = spacy.load("en_core_web_sm")
+# Taken before anything else is imported, so the startup metric covers the imports too.
+IMPORT_STARTED = time.perf_counter()
+
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
+import os
+import json
+import pickle
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CollectorRegistry, CONTENT_TYPE_LATEST, multiprocess
+from dataclasses import replace
+from functools import partial
+
+from flask_app.batching import MicroBatcher
+from flask_app.bundle import BundleError, read_bundle
+from flask_app.cache import PredictionCache
+from flask_app.normalizer import (DEFAULT_LEMMATIZER, DEFAULT_SPACY_MODEL, LEAN_PIPELINE_EXCLUDE, PREPROCESSOR_VERSION,
+                                  CachedLemmatizer, cache_lemmas, load_lemmatizer, tokenize)
+from flask_app.reloader import ModelBundle, ModelReloader, file_fingerprint
+from flask_app.scorer import compile_scorer, scorer_from_bundle
+from flask_app.startup import ResourceLoader
+from flask_app.streaming import iter_records, stream_predictions
+
+# Must be the lemmatizer the bundle was trained with, see flask_app/normalizer.py.
+LEMMATIZER = os.getenv('LEMMATIZER', DEFAULT_LEMMATIZER)
+LEMMA_CACHE_SIZE = int(os.getenv('LEMMA_CACHE_SIZE', 200_000))
+SPACY_MODEL = os.getenv('SPACY_MODEL', DEFAULT_SPACY_MODEL)
+SPACY_PIPELINE_MODE = os.getenv('SPACY_PIPELINE_MODE', 'lean')
+SPACY_BATCH_SIZE = int(os.getenv('SPACY_BATCH_SIZE', 64))
+SPACY_N_PROCESS = int(os.getenv('SPACY_N_PROCESS', 1))
+
+
+def load_nlp(model_name: str=SPACY_MODEL, mode: str=SPACY_PIPELINE_MODE):
+    """Loads the spaCy pipeline, 'lean' keeps only the components the lemmatizer needs, 'full' loads everything."""
+    import spacy
+
+    if mode == 'full':
+        return spacy.load(model_name)
+    if mode == 'lean':
+        return spacy.load(model_name, exclude=LEAN_PIPELINE_EXCLUDE)
+    raise ValueError(f"Unknown SPACY_PIPELINE_MODE '{mode}', expected 'lean' or 'full'")
+
+
+# Both are filled in by load_resources, so importing this module (and binding the port) stays fast.
+lemmatizer = None
+model_reloader = None
 
 app = Flask(__name__)
 
+MAX_BATCH_SIZE = int(os.getenv('PREDICT_BATCH_MAX_SIZE', 1000))
+STREAM_BATCH_SIZE = int(os.getenv('PREDICT_STREAM_BATCH_SIZE', 64))
+STREAM_MAX_LINE_BYTES = int(os.getenv('PREDICT_STREAM_MAX_LINE_BYTES', 1_000_000))
+SCORER_MODE = os.getenv('SCORER_MODE', 'compiled')
+PREDICTION_CACHE_SIZE = int(os.getenv('PREDICTION_CACHE_SIZE', 10000))
+PREDICTION_CACHE_TTL = float(os.getenv('PREDICTION_CACHE_TTL', 3600))
+MICRO_BATCH_ENABLED = os.getenv('MICRO_BATCH_ENABLED', 'false').lower() == 'true'
+MICRO_BATCH_MAX_SIZE = int(os.getenv('MICRO_BATCH_MAX_SIZE', 32))
+MICRO_BATCH_WAIT_MS = float(os.getenv('MICRO_BATCH_WAIT_MS', 5))
+MODELS_DIR = os.getenv('MODELS_DIR', 'models')
+MODEL_RELOAD_INTERVAL = float(os.getenv('MODEL_RELOAD_INTERVAL', 30))
+# Comma-separated histogram boundaries, the stage defaults resolve sub-millisecond work.
+STAGE_LATENCY_BUCKETS = [float(bucket) for bucket in os.getenv(
+    'STAGE_LATENCY_BUCKETS', '0.00005,0.0001,0.00025,0.0005,0.001,0.0025,0.005,0.01,0.025,0.05,0.1,0.25,0.5,1').split(',')]
+INPUT_LENGTH_BUCKETS = [float(bucket) for bucket in os.getenv(
+    'INPUT_LENGTH_BUCKETS', '100,250,500,1000,2000,4000,8000,16000').split(',')]
+# How long a prediction request waits for resources still loading before it gets a 503.
+READY_WAIT_SECONDS = float(os.getenv('READY_WAIT_SECONDS', 0))
+
+MODEL_BUNDLE_PATH = os.getenv('MODEL_BUNDLE_PATH', os.path.join(MODELS_DIR, 'model_bundle.bin'))
+PICKLE_FILES = [os.path.join(MODELS_DIR, file_name) for file_name in ('model.pkl', 'vectorizer.pkl', 'stopwords.pkl')]
+# Lemmas seen in training, written by data_transformation; the bundle carries its own copy.
+LEMMA_CACHE_FILE = os.path.join(MODELS_DIR, 'lemma_cache.json')
+# Serve from the single bundle when it was shipped, the three pickles are the fallback for local runs.
+MODEL_FILES = [MODEL_BUNDLE_PATH] if os.path.exists(MODEL_BUNDLE_PATH) else PICKLE_FILES
+SMOKE_TEXTS = ["This movie was wonderful, I loved every minute of it.", "A boring, badly acted waste of time."]
+WARMUP_TEXTS = SMOKE_TEXTS + [
+    "I went in with low expectations after the trailer, but the performances were subtle and the script "
+    "surprisingly sharp. The second half drags a little, yet the ending more than makes up for it. 8/10, "
+    "would watch again: https://www.imdb.com/"
+]
+# Prediction endpoints answer 503 until load_resources has finished.
+RESOURCE_ENDPOINTS = {'predict', 'predict_batch', 'predict_stream'}
+
 registry = CollectorRegistry()
 
 REQUEST_COUNT = Counter(
@@ -22,39 +93,305 @@ REQUEST_LATENCY = Histogram(
 PREDICTION_COUNT = Counter(
     "model_prediction_count", "Count of predictions for each class", ["prediction"], registry=registry
 )
+
+PREDICTION_CACHE_HITS = Counter(
+    "model_prediction_cache_hits", "Texts served from the prediction cache, including waits on an in-flight computation", registry=registry
+)
+
+PREDICTION_CACHE_MISSES = Counter(
+    "model_prediction_cache_misses", "Texts that had to be scored because they were not in the prediction cache", registry=registry
+)
+
+PREDICTION_CACHE_EVICTIONS = Counter(
+    "model_prediction_cache_evictions", "Entries removed from the prediction cache", ["reason"], registry=registry
+)
+
+MICRO_BATCH_QUEUE_DEPTH = Histogram(
+    "model_micro_batch_queue_depth", "Requests already queued when a /predict request joins the micro-batch queue",
+    buckets=(0, 1, 2, 4, 8, 16, 32, 64, 128), registry=registry
+)
+
+MICRO_BATCH_SIZE = Histogram(
+    "model_micro_batch_size", "Number of texts scored per micro-batch",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256), registry=registry
+)
+
+MODEL_RELOAD_COUNT = Counter(
+    "model_reload_count", "Hot reload attempts of the model bundle", ["result"], registry=registry
+)
+
+LEMMA_CACHE_HITS = Counter(
+    "model_lemma_cache_hits", "Tokens whose lemma was served from the lemma cache", registry=registry
+)
+
+LEMMA_CACHE_MISSES = Counter(
+    "model_lemma_cache_misses", "Tokens that had to be lemmatized because they were not in the lemma cache", registry=registry
+)
+
+LEMMA_CACHE_ENTRIES = Gauge(
+    "model_lemma_cache_entries", "Tokens held by the lemma cache, compare with LEMMA_CACHE_SIZE",
+    multiprocess_mode='max', registry=registry
+)
+
+STAGE_LATENCY = Histogram(
+    "model_stage_latency_seconds", "Time per inference stage and call: clean, lemmatize, vectorize, predict",
+    ["stage"], buckets=STAGE_LATENCY_BUCKETS, registry=registry
+)
+
+INPUT_LENGTH = Histogram(
+    "model_input_length_chars", "Length in characters of every text submitted for prediction",
+    buckets=INPUT_LENGTH_BUCKETS, registry=registry
+)
+
+STARTUP_SECONDS = Gauge(
+    "app_startup_seconds", "Seconds spent per startup stage, 'total' runs from the first import to ready",
+    ["stage"], multiprocess_mode='max', registry=registry
+)
+
+prediction_cache = PredictionCache(
+    max_size=PREDICTION_CACHE_SIZE,
+    ttl=PREDICTION_CACHE_TTL,
+    hits=PREDICTION_CACHE_HITS,
+    misses=PREDICTION_CACHE_MISSES,
+    evictions=PREDICTION_CACHE_EVICTIONS,
+)
+
+
+def build_scorer(vectorizer, model, mode: str=SCORER_MODE):
+    """Compiles vectorizer and model into a CompiledLinearScorer, returns None to use the sklearn path."""
+    if mode == 'sklearn':
+        return None
+    try:
+        return compile_scorer(vectorizer, model)
+    except ValueError as e:
+        app.logger.warning(f'Falling back to sklearn scoring, model cannot be compiled: {e}')
+        return None
+
+
+def load_bundle() -> ModelBundle:
+    """Loads the model bundle file if present, the three pickles otherwise."""
+    if MODEL_FILES == [MODEL_BUNDLE_PATH]:
+        return load_bundle_file()
+    return load_pickles()
+
+def load_bundle_file() -> ModelBundle:
+    """Loads the single versioned bundle exported by the training pipeline, no sklearn objects involved."""
+    version = file_fingerprint(MODEL_FILES)
+    metadata, arrays, content_hash = read_bundle(MODEL_BUNDLE_PATH)
+    
+    if metadata['preprocessor_version'] != PREPROCESSOR_VERSION:
+        raise BundleError(f"Bundle was trained with preprocessor {metadata['preprocessor_version']}, serving uses {PREPROCESSOR_VERSION}")
+    # Bundles exported before the lemmatizer was recorded were all trained with WordNet.
+    if metadata.get('lemmatizer', 'wordnet') != LEMMATIZER:
+        raise BundleError(f"Bundle was trained with the {metadata.get('lemmatizer', 'wordnet')} lemmatizer, serving uses {LEMMATIZER}")
+    if 'lemma_cache' in metadata and isinstance(lemmatizer, CachedLemmatizer):
+        lemmatizer.warm(metadata['lemma_cache'])
+    
+    app.logger.info(f'Loaded model bundle {content_hash[:12]} with {metadata["n_features"]} features')
+    return ModelBundle(
+        model=None,
+        vectorizer=None,
+        stopwords=frozenset(metadata['stopwords']),
+        scorer=scorer_from_bundle(metadata, arrays),
+        version=version,
+        n_features=metadata['n_features'],
+        classes=metadata['classes'],
+    )
+
+def load_pickles() -> ModelBundle:
+    """Loads model, vectorizer and stopwords pickles from MODELS_DIR into one ModelBundle."""
+    version = file_fingerprint(MODEL_FILES)
     
-with open('models/model.pkl', 'rb') as file:
-    model = pickle.load(file)
+    with open(PICKLE_FILES[0], 'rb') as file:
+        model = pickle.load(file)
+        
+    with open(PICKLE_FILES[1], 'rb') as file:
+        vectorizer = pickle.load(file)
+        
+    with open(PICKLE_FILES[2], 'rb') as file:
+        stopwords = pickle.load(file)
     
-with open('models/vectorizer.pkl', 'rb') as file:
-    vectorizer = pickle.load(file)
+    if os.path.exists(LEMMA_CACHE_FILE) and isinstance(lemmatizer, CachedLemmatizer):
+        with open(LEMMA_CACHE_FILE, 'r') as file:
+            lemmatizer.warm(json.load(file))
     
-with open('models/stopwords.pkl', 'rb') as file:
-    stopwords = pickle.load(file)
+    return ModelBundle(
+        model=model,
+        vectorizer=vectorizer,
+        stopwords=stopwords,
+        scorer=build_scorer(vectorizer, model),
+        version=version,
+        n_features=model.n_features_in_,
+        classes=model.classes_.tolist(),
+    )
+
+def validate_bundle(bundle: ModelBundle):
+    """Smoke-tests a freshly loaded bundle before it is allowed to serve traffic."""
+    labels, probabilities = score_texts(SMOKE_TEXTS, bundle=bundle)
+    if not all(label in bundle.classes for label in labels):
+        raise ValueError(f'Smoke prediction returned unknown labels {labels}')
+    if not all(0.0 <= probability <= 1.0 for probability in probabilities):
+        raise ValueError(f'Smoke prediction returned invalid probabilities {probabilities}')
+    if bundle.scorer is not None and bundle.model is not None:
+        reference, _ = score_texts(SMOKE_TEXTS, bundle=replace(bundle, scorer=None))
+        if reference != labels:
+            raise ValueError('Compiled scorer disagrees with the sklearn model on the smoke inputs')
+
+def current_bundle() -> ModelBundle:
+    if model_reloader is None and not resources.wait():
+        raise RuntimeError(f'Serving resources failed to load: {resources.error}')
+    return model_reloader.bundle
     
-def preprocess_text(text):
+def preprocess_text(text, bundle: ModelBundle=None):
     """Helper function to preprocess a single text string."""
-    text = re.sub(r'https?://\S+|www\.\S+', '', text)
-    text = re.sub(r'\d+', '', text)
-    text = text.lower()
-    text = re.sub(rf"[{re.escape(string.punctuation)}]", ' ', text)
-    text = text.replace('؛', "")
-    text = re.sub(r'\s+', ' ', text).strip()
-    text = ' '.join([word for word in text.split() if word not in stopwords])
-    text = ' '.join([token.lemma_ for token in nlp(text)])
+    bundle = bundle or current_bundle()
+    with STAGE_LATENCY.labels(stage='clean').time():
+        tokens = tokenize(text, bundle.stopwords)
+    with STAGE_LATENCY.labels(stage='lemmatize').time():
+        return ' '.join(lemmatizer.lemmatize(tokens))
+
+def preprocess_batch(texts, batch_size: int=SPACY_BATCH_SIZE, n_process: int=SPACY_N_PROCESS, bundle: ModelBundle=None):
+    """Preprocess a list of texts, lemmatizing them together (through nlp.pipe for the spaCy lemmatizer)."""
+    bundle = bundle or current_bundle()
+    with STAGE_LATENCY.labels(stage='clean').time():
+        token_lists = [tokenize(text, bundle.stopwords) for text in texts]
+    with STAGE_LATENCY.labels(stage='lemmatize').time():
+        lemma_lists = lemmatizer.lemmatize_many(token_lists, batch_size=batch_size, n_process=n_process)
+        return [' '.join(lemmas) for lemmas in lemma_lists]
+
+def vectorize(texts, bundle: ModelBundle):
+    """Vectorize preprocessed texts into a single sparse feature matrix."""
+    with STAGE_LATENCY.labels(stage='vectorize').time():
+        features = bundle.vectorizer.transform(texts)
+    if features.shape[1] != bundle.n_features:
+        raise ValueError(f"Model expects {bundle.n_features} features, vectorizer produced {features.shape[1]}")
+    return features
+
+def score_texts(texts, bundle: ModelBundle=None):
+    """Returns predicted labels and positive-class probabilities for a list of raw texts, bypassing the cache.
     
-    return text
+    The bundle is read once, so a reload in the middle of the call cannot mix versions.
+    """
+    bundle = bundle or current_bundle()
+    texts = preprocess_batch(texts, bundle=bundle)
     
-def inference_preprocess(text):
-    text = preprocess_text(text)
-    features = vectorizer.transform([text])
-    features_array = features.toarray()
-    assert features_array.shape[1] == 20, f"Expected 20 features, got {features_array.shape[1]}"
-    return features_array
+    if bundle.scorer is not None:
+        # The compiled scorer tokenizes and scores in one pass, there is no separate vectorize stage.
+        with STAGE_LATENCY.labels(stage='predict').time():
+            return bundle.scorer.predict(texts)
+    
+    model = bundle.model
+    features = vectorize(texts, bundle)
+    with STAGE_LATENCY.labels(stage='predict').time():
+        probabilities = model.predict_proba(features)
+    labels = model.classes_[probabilities.argmax(axis=1)]
+    positive_probabilities = probabilities[:, list(model.classes_).index(1)]
+    return labels.tolist(), positive_probabilities.tolist()
+
+def score_pairs(texts, bundle: ModelBundle=None):
+    """Returns a (label, probability) pair per text, the per-text shape used by the cache and the micro-batcher."""
+    return list(zip(*score_texts(texts, bundle=bundle)))
+
+
+def warmup(bundle: ModelBundle):
+    """Validates the first bundle and runs realistic texts through both preprocessing paths and the scorer.
+
+    The first calls into the lemmatizer and the scorer allocate lazily built state, warming up here keeps
+    that cost off the first real request. The prediction cache is bypassed.
+    """
+    validate_bundle(bundle)
+    score_texts(WARMUP_TEXTS, bundle=bundle)
+    preprocess_text(WARMUP_TEXTS[-1], bundle=bundle)
+
+def load_resources():
+    """Loads the lemmatizer and the model bundle, warms them up and records the time per stage."""
+    global lemmatizer, model_reloader
+    started = time.perf_counter()
+    lemmatizer = cache_lemmas(
+        load_lemmatizer(LEMMATIZER, nlp=load_nlp() if LEMMATIZER == 'spacy' else None),
+        max_size=LEMMA_CACHE_SIZE,
+        hits=LEMMA_CACHE_HITS,
+        misses=LEMMA_CACHE_MISSES,
+        entries=LEMMA_CACHE_ENTRIES,
+    )
+    STARTUP_SECONDS.labels(stage='lemmatizer').set(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    reloader = ModelReloader(
+        load_bundle=load_bundle,
+        validate=validate_bundle,
+        watch_paths=MODEL_FILES,
+        poll_interval=MODEL_RELOAD_INTERVAL,
+        on_swap=lambda bundle: prediction_cache.clear(),
+        reloads=MODEL_RELOAD_COUNT,
+    )
+    STARTUP_SECONDS.labels(stage='model').set(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    warmup(reloader.bundle)
+    STARTUP_SECONDS.labels(stage='warmup').set(time.perf_counter() - started)
+
+    # Published last, requests only see a reloader once it is warm.
+    model_reloader = reloader
+    STARTUP_SECONDS.labels(stage='total').set(time.perf_counter() - IMPORT_STARTED)
+    app.logger.info(f'Serving resources ready after {time.perf_counter() - IMPORT_STARTED:.2f}s')
+
+
+resources = ResourceLoader(load_resources)
+
+micro_batcher = MicroBatcher(
+    score_pairs,
+    max_batch_size=MICRO_BATCH_MAX_SIZE,
+    max_wait_ms=MICRO_BATCH_WAIT_MS,
+    queue_depth=MICRO_BATCH_QUEUE_DEPTH,
+    batch_size=MICRO_BATCH_SIZE,
+) if MICRO_BATCH_ENABLED else None
 
+def predict_texts(texts, micro_batch: bool=False):
+    """Returns predicted labels and positive-class probabilities, serving repeated texts from the prediction cache.
 
+    With micro_batch=True, cache misses are merged with other in-flight requests when micro-batching is enabled.
+    Cache entries are namespaced by model version, so a reload never serves predictions of the previous model.
+    """
+    bundle = current_bundle()
+    for text in texts:
+        INPUT_LENGTH.observe(len(text))
+    if micro_batch and micro_batcher is not None:
+        # scored with the bundle its cache namespace comes from, even if a reload lands before the batch runs
+        compute = partial(micro_batcher.submit, bundle=bundle)
+    else:
+        compute = partial(score_pairs, bundle=bundle)
+    results = prediction_cache.get_many(texts, compute, namespace=bundle.version)
+    return [label for label, _ in results], [probability for _, probability in results]
 
 
+@app.before_request
+def require_resources():
+    if request.endpoint not in RESOURCE_ENDPOINTS:
+        return None
+    if not resources.wait(timeout=READY_WAIT_SECONDS):
+        return jsonify(error='Model is not loaded yet'), 503, {'Retry-After': '5'}
+    # Started lazily so the polling thread lives in the serving process, not in a pre-fork master.
+    model_reloader.start()
+    return None
+
+
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    """Liveness: the process answers requests. Fails only if loading the resources failed, restarting is the fix then."""
+    if resources.failed:
+        return jsonify(status='failed', error=str(resources.error)), 500
+    return jsonify(status='ok')
+
+
+@app.route('/readyz', methods=['GET'])
+def readyz():
+    """Readiness: spaCy and the model are loaded and warmed up, the pod may receive traffic."""
+    if resources.ready:
+        return jsonify(status='ready', model_version=model_reloader.bundle.version)
+    status = 'failed' if resources.failed else 'loading'
+    return jsonify(status=status), 503
+
 
 @app.route('/')
 def home():
@@ -70,9 +407,8 @@ def predict():
     REQUEST_COUNT.labels(method='POST', endpoint='/predict').inc()
     start_time = time.time()
     text = request.form['text']
-    features_df = inference_preprocess(text)
-    result = model.predict(features_df)
-    prediction = result[0]
+    labels, _ = predict_texts([text], micro_batch=True)
+    prediction = labels[0]
     
     PREDICTION_COUNT.labels(prediction=str(prediction)).inc()
     
@@ -81,11 +417,72 @@ def predict():
     return render_template('index.html', result=prediction)
 
 
+@app.route('/predict/batch', methods=["POST"])
+def predict_batch():
+    """Score a JSON list of texts with one batched preprocessing pass and one scoring call.
+
+    Expects ``{"texts": ["...", ...]}`` and returns ``{"labels": [...], "probabilities": [...]}``
+    where each probability is that of the positive class.
+    """
+    REQUEST_COUNT.labels(method='POST', endpoint='/predict/batch').inc()
+    start_time = time.time()
+    payload = request.get_json(silent=True)
+    texts = payload.get('texts') if isinstance(payload, dict) else None
+    
+    if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+        return jsonify(error='Request body must be JSON of the form {"texts": ["...", ...]}'), 400
+    if len(texts) > MAX_BATCH_SIZE:
+        return jsonify(error=f'At most {MAX_BATCH_SIZE} texts can be scored per request'), 413
+    if not texts:
+        return jsonify(labels=[], probabilities=[])
+    
+    labels, probabilities = predict_texts(texts)
+    
+    for label in labels:
+        PREDICTION_COUNT.labels(prediction=str(label)).inc()
+    
+    REQUEST_LATENCY.labels(endpoint='/predict/batch').observe(time.time()-start_time)
+    
+    return jsonify(labels=labels, probabilities=probabilities)
+
+
+@app.route('/predict/stream', methods=["POST"])
+def predict_stream():
+    """Score an NDJSON upload of any size, streaming NDJSON predictions back batch by batch.
+
+    Every input line is a JSON string or ``{"text": "...", "id": ...}``; every output line is
+    ``{"line": n, "id": ..., "label": ..., "probability": ...}`` or ``{"line": n, "error": "..."}``
+    for a line that could not be scored. Chunked uploads are read as they arrive.
+    """
+    REQUEST_COUNT.labels(method='POST', endpoint='/predict/stream').inc()
+    start_time = time.time()
+    
+    def predict_and_count(texts):
+        labels, probabilities = predict_texts(texts)
+        for label in labels:
+            PREDICTION_COUNT.labels(prediction=str(label)).inc()
+        return labels, probabilities
+    
+    def generate():
+        records = iter_records(request.stream, max_line_bytes=STREAM_MAX_LINE_BYTES)
+        yield from stream_predictions(records, predict_and_count, batch_size=STREAM_BATCH_SIZE)
+        REQUEST_LATENCY.labels(endpoint='/predict/stream').observe(time.time()-start_time)
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
 @app.route('/metrics', methods=['GET'])
 def metrics():
     """Expose only custom Prometheus metrics."""
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        # Under the pre-fork server every worker writes its own metric files, aggregate them all.
+        multiprocess_registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(multiprocess_registry)
+        return generate_latest(multiprocess_registry), 200, {"Content-Type": CONTENT_TYPE_LATEST}
     return generate_latest(registry), 200, {"Content-Type": CONTENT_TYPE_LATEST}
 
 
 if __name__=="__main__":
-    app.run(host='0.0.0.0', port=5000)
\ No newline at end of file
+    # Bind right away and load in the background, /readyz reports when the model can serve.
+    resources.start(background=True)
+    app.run(host='0.0.0.0', port=int(os.getenv('PORT', 5000)))
\ No newline at end of file
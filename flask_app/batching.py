@@ -0,0 +1,109 @@
+import os
+import time
+import queue
+import threading
+from dataclasses import dataclass, field
+from concurrent.futures import Future
+
+
+@dataclass
+class _Request:
+    texts: list
+    kwargs: dict = field(default_factory=dict)
+    future: Future = field(default_factory=Future)
+
+    def batches_with(self, other: '_Request') -> bool:
+        """Requests share a batch only when their keyword arguments are the very same objects."""
+        return self.kwargs.keys() == other.kwargs.keys() and all(value is other.kwargs[name] for name, value in self.kwargs.items())
+
+
+class MicroBatcher:
+    """Merges concurrent scoring requests into small batches run by a single worker thread.
+
+    The worker takes the first queued request, then keeps collecting requests until
+    `max_batch_size` texts are gathered or `max_wait_ms` have passed, runs
+    `process_batch(texts, **kwargs)` once and hands every caller back its own slice of the results.
+    A request that would overflow the batch, or was submitted with other keyword arguments
+    (e.g. another model bundle), closes it and starts the next one.
+
+    Arguments:
+        process_batch: Callable taking a list of texts and the submitted keyword arguments, returning one result per text, in order.
+        max_batch_size(int): Maximum number of texts per batch, a single larger request is never split.
+        max_wait_ms(float): How long the worker waits for more requests after the first one arrives.
+        queue_depth, batch_size: Optional Prometheus histograms for the queue depth seen by each
+            request on arrival and the number of texts per executed batch.
+    """
+
+    def __init__(self, process_batch, max_batch_size: int=32, max_wait_ms: float=5, queue_depth=None, batch_size=None):
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue_depth = queue_depth
+        self._batch_size = batch_size
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+
+    def submit(self, texts: list, **kwargs) -> list:
+        """Queues texts for the next batch of requests with the same `kwargs` and blocks until their results are ready."""
+        request_queue = self._ensure_started()
+        request = _Request(texts=list(texts), kwargs=kwargs)
+        if self._queue_depth is not None:
+            self._queue_depth.observe(request_queue.qsize())
+        request_queue.put(request)
+        return request.future.result()
+
+    def _ensure_started(self) -> queue.Queue:
+        """Starts the worker thread on first use, and again in a forked child where it no longer exists."""
+        with self._lock:
+            if self._pid != os.getpid():
+                self._queue = queue.Queue()
+                self._pid = os.getpid()
+                worker = threading.Thread(target=self._run, args=(self._queue,), name='micro-batcher', daemon=True)
+                worker.start()
+            return self._queue
+
+    def _collect(self, request_queue: queue.Queue, carried: _Request=None) -> tuple:
+        """Starts from the carried request or blocks for the first one, then gathers more until the batch is full or the window closes.
+
+        Returns:
+            tuple: (batch, the request that did not fit and opens the next batch or None).
+        """
+        batch = [carried or request_queue.get()]
+        size = len(batch[0].texts)
+        deadline = time.monotonic() + self.max_wait
+
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = request_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if size + len(request.texts) > self.max_batch_size or not request.batches_with(batch[0]):
+                return batch, request
+            batch.append(request)
+            size += len(request.texts)
+
+        return batch, None
+
+    def _run(self, request_queue: queue.Queue) -> None:
+        carried = None
+        while True:
+            batch, carried = self._collect(request_queue, carried)
+            texts = [text for request in batch for text in request.texts]
+            if self._batch_size is not None:
+                self._batch_size.observe(len(texts))
+
+            try:
+                results = list(self.process_batch(texts, **batch[0].kwargs))
+            except Exception as e:
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+
+            offset = 0
+            for request in batch:
+                request.future.set_result(results[offset:offset + len(request.texts)])
+                offset += len(request.texts)
@@ -0,0 +1,148 @@
+import os
+import json
+import struct
+import hashlib
+
+import numpy as np
+
+
+BUNDLE_MAGIC = b'SNTBNDL1'
+BUNDLE_FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+# magic, then the header length as a little-endian uint64
+_PREAMBLE = struct.Struct('<8sQ')
+
+
+class BundleError(ValueError):
+    """Raised when a model bundle is malformed, corrupted or of an unsupported version."""
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _content_hash(metadata: dict, arrays: dict) -> str:
+    digest = hashlib.sha256(json.dumps(metadata, sort_keys=True).encode('utf-8'))
+    for name in sorted(arrays):
+        array = np.ascontiguousarray(arrays[name])
+        digest.update(f'{name}:{array.dtype.str}:{array.shape};'.encode('utf-8'))
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def write_bundle(file_path: str, metadata: dict, arrays: dict) -> str:
+    """Writes metadata and numeric arrays into one self-describing file and returns its content hash.
+
+    Layout: magic + header length, a JSON header (metadata, array table, content hash), then every
+    array as raw little-endian bytes at a 64-byte aligned offset so it can be memory-mapped.
+    The file is written to a temporary path and renamed, so readers never see a partial bundle.
+    """
+    arrays = {name: np.ascontiguousarray(array, dtype=np.asarray(array).dtype.newbyteorder('<')) for name, array in arrays.items()}
+
+    table, offset = {}, 0
+    for name in sorted(arrays):
+        table[name] = {'dtype': arrays[name].dtype.str, 'shape': list(arrays[name].shape), 'offset': offset}
+        offset = _align(offset + arrays[name].nbytes)
+
+    content_hash = _content_hash(metadata, arrays)
+    header = json.dumps({
+        'format_version': BUNDLE_FORMAT_VERSION,
+        'metadata': metadata,
+        'arrays': table,
+        'content_hash': content_hash,
+    }).encode('utf-8')
+    data_start = _align(_PREAMBLE.size + len(header))
+
+    os.makedirs(os.path.dirname(file_path) or '.', exist_ok=True)
+    tmp_path = f'{file_path}.tmp'
+    with open(tmp_path, 'wb') as file:
+        file.write(_PREAMBLE.pack(BUNDLE_MAGIC, len(header)))
+        file.write(header)
+        for name in sorted(arrays):
+            file.seek(data_start + table[name]['offset'])
+            file.write(arrays[name].tobytes())
+    os.replace(tmp_path, file_path)
+
+    return content_hash
+
+
+def read_bundle(file_path: str, mmap: bool=True, verify: bool=True) -> tuple[dict, dict, str]:
+    """Reads a bundle written by write_bundle.
+
+    Returns:
+        tuple: (metadata, arrays, content_hash). Arrays are read-only memory maps when `mmap` is True.
+
+    Raises:
+        BundleError: If the file is not a bundle, has an unsupported version or fails hash verification.
+    """
+    with open(file_path, 'rb') as file:
+        preamble = file.read(_PREAMBLE.size)
+        if len(preamble) != _PREAMBLE.size:
+            raise BundleError(f'{file_path} is too short to be a model bundle')
+        magic, header_length = _PREAMBLE.unpack(preamble)
+        if magic != BUNDLE_MAGIC:
+            raise BundleError(f'{file_path} is not a model bundle')
+        header = json.loads(file.read(header_length).decode('utf-8'))
+
+    if header['format_version'] != BUNDLE_FORMAT_VERSION:
+        raise BundleError(f"Unsupported bundle format version {header['format_version']}")
+
+    data_start = _align(_PREAMBLE.size + header_length)
+    arrays = {}
+    for name, spec in header['arrays'].items():
+        shape = tuple(spec['shape'])
+        if not mmap or 0 in shape:
+            with open(file_path, 'rb') as file:
+                file.seek(data_start + spec['offset'])
+                count = int(np.prod(shape))
+                arrays[name] = np.fromfile(file, dtype=spec['dtype'], count=count).reshape(shape)
+        else:
+            arrays[name] = np.memmap(file_path, dtype=spec['dtype'], mode='r', offset=data_start + spec['offset'], shape=shape)
+
+    if verify and _content_hash(header['metadata'], arrays) != header['content_hash']:
+        raise BundleError(f'{file_path} failed content hash verification')
+
+    return header['metadata'], arrays, header['content_hash']
+
+
+def export_linear_bundle(file_path: str, vectorizer, model, stopwords, preprocessor_version: str, lemmatizer: str='wordnet',
+                         lemma_cache: dict=None) -> str:
+    """Exports a fitted CountVectorizer or a HashingVectorizer, a binary linear model and the stopwords as one bundle.
+
+    Only what serving needs is kept: the vocabulary in column order (none for a HashingVectorizer,
+    whose columns serving recomputes from the hash), the weights, the tokenizer settings, the
+    stopwords and the lemmatizer backend the texts were normalized with, plus the lemmas seen in
+    training (CachedLemmatizer.export()) when given so serving starts with a warm lemma cache.
+    Returns the bundle's content hash.
+    """
+    metadata = {
+        'preprocessor_version': preprocessor_version,
+        'lemmatizer': lemmatizer,
+    }
+    if hasattr(vectorizer, 'vocabulary_'):
+        vocabulary = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+        if model.coef_.shape != (1, len(vocabulary)):
+            raise BundleError(f'Model coefficients {model.coef_.shape} do not match a vocabulary of {len(vocabulary)} terms')
+        metadata.update(vectorizer='count', n_features=len(vocabulary), vocabulary=vocabulary)
+    else:
+        if vectorizer.norm is not None:
+            raise BundleError('Only HashingVectorizers with norm=None can be bundled, a norm depends on the whole text')
+        if model.coef_.shape != (1, vectorizer.n_features):
+            raise BundleError(f'Model coefficients {model.coef_.shape} do not match {vectorizer.n_features} hashed features')
+        metadata.update(vectorizer='hashing', n_features=vectorizer.n_features, alternate_sign=vectorizer.alternate_sign)
+
+    metadata.update({
+        'classes': model.classes_.tolist(),
+        'token_pattern': vectorizer.token_pattern,
+        'lowercase': vectorizer.lowercase,
+        'stopwords': sorted(stopwords),
+        'model_class': type(model).__name__,
+    })
+    if lemma_cache is not None:
+        metadata['lemma_cache'] = lemma_cache
+    arrays = {
+        'coef': np.asarray(model.coef_[0], dtype=np.float64),
+        'intercept': np.asarray(model.intercept_, dtype=np.float64),
+    }
+    return write_bundle(file_path, metadata, arrays)
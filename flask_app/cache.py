@@ -0,0 +1,141 @@
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+_MISSING = object()
+
+
+class PredictionCache:
+    """Thread-safe LRU cache with an optional TTL for per-text predictions.
+
+    Keys are a hash of the whitespace-normalized text. Concurrent callers asking for a
+    text that is already being computed wait for that computation instead of repeating
+    it (single-flight).
+
+    Arguments:
+        max_size(int): Maximum number of cached entries, 0 disables caching.
+        ttl(float): Seconds an entry stays valid, 0 or None means entries never expire.
+        hits, misses, evictions: Optional Prometheus counters. `evictions` must have a `reason` label.
+        clock: Monotonic time source, injectable for tests.
+    """
+
+    def __init__(self, max_size: int=10000, ttl: float=None, hits=None, misses=None, evictions=None, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._hits = hits
+        self._misses = misses
+        self._evictions = evictions
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(text: str, namespace: str='') -> str:
+        """Hashes the text with runs of whitespace collapsed, which never changes the prediction."""
+        normalized = namespace + '\0' + ' '.join(text.split())
+        return hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_many(self, texts: list, compute_many, namespace: str='') -> list:
+        """Returns the cached value of every text, computing the misses with one `compute_many(missing_texts)` call.
+
+        `compute_many` must return one value per input text, in order. Entries from different
+        namespaces (e.g. model versions) never collide.
+        """
+        if not self.max_size:
+            self._count(self._misses, len(texts))
+            return list(compute_many(texts))
+
+        keys = [self.make_key(text, namespace) for text in texts]
+        results = [_MISSING] * len(texts)
+        owned = {}
+        waiting = {}
+
+        with self._lock:
+            for index, key in enumerate(keys):
+                if key in owned:
+                    owned[key].append(index)
+                    continue
+                if key in waiting:
+                    waiting[key][1].append(index)
+                    continue
+                value = self._lookup(key)
+                if value is not _MISSING:
+                    results[index] = value
+                elif key in self._in_flight:
+                    waiting[key] = (self._in_flight[key], [index])
+                else:
+                    self._in_flight[key] = Future()
+                    owned[key] = [index]
+
+        self._count(self._hits, len(texts) - len(owned))
+        self._count(self._misses, len(owned))
+
+        if owned:
+            self._compute(texts, owned, results, compute_many)
+
+        for future, indexes in waiting.values():
+            value = future.result()
+            for index in indexes:
+                results[index] = value
+
+        return results
+
+    def _compute(self, texts: list, owned: dict, results: list, compute_many) -> None:
+        """Computes the keys this caller owns and publishes them to the cache and to waiting callers."""
+        try:
+            values = list(compute_many([texts[indexes[0]] for indexes in owned.values()]))
+            if len(values) != len(owned):
+                raise ValueError(f'compute_many returned {len(values)} values for {len(owned)} texts')
+        except BaseException as e:
+            with self._lock:
+                for key in owned:
+                    self._in_flight.pop(key).set_exception(e)
+            raise
+
+        with self._lock:
+            for (key, indexes), value in zip(owned.items(), values):
+                self._store(key, value)
+                self._in_flight.pop(key).set_result(value)
+                for index in indexes:
+                    results[index] = value
+
+    def _lookup(self, key: str) -> object:
+        """Returns the live value for key or _MISSING, must be called with the lock held."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= self._clock():
+            del self._entries[key]
+            self._count(self._evictions, 1, reason='expired')
+            return _MISSING
+        self._entries.move_to_end(key)
+        return value
+
+    def _store(self, key: str, value: object) -> None:
+        """Inserts value and evicts least recently used entries, must be called with the lock held."""
+        expires_at = self._clock() + self.ttl if self.ttl else None
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._count(self._evictions, 1, reason='size')
+
+    @staticmethod
+    def _count(counter, amount: int, **labels) -> None:
+        if counter is None or not amount:
+            return
+        if labels:
+            counter = counter.labels(**labels)
+        counter.inc(amount)
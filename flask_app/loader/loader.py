@@ -23,6 +23,9 @@ os.makedirs('models', exist_ok=True)
 
 with open('models/model.pkl', 'wb') as file:
     pickle.dump(model, file)
+
+# Single versioned serving bundle (vocabulary, weights, stopwords) logged with the same run
+mlflow.artifacts.download_artifacts(run_id=run_id, artifact_path='model_bundle.bin', dst_path='models')
     
 
 
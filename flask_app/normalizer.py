@@ -0,0 +1,253 @@
+import os
+import re
+import string
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+
+# Bump whenever tokenize() or a lemmatizer backend changes its output: bundles record the version
+# they were trained with and serving refuses a bundle whose tokens it would not reproduce.
+PREPROCESSOR_VERSION = 'v1'
+DEFAULT_LEMMATIZER = 'wordnet'
+DEFAULT_SPACY_MODEL = 'en_core_web_sm'
+
+# Only token.lemma_ is used. The lemmatizer needs tok2vec -> tagger -> attribute_ruler,
+# so the dependency parser and NER can be left out of the pipeline entirely.
+LEAN_PIPELINE_EXCLUDE = ['parser', 'ner', 'senter']
+
+# URLs and digit runs are deleted in one scan. Everything else is C-level str methods:
+# punctuation becomes a separator, the Arabic semicolon is dropped, whitespace splits tokens.
+_STRIP_PATTERN = re.compile(r'https?://\S+|www\.\S+|\d+')
+_PUNCTUATION_TABLE = str.maketrans({**{char: ' ' for char in string.punctuation}, '؛': None})
+
+
+def tokenize(text: str, stopwords=frozenset()) -> list:
+    """Strips URLs, digits and punctuation, lowercases, splits on whitespace and drops stopwords."""
+    words = _STRIP_PATTERN.sub('', text).lower().translate(_PUNCTUATION_TABLE).split()
+    return [word for word in words if word not in stopwords]
+
+
+class WordNetLemmatizer:
+    """NLTK WordNet lemmatizer, context free: every token is lemmatized on its own as a noun."""
+
+    name = 'wordnet'
+    context_free = True
+
+    def __init__(self):
+        from nltk.stem import WordNetLemmatizer as NltkWordNetLemmatizer
+
+        self._lemmatize = NltkWordNetLemmatizer().lemmatize
+        # WordNet loads its corpus on first use, pay that here instead of on the first text.
+        self._lemmatize('movies')
+
+    def lemmatize(self, tokens: list) -> list:
+        lemmatize = self._lemmatize
+        return [lemmatize(token) for token in tokens]
+
+    def lemmatize_many(self, token_lists: list, batch_size: int=64, n_process: int=1) -> list:
+        return [self.lemmatize(tokens) for tokens in token_lists]
+
+
+class SpacyLemmatizer:
+    """spaCy lemmatizer over pre-split tokens, so token boundaries are the same as for every other backend.
+
+    Arguments:
+        nlp: Loaded spaCy pipeline containing a lemmatizer.
+    """
+
+    name = 'spacy'
+    # A token's lemma depends on its tagged part of speech, so lemmas cannot be cached per token.
+    context_free = False
+
+    def __init__(self, nlp):
+        from spacy.tokens import Doc
+
+        self.nlp = nlp
+        self._make_doc = lambda tokens: Doc(nlp.vocab, words=tokens)
+
+    def lemmatize(self, tokens: list) -> list:
+        return [token.lemma_ for token in self.nlp(self._make_doc(tokens))]
+
+    def lemmatize_many(self, token_lists: list, batch_size: int=64, n_process: int=1) -> list:
+        docs = self.nlp.pipe((self._make_doc(tokens) for tokens in token_lists), batch_size=batch_size, n_process=n_process)
+        return [[token.lemma_ for token in doc] for doc in docs]
+
+
+class IdentityLemmatizer:
+    """Keeps tokens as they are."""
+
+    name = 'none'
+    context_free = True
+
+    def lemmatize(self, tokens: list) -> list:
+        return list(tokens)
+
+    def lemmatize_many(self, token_lists: list, batch_size: int=64, n_process: int=1) -> list:
+        return [list(tokens) for tokens in token_lists]
+
+
+class CachedLemmatizer:
+    """Memoizes a context-free lemmatizer per token.
+
+    Review vocabularies are Zipfian: a few thousand distinct tokens make up most occurrences, so
+    almost every lookup is a dict hit. The cache admits new tokens until it holds `max_size`
+    entries and then only serves what it has, which keeps the hot path free of LRU bookkeeping.
+    It can be pre-warmed from tokens seen in training, see export() and warm().
+
+    Arguments:
+        lemmatizer: Backend to memoize, must be context free.
+        max_size(int): Maximum number of cached tokens.
+        hits, misses: Optional Prometheus counters incremented per looked up token.
+        entries: Optional Prometheus gauge set to the number of cached tokens.
+    """
+
+    context_free = True
+
+    def __init__(self, lemmatizer, max_size: int=200_000, hits=None, misses=None, entries=None):
+        if not lemmatizer.context_free:
+            raise ValueError(f"The '{lemmatizer.name}' lemmatizer depends on context and cannot be cached per token")
+        self.lemmatizer = lemmatizer
+        self.name = lemmatizer.name
+        self.max_size = max_size
+        self.lookups = 0
+        self.misses = 0
+        self._cache = {}
+        self._hits = hits
+        self._misses = misses
+        self._entries = entries
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @property
+    def hit_rate(self) -> float:
+        return 1 - self.misses / self.lookups if self.lookups else 0.0
+
+    def lemmatize(self, tokens: list) -> list:
+        cache = self._cache
+        lemmas = list(map(cache.get, tokens))
+        misses = 0
+        if None in lemmas:
+            for index, lemma in enumerate(lemmas):
+                if lemma is None:
+                    token = tokens[index]
+                    lemma = lemmas[index] = self.lemmatizer.lemmatize([token])[0]
+                    misses += 1
+                    if len(cache) < self.max_size:
+                        cache[token] = lemma
+        self._count(len(tokens), misses)
+        return lemmas
+
+    def lemmatize_many(self, token_lists: list, batch_size: int=64, n_process: int=1) -> list:
+        return [self.lemmatize(tokens) for tokens in token_lists]
+
+    def export(self, start: int=0) -> dict:
+        """Returns the cached lemmas in a compact JSON-able form, tokens that are their own lemma listed once.
+
+        With `start`, only the entries cached after the first `start` ones are exported.
+        """
+        same, changed = [], {}
+        for token, lemma in islice(self._cache.items(), start, None):
+            if token == lemma:
+                same.append(token)
+            else:
+                changed[token] = lemma
+        return {'lemmatizer': self.name, 'same': same, 'changed': changed}
+
+    def warm(self, exported: dict) -> None:
+        """Pre-fills the cache from export() output of the same backend, up to max_size."""
+        if exported.get('lemmatizer') != self.name:
+            raise ValueError(f"Cannot warm a {self.name} lemma cache with lemmas of {exported.get('lemmatizer')}")
+        cache = self._cache
+        for token, lemma in [*((token, token) for token in exported['same']), *exported['changed'].items()]:
+            if len(cache) >= self.max_size:
+                break
+            cache[token] = lemma
+        if self._entries is not None:
+            self._entries.set(len(cache))
+
+    def _count(self, lookups: int, misses: int) -> None:
+        self.lookups += lookups
+        self.misses += misses
+        if self._hits is not None:
+            self._hits.inc(lookups - misses)
+        if misses and self._misses is not None:
+            self._misses.inc(misses)
+        if misses and self._entries is not None:
+            self._entries.set(len(self._cache))
+
+
+def cache_lemmas(lemmatizer, max_size: int, **metrics):
+    """Wraps `lemmatizer` in a CachedLemmatizer when it is context free and max_size is positive."""
+    if max_size <= 0 or not lemmatizer.context_free:
+        return lemmatizer
+    return CachedLemmatizer(lemmatizer, max_size=max_size, **metrics)
+
+
+def load_lemmatizer(name: str=DEFAULT_LEMMATIZER, nlp=None):
+    """Returns the lemmatizer backend `name`. The 'spacy' backend uses `nlp` if given, the lean default pipeline otherwise."""
+    if name == 'wordnet':
+        return WordNetLemmatizer()
+    if name == 'spacy':
+        if nlp is None:
+            import spacy
+            nlp = spacy.load(DEFAULT_SPACY_MODEL, exclude=LEAN_PIPELINE_EXCLUDE)
+        return SpacyLemmatizer(nlp)
+    if name == 'none':
+        return IdentityLemmatizer()
+    raise ValueError(f"Unknown lemmatizer '{name}', expected 'wordnet', 'spacy' or 'none'")
+
+
+def normalize_text(text: str, stopwords, lemmatizer) -> str:
+    """Normalizes one text into the space-joined lemmas the vectorizer is fitted on."""
+    return ' '.join(lemmatizer.lemmatize(tokenize(text, stopwords)))
+
+
+def normalize_texts(texts: list, stopwords, lemmatizer, batch_size: int=64, n_process: int=1) -> list:
+    """Normalizes many texts, letting the lemmatizer batch them."""
+    token_lists = [tokenize(text, stopwords) for text in texts]
+    return [' '.join(lemmas) for lemmas in lemmatizer.lemmatize_many(token_lists, batch_size=batch_size, n_process=n_process)]
+
+
+# Set in every worker process by _init_worker.
+_worker_stopwords = None
+_worker_lemmatizer = None
+
+
+def _init_worker(stopwords, lemmatizer_name: str, lemma_cache_size: int) -> None:
+    global _worker_stopwords, _worker_lemmatizer
+    _worker_stopwords = stopwords
+    _worker_lemmatizer = cache_lemmas(load_lemmatizer(lemmatizer_name), max_size=lemma_cache_size)
+
+
+def _normalize_chunk(texts: list) -> tuple:
+    """Normalizes one chunk in a worker, returns the texts with the lemmas and counts it added to the worker's cache."""
+    lemmatizer = _worker_lemmatizer
+    if not isinstance(lemmatizer, CachedLemmatizer):
+        return normalize_texts(texts, _worker_stopwords, lemmatizer), None, 0, 0
+    cached, lookups, misses = len(lemmatizer), lemmatizer.lookups, lemmatizer.misses
+    normalized = normalize_texts(texts, _worker_stopwords, lemmatizer)
+    return normalized, lemmatizer.export(start=cached), lemmatizer.lookups - lookups, lemmatizer.misses - misses
+
+
+def normalize_texts_parallel(texts: list, stopwords, lemmatizer, n_jobs: int=-1, chunk_size: int=2000) -> list:
+    """Normalizes many texts across `n_jobs` worker processes (-1 for one per CPU), in input order.
+
+    Texts are split into chunks of `chunk_size` and every worker loads its own `lemmatizer` backend,
+    so the output is exactly that of normalize_texts(). With n_jobs 1, or a single chunk, it runs
+    here in the calling process. Lemmas the workers cache are merged back into `lemmatizer`.
+    """
+    n_jobs = os.cpu_count() if n_jobs is None or n_jobs < 0 else n_jobs
+    if n_jobs <= 1 or len(texts) <= chunk_size:
+        return normalize_texts(texts, stopwords, lemmatizer)
+
+    cached = isinstance(lemmatizer, CachedLemmatizer)
+    chunks = [texts[start:start + chunk_size] for start in range(0, len(texts), chunk_size)]
+    normalized = []
+    with ProcessPoolExecutor(max_workers=min(n_jobs, len(chunks)), initializer=_init_worker,
+                             initargs=(stopwords, lemmatizer.name, lemmatizer.max_size if cached else 0)) as executor:
+        for chunk, exported, lookups, misses in executor.map(_normalize_chunk, chunks):
+            normalized.extend(chunk)
+            if cached and exported is not None:
+                lemmatizer.warm(exported)
+                lemmatizer._count(lookups, misses)
+    return normalized
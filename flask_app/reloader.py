@@ -0,0 +1,116 @@
+import os
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+
+logger = logging.getLogger('Model Reloader')
+
+
+@dataclass(frozen=True)
+class ModelBundle:
+    """Everything a prediction needs, swapped as one reference so requests never mix versions."""
+    model: object
+    vectorizer: object
+    stopwords: set
+    scorer: object
+    version: str
+    n_features: int
+    classes: list
+
+
+def file_fingerprint(paths: list) -> str:
+    """Identifies the current contents of the watched files from their names, sizes and mtimes."""
+    digest = hashlib.blake2b(digest_size=8)
+    for path in paths:
+        stat = os.stat(path)
+        digest.update(f'{path}:{stat.st_size}:{stat.st_mtime_ns};'.encode())
+    return digest.hexdigest()
+
+
+class ModelReloader:
+    """Polls model files and swaps in a new bundle once it has loaded and passed validation.
+
+    A change is only picked up after the fingerprint has stayed the same for a full poll
+    interval, so a deploy that copies the files one by one is never loaded half-written.
+    A version that fails to load or validate is not retried until the files change again.
+    Loading and validation run on the polling thread; requests keep using the current
+    bundle until the new one replaces it in a single assignment.
+
+    Arguments:
+        load_bundle: Callable returning a new ModelBundle, its `version` must be `file_fingerprint(watch_paths)`.
+        validate: Callable raising if a freshly loaded bundle is unusable.
+        watch_paths(list): Files whose change triggers a reload.
+        poll_interval(float): Seconds between polls, 0 disables polling.
+        on_swap: Optional callable invoked with the new bundle after it goes live.
+        reloads: Optional Prometheus counter with a `result` label.
+    """
+
+    def __init__(self, load_bundle, validate, watch_paths: list, poll_interval: float=30, on_swap=None, reloads=None):
+        self._load_bundle = load_bundle
+        self._validate = validate
+        self.watch_paths = watch_paths
+        self.poll_interval = poll_interval
+        self._on_swap = on_swap
+        self._reloads = reloads
+        self._pending = None
+        self._rejected = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self.bundle = load_bundle()
+
+    def start(self) -> None:
+        """Starts the polling thread once per process, safe to call on every request."""
+        if not self.poll_interval or self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            thread = threading.Thread(target=self._run, name='model-reloader', daemon=True)
+            thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.poll_interval):
+            self.check_for_update()
+
+    def check_for_update(self) -> bool:
+        """Reloads if the watched files changed and have settled, returns True when a new bundle went live."""
+        try:
+            fingerprint = file_fingerprint(self.watch_paths)
+        except OSError as e:
+            logger.warning(f'Model files not readable, keeping version {self.bundle.version}: {e}')
+            return False
+
+        if fingerprint == self.bundle.version or fingerprint == self._rejected:
+            self._pending = None
+            return False
+        if fingerprint != self._pending:
+            self._pending = fingerprint
+            return False
+
+        try:
+            bundle = self._load_bundle()
+            self._validate(bundle)
+        except Exception as e:
+            logger.error(f'Rejected model version {fingerprint}, keeping {self.bundle.version}: {e}')
+            self._count('failed')
+            self._pending = None
+            self._rejected = fingerprint
+            return False
+
+        self.bundle = bundle
+        self._pending = None
+        self._count('success')
+        logger.info(f'Model version {bundle.version} is live')
+        if self._on_swap is not None:
+            self._on_swap(bundle)
+        return True
+
+    def _count(self, result: str) -> None:
+        if self._reloads is not None:
+            self._reloads.labels(result=result).inc()
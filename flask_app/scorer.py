@@ -0,0 +1,228 @@
+import re
+import json
+import math
+
+
+class CompiledLinearScorer:
+    """Scores texts with a CountVectorizer + binary linear model without going through sklearn.
+
+    The vectorizer vocabulary and the model coefficients are folded into a single
+    term -> weight dictionary, so scoring a text is a regex scan plus a dictionary
+    lookup per token. No sparse matrix or dense feature array is ever allocated.
+    """
+
+    def __init__(self, weights: dict, intercept: float, classes: list, token_pattern: str, lowercase: bool=True):
+        self.weights = weights
+        self.intercept = intercept
+        self.classes = classes
+        self.token_pattern = token_pattern
+        self.lowercase = lowercase
+        self._tokenize = re.compile(token_pattern).findall
+
+    @classmethod
+    def from_sklearn(cls, vectorizer, model) -> 'CompiledLinearScorer':
+        """Builds a scorer from a fitted CountVectorizer and a fitted binary linear classifier.
+
+        Raises:
+            ValueError: If the vectorizer or model uses options the scorer cannot reproduce.
+        """
+        if vectorizer.analyzer != 'word' or tuple(vectorizer.ngram_range) != (1, 1):
+            raise ValueError('Only word unigram vectorizers can be compiled')
+        if vectorizer.binary or vectorizer.preprocessor is not None or vectorizer.tokenizer is not None:
+            raise ValueError('Vectorizers with binary counts or a custom preprocessor/tokenizer cannot be compiled')
+        if vectorizer.stop_words is not None or vectorizer.strip_accents is not None:
+            raise ValueError('Vectorizers with stop_words or strip_accents cannot be compiled')
+        if model.coef_.shape[0] != 1 or len(model.classes_) != 2:
+            raise ValueError('Only binary linear models can be compiled')
+        if len(vectorizer.vocabulary_) != model.coef_.shape[1]:
+            raise ValueError(f'Vectorizer has {len(vectorizer.vocabulary_)} features but model expects {model.coef_.shape[1]}')
+
+        coef = model.coef_[0]
+        weights = {term: float(coef[index]) for term, index in vectorizer.vocabulary_.items() if coef[index] != 0.0}
+
+        return cls(
+            weights=weights,
+            intercept=float(model.intercept_[0]),
+            classes=model.classes_.tolist(),
+            token_pattern=vectorizer.token_pattern,
+            lowercase=vectorizer.lowercase,
+        )
+
+    @classmethod
+    def from_bundle(cls, metadata: dict, arrays: dict) -> 'CompiledLinearScorer':
+        """Builds a scorer from the metadata and arrays of a bundle written by export_linear_bundle."""
+        coef = arrays['coef'].tolist()
+        weights = {term: weight for term, weight in zip(metadata['vocabulary'], coef) if weight != 0.0}
+
+        return cls(
+            weights=weights,
+            intercept=float(arrays['intercept'][0]),
+            classes=metadata['classes'],
+            token_pattern=metadata['token_pattern'],
+            lowercase=metadata['lowercase'],
+        )
+
+    def decision_function(self, texts: list) -> list:
+        """Returns the raw linear score of every text."""
+        weights = self.weights
+        scores = []
+        for text in texts:
+            if self.lowercase:
+                text = text.lower()
+            score = self.intercept
+            for token in self._tokenize(text):
+                weight = weights.get(token)
+                if weight is not None:
+                    score += weight
+            scores.append(score)
+        return scores
+
+    def predict(self, texts: list) -> tuple[list, list]:
+        """Returns predicted labels and positive-class probabilities for a list of preprocessed texts."""
+        negative, positive = self.classes
+        labels, probabilities = [], []
+        for score in self.decision_function(texts):
+            labels.append(positive if score > 0 else negative)
+            probabilities.append(_sigmoid(score))
+        return labels, probabilities
+
+    def to_dict(self) -> dict:
+        return {
+            'weights': self.weights,
+            'intercept': self.intercept,
+            'classes': self.classes,
+            'token_pattern': self.token_pattern,
+            'lowercase': self.lowercase,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CompiledLinearScorer':
+        return cls(**data)
+
+    def save(self, file_path: str) -> None:
+        """Exports the scorer as JSON, loadable without sklearn."""
+        with open(file_path, 'w') as file:
+            json.dump(self.to_dict(), file)
+
+    @classmethod
+    def load(cls, file_path: str) -> 'CompiledLinearScorer':
+        with open(file_path, 'r') as file:
+            return cls.from_dict(json.load(file))
+
+
+class HashedLinearScorer(CompiledLinearScorer):
+    """Scores texts with a HashingVectorizer + binary linear model, stateless: there is no vocabulary.
+
+    A token's weight is the model coefficient at its hashed column, times the hash sign when
+    alternate_sign is on. Weights are computed on first sight of a token and memoized until
+    `max_cached_tokens` tokens are known, after which new tokens are hashed on every use.
+    """
+
+    def __init__(self, coef, intercept: float, classes: list, token_pattern: str, lowercase: bool=True, alternate_sign: bool=True,
+                 max_cached_tokens: int=200_000):
+        from sklearn.utils import murmurhash3_32
+
+        super().__init__(weights={}, intercept=intercept, classes=classes, token_pattern=token_pattern, lowercase=lowercase)
+        self.coef = coef
+        self.n_features = len(coef)
+        self.alternate_sign = alternate_sign
+        self.max_cached_tokens = max_cached_tokens
+        self._murmurhash = murmurhash3_32
+
+    @classmethod
+    def from_sklearn(cls, vectorizer, model) -> 'HashedLinearScorer':
+        """Builds a scorer from a HashingVectorizer and a fitted binary linear classifier.
+
+        Raises:
+            ValueError: If the vectorizer or model uses options the scorer cannot reproduce.
+        """
+        if vectorizer.analyzer != 'word' or tuple(vectorizer.ngram_range) != (1, 1):
+            raise ValueError('Only word unigram vectorizers can be compiled')
+        if vectorizer.binary or vectorizer.norm is not None or vectorizer.preprocessor is not None or vectorizer.tokenizer is not None:
+            raise ValueError('Hashing vectorizers with binary counts, a norm or a custom preprocessor/tokenizer cannot be compiled')
+        if vectorizer.stop_words is not None or vectorizer.strip_accents is not None:
+            raise ValueError('Vectorizers with stop_words or strip_accents cannot be compiled')
+        if model.coef_.shape[0] != 1 or len(model.classes_) != 2:
+            raise ValueError('Only binary linear models can be compiled')
+        if vectorizer.n_features != model.coef_.shape[1]:
+            raise ValueError(f'Vectorizer hashes into {vectorizer.n_features} features but model expects {model.coef_.shape[1]}')
+
+        return cls(
+            coef=model.coef_[0].tolist(),
+            intercept=float(model.intercept_[0]),
+            classes=model.classes_.tolist(),
+            token_pattern=vectorizer.token_pattern,
+            lowercase=vectorizer.lowercase,
+            alternate_sign=vectorizer.alternate_sign,
+        )
+
+    @classmethod
+    def from_bundle(cls, metadata: dict, arrays: dict) -> 'HashedLinearScorer':
+        """Builds a scorer from the metadata and arrays of a hashing bundle written by export_linear_bundle."""
+        return cls(
+            coef=arrays['coef'],
+            intercept=float(arrays['intercept'][0]),
+            classes=metadata['classes'],
+            token_pattern=metadata['token_pattern'],
+            lowercase=metadata['lowercase'],
+            alternate_sign=metadata['alternate_sign'],
+        )
+
+    def token_weight(self, token: str) -> float:
+        """Weight of a token, with the column and sign sklearn's HashingVectorizer gives it."""
+        hashed = self._murmurhash(token, seed=0)
+        weight = float(self.coef[abs(hashed) % self.n_features])
+        if self.alternate_sign and hashed < 0:
+            weight = -weight
+        return weight
+
+    def decision_function(self, texts: list) -> list:
+        weights = self.weights
+        scores = []
+        for text in texts:
+            if self.lowercase:
+                text = text.lower()
+            score = self.intercept
+            for token in self._tokenize(text):
+                weight = weights.get(token)
+                if weight is None:
+                    weight = self.token_weight(token)
+                    if len(weights) < self.max_cached_tokens:
+                        weights[token] = weight
+                score += weight
+            scores.append(score)
+        return scores
+
+    def to_dict(self) -> dict:
+        return {
+            'coef': [float(weight) for weight in self.coef],
+            'intercept': self.intercept,
+            'classes': self.classes,
+            'token_pattern': self.token_pattern,
+            'lowercase': self.lowercase,
+            'alternate_sign': self.alternate_sign,
+        }
+
+
+def compile_scorer(vectorizer, model) -> CompiledLinearScorer:
+    """Compiles a fitted CountVectorizer or a HashingVectorizer with a binary linear model."""
+    if hasattr(vectorizer, 'vocabulary_'):
+        return CompiledLinearScorer.from_sklearn(vectorizer, model)
+    if hasattr(vectorizer, 'alternate_sign'):
+        return HashedLinearScorer.from_sklearn(vectorizer, model)
+    raise ValueError(f'Cannot compile a {type(vectorizer).__name__}')
+
+
+def scorer_from_bundle(metadata: dict, arrays: dict) -> CompiledLinearScorer:
+    """Builds the scorer matching the vectorizer a bundle was exported with."""
+    if metadata.get('vectorizer', 'count') == 'hashing':
+        return HashedLinearScorer.from_bundle(metadata, arrays)
+    return CompiledLinearScorer.from_bundle(metadata, arrays)
+
+
+def _sigmoid(score: float) -> float:
+    """Numerically stable logistic function, matching scipy.special.expit."""
+    if score >= 0:
+        return 1.0 / (1.0 + math.exp(-score))
+    exp_score = math.exp(score)
+    return exp_score / (1.0 + exp_score)
@@ -0,0 +1,85 @@
+# Production entrypoint: a pre-fork gunicorn server that loads the model once in the master.
+#
+# The master imports flask_app.app and loads the model bundle and the spaCy pipeline in the
+# foreground, warmup included. The heap is then frozen (gc.freeze) so the garbage collector never
+# writes to those objects, and the workers are forked. Workers share the loaded read-only pages
+# copy-on-write instead of each holding its own copy, and are ready from their first request.
+#
+# With SERVER_PRELOAD=false the port is bound before anything heavy is loaded: every worker loads
+# its own copy in a background thread and answers /readyz with 503 until it is done. Faster to
+# bind, but the memory is no longer shared.
+#
+# Usage:
+#     python -m flask_app.server
+
+import gc
+import os
+import shutil
+
+from gunicorn.app.base import BaseApplication
+
+SERVER_BIND = os.getenv('SERVER_BIND', '0.0.0.0:5000')
+# One worker fits the pod's 256Mi limit and its 500m CPU, where a second worker adds memory but no throughput.
+SERVER_WORKERS = int(os.getenv('SERVER_WORKERS', 1))
+SERVER_THREADS = int(os.getenv('SERVER_THREADS', 4))
+SERVER_TIMEOUT = int(os.getenv('SERVER_TIMEOUT', 30))
+SERVER_PRELOAD = os.getenv('SERVER_PRELOAD', 'true').lower() == 'true'
+PROMETHEUS_MULTIPROC_DIR = os.getenv('PROMETHEUS_MULTIPROC_DIR', '/tmp/prometheus_multiproc')
+
+
+def child_exit(server, worker):
+    """Drops the live gauges of a dead worker from the shared Prometheus files."""
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+
+
+class PreforkServer(BaseApplication):
+    """Gunicorn application that preloads the Flask app in the master before forking workers."""
+
+    def __init__(self, options: dict=None):
+        self.options = options or {}
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from flask_app.app import app, resources
+
+        if not self.cfg.preload_app:
+            # Runs in each worker after the fork, a background thread is safe there.
+            resources.start(background=True)
+            return app
+
+        resources.start(background=False)
+        # Move everything loaded so far into the permanent generation, so collections in the
+        # workers never touch (and therefore never copy) the pages holding the model.
+        gc.collect()
+        gc.freeze()
+        return app
+
+
+def prepare_metrics_dir(path: str=PROMETHEUS_MULTIPROC_DIR) -> None:
+    """Points prometheus_client at a clean shared directory. Must run before prometheus_client is imported."""
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+    os.environ['PROMETHEUS_MULTIPROC_DIR'] = path
+
+
+def main():
+    prepare_metrics_dir()
+    options = {
+        'bind': SERVER_BIND,
+        'workers': SERVER_WORKERS,
+        'threads': SERVER_THREADS,
+        'worker_class': 'gthread',
+        'timeout': SERVER_TIMEOUT,
+        'preload_app': SERVER_PRELOAD,
+        'child_exit': child_exit,
+    }
+    PreforkServer(options).run()
+
+
+if __name__ == '__main__':
+    main()
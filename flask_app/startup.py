@@ -0,0 +1,57 @@
+import logging
+import threading
+
+logger = logging.getLogger('Startup')
+
+
+class ResourceLoader:
+    """Runs the one-off loading of heavy serving resources, in the background or in the caller's thread.
+
+    Arguments:
+        load: Callable doing the loading and warmup, any exception marks the loader as failed.
+    """
+
+    def __init__(self, load):
+        self._load = load
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._started = False
+        self.error = None
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set() and self.error is None
+
+    @property
+    def failed(self) -> bool:
+        return self._done.is_set() and self.error is not None
+
+    def start(self, background: bool=True) -> None:
+        """Starts loading once, later calls are no-ops. In the foreground this blocks until loading ends."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        if background:
+            threading.Thread(target=self._run, name='resource-loader', daemon=True).start()
+        else:
+            self._run()
+
+    def wait(self, timeout: float=None) -> bool:
+        """Returns True once resources are ready.
+
+        If nothing started loading yet, loading runs right here in the caller's thread; otherwise
+        this waits up to `timeout` seconds for the loading already in progress.
+        """
+        self.start(background=False)
+        self._done.wait(timeout)
+        return self.ready
+
+    def _run(self) -> None:
+        try:
+            self._load()
+        except Exception as e:
+            logger.exception(f'Loading serving resources failed: {e}')
+            self.error = e
+        finally:
+            self._done.set()
@@ -0,0 +1,75 @@
+import json
+
+
+def iter_records(stream, max_line_bytes: int=1_000_000):
+    """Yields (line_number, id, text, error) for every non-empty NDJSON line of a binary stream.
+
+    Each line is either a JSON string or an object with a "text" and an optional "id". Lines are
+    read one at a time and never more than `max_line_bytes` of a line is held, longer lines are
+    skipped and reported as errors instead of being buffered.
+    """
+    line_number = 0
+    while True:
+        line = stream.readline(max_line_bytes + 1)
+        if not line:
+            return
+        line_number += 1
+        if len(line) > max_line_bytes and not line.endswith(b'\n'):
+            while line and not line.endswith(b'\n'):
+                line = stream.readline(max_line_bytes + 1)
+            yield line_number, None, None, f'Line longer than {max_line_bytes} bytes'
+            continue
+        if not line.strip():
+            continue
+
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, None, f'Invalid JSON: {e}'
+            continue
+        if isinstance(record, str):
+            yield line_number, None, record, None
+        elif isinstance(record, dict) and isinstance(record.get('text'), str):
+            yield line_number, record.get('id'), record['text'], None
+        else:
+            yield line_number, None, None, 'Expected a JSON string or an object with a "text" string'
+
+
+def stream_predictions(records, predict, batch_size: int=64):
+    """Scores records in fixed-size batches and yields one NDJSON chunk per batch.
+
+    Only one batch of input and its output are alive at a time. The WSGI server pulls the next
+    chunk once the previous one is written to the socket, so a slow client stalls reading the
+    upload instead of making the server buffer results.
+
+    Arguments:
+        records: Iterable of (line_number, id, text, error) as produced by iter_records.
+        predict: Callable taking a list of texts and returning (labels, probabilities).
+        batch_size(int): Texts scored per call of `predict`.
+    """
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield _score_batch(batch, predict)
+            batch = []
+    if batch:
+        yield _score_batch(batch, predict)
+
+
+def _score_batch(batch: list, predict) -> bytes:
+    texts = [text for _, _, text, error in batch if error is None]
+    labels, probabilities = predict(texts) if texts else ([], [])
+    results = iter(zip(labels, probabilities))
+
+    lines = []
+    for line_number, record_id, _, error in batch:
+        output = {'line': line_number}
+        if record_id is not None:
+            output['id'] = record_id
+        if error is None:
+            output['label'], output['probability'] = next(results)
+        else:
+            output['error'] = error
+        lines.append(json.dumps(output))
+    return ('\n'.join(lines) + '\n').encode('utf-8')
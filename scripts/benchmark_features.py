@@ -0,0 +1,97 @@
+# Benchmark of the feature engineering artifacts: the former dense CSV vs the sparse .npz, as max_features grows.
+#
+# Usage (from the repo root):
+#     python -m scripts.benchmark_features --max-features 20 1000 10000 50000 --rows 25000
+#
+# Reviews of notebooks/IMDB.csv are repeated up to --rows. For every max_features both formats are written,
+# then loaded in a fresh process each, recording file size, load time and the loader's peak RSS. The dense
+# CSV is skipped above --max-dense-features, where it no longer fits comfortably in memory.
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import CountVectorizer
+
+from src.utils import save_sparse_features
+
+DATA_FILE_PATH = os.path.join('notebooks', 'IMDB.csv')
+
+# Run in a child process so its peak RSS covers nothing but the same imports plus the load itself.
+LOADER = '''
+import sys, time, resource
+fmt, path = sys.argv[1], sys.argv[2]
+import numpy as np, pandas as pd
+from src.utils import load_sparse_features
+start = time.perf_counter()
+if fmt == 'csv':
+    data = pd.read_csv(path)
+    X, y = data.iloc[:, :-1].values, data.iloc[:, -1].values
+else:
+    X, y, _ = load_sparse_features(path)
+seconds = time.perf_counter() - start
+try:
+    # VmHWM starts over at exec, ru_maxrss would also count the benchmark process it was forked from
+    with open('/proc/self/status') as status:
+        peak_kb = next(int(line.split()[1]) for line in status if line.startswith('VmHWM'))
+except OSError:
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(seconds, peak_kb)
+'''
+
+
+def measure_load(fmt: str, path: str) -> tuple[float, float]:
+    """Returns (load seconds, peak RSS in MB) of loading `path` in a fresh interpreter."""
+    output = subprocess.run([sys.executable, '-c', LOADER, fmt, path], capture_output=True, text=True, check=True).stdout
+    seconds, rss_kb = output.split()
+    return float(seconds), int(rss_kb) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark dense CSV vs sparse .npz feature artifacts.')
+    parser.add_argument('--max-features', type=int, nargs='+', default=[20, 1000, 5000, 20000])
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--max-dense-features', type=int, default=20000)
+    args = parser.parse_args()
+
+    data = pd.read_csv(DATA_FILE_PATH)
+    data = pd.concat([data] * (args.rows // len(data) + 1), ignore_index=True).iloc[:args.rows]
+    labels = (data['sentiment'] == 'positive').astype(int).values
+
+    tmp_dir = tempfile.mkdtemp()
+    results = []
+    try:
+        for max_features in args.max_features:
+            vectorizer = CountVectorizer(max_features=max_features)
+            features = vectorizer.fit_transform(data['review'])
+
+            npz_path = os.path.join(tmp_dir, f'{max_features}.npz')
+            save_sparse_features(npz_path, features, labels, vectorizer.get_feature_names_out())
+            seconds, rss_mb = measure_load('npz', npz_path)
+            results.append({'max_features': features.shape[1], 'format': 'sparse npz', 'size_mb': os.path.getsize(npz_path) / 2**20,
+                            'load_s': seconds, 'peak_rss_mb': rss_mb})
+
+            if max_features <= args.max_dense_features:
+                csv_path = os.path.join(tmp_dir, f'{max_features}.csv')
+                dense = pd.DataFrame(features.toarray())
+                dense['label'] = labels
+                dense.to_csv(csv_path, index=False)
+                del dense
+                seconds, rss_mb = measure_load('csv', csv_path)
+                results.append({'max_features': features.shape[1], 'format': 'dense csv', 'size_mb': os.path.getsize(csv_path) / 2**20,
+                                'load_s': seconds, 'peak_rss_mb': rss_mb})
+    finally:
+        shutil.rmtree(tmp_dir)
+
+    print(f'{args.rows} rows')
+    print(pd.DataFrame(results).round(3).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+# Benchmark of model evaluation: the former predict + predict_proba + four sklearn metrics vs the single-pass engine.
+#
+# Usage (from the repo root):
+#     python -m scripts.benchmark_metrics --rows 200000 --bootstrap 1000 --naive-bootstrap 50
+#
+# A LogisticRegression is trained on 800 hashed IMDB reviews; the other 200, repeated up to --rows, form the test set.
+# The engine scores the features file chunk by chunk and computes the metrics, the threshold sweep and --bootstrap
+# confidence intervals. For scale, --naive-bootstrap replicates are also computed by resampling rows and calling the
+# sklearn metric functions on each replicate.
+
+import os
+import time
+import shutil
+import argparse
+import tempfile
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
+
+from src.utils import load_sparse_features, save_sparse_features
+from src.utils.metrics import evaluate_scores, score_features_file
+from flask_app.normalizer import IdentityLemmatizer, normalize_texts
+
+DATA_FILE_PATH = os.path.join('notebooks', 'IMDB.csv')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the single-pass metrics engine.')
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--bootstrap', type=int, default=1000)
+    parser.add_argument('--naive-bootstrap', type=int, default=50)
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    args = parser.parse_args()
+
+    data = pd.read_csv(DATA_FILE_PATH)
+    texts = normalize_texts(data['review'].astype(str).tolist(), set(), IdentityLemmatizer())
+    labels = (data['sentiment'] == 'positive').astype(int).values
+    vectorizer = HashingVectorizer(n_features=2**18, alternate_sign=False, norm=None)
+    model = LogisticRegression(max_iter=1000).fit(vectorizer.transform(texts[:800]), labels[:800])
+    repeats = [800 + index % 200 for index in range(args.rows)]
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        file_path = os.path.join(tmp_dir, 'test.npz')
+        save_sparse_features(file_path, vectorizer.transform(texts)[repeats], labels[repeats], [])
+
+        start = time.perf_counter()
+        X_test, y_test, _ = load_sparse_features(file_path)
+        y_pred = model.predict(X_test)
+        y_pred_proba = model.predict_proba(X_test)[:, 1]
+        before = [accuracy_score(y_test, y_pred), precision_score(y_test, y_pred), recall_score(y_test, y_pred), roc_auc_score(y_test, y_pred_proba)]
+        before_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        y_test, scores = score_features_file(model, file_path, chunk_size=args.chunk_size)
+        scoring_seconds = time.perf_counter() - start
+        report = evaluate_scores(y_test, scores, n_bootstrap=0)
+        metrics_seconds = time.perf_counter() - start - scoring_seconds
+        start = time.perf_counter()
+        evaluate_scores(y_test, scores, n_bootstrap=args.bootstrap)
+        bootstrap_seconds = time.perf_counter() - start
+    finally:
+        shutil.rmtree(tmp_dir)
+
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    for _ in range(args.naive_bootstrap):
+        rows = rng.integers(0, len(y_test), len(y_test))
+        y_rows, predicted = y_test[rows], (scores[rows] > 0.5).astype(int)
+        [accuracy_score(y_rows, predicted), precision_score(y_rows, predicted), recall_score(y_rows, predicted),
+         f1_score(y_rows, predicted), roc_auc_score(y_rows, scores[rows])]
+    naive_seconds = time.perf_counter() - start
+
+    assert np.allclose(before, [report['accuracy'], report['precision'], report['recall'], report['auc']])
+    print(f'{args.rows} test rows')
+    print(pd.DataFrame([
+        {'step': 'before: predict + predict_proba + 4 metrics', 'seconds': before_seconds},
+        {'step': f'engine: chunked scoring ({args.chunk_size} rows)', 'seconds': scoring_seconds},
+        {'step': 'engine: 5 metrics + 101-point threshold sweep', 'seconds': metrics_seconds},
+        {'step': f'engine: all of the above + {args.bootstrap} bootstrap CIs', 'seconds': bootstrap_seconds},
+        {'step': f'sklearn: {args.naive_bootstrap} bootstrap replicates', 'seconds': naive_seconds},
+    ]).round(3).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
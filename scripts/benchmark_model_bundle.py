@@ -0,0 +1,73 @@
+# Compare the three serving pickles with the single model bundle: size on disk and cold load time
+#
+# Usage (from the repo root, after the model_training stage has written models/):
+#     python -m scripts.benchmark_model_bundle --repeats 20
+#
+# Every load runs in a fresh interpreter so import and page-cache effects are the same for both.
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+import pandas as pd
+
+MODELS_DIR = 'models'
+PICKLE_FILES = [os.path.join(MODELS_DIR, file_name) for file_name in ('model.pkl', 'vectorizer.pkl', 'stopwords.pkl')]
+BUNDLE_FILE = os.path.join(MODELS_DIR, 'model_bundle.bin')
+
+# the clock starts before any import: unpickling pulls in sklearn, the bundle only needs numpy
+LOAD_PICKLES = """
+import time
+start = time.perf_counter()
+import pickle
+for path in {paths!r}:
+    with open(path, 'rb') as file:
+        pickle.load(file)
+print(time.perf_counter() - start)
+"""
+
+LOAD_BUNDLE = """
+import time
+start = time.perf_counter()
+from flask_app.bundle import read_bundle
+from flask_app.scorer import scorer_from_bundle
+metadata, arrays, _ = read_bundle({path!r})
+scorer_from_bundle(metadata, arrays)
+print(time.perf_counter() - start)
+"""
+
+
+def cold_load_ms(code: str, repeats: int) -> float:
+    """Median load time in ms over `repeats` fresh interpreters."""
+    timings = []
+    for _ in range(repeats):
+        completed = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        timings.append(float(completed.stdout.strip()) * 1000)
+    return round(float(pd.Series(timings).median()), 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare pickled serving artifacts with the model bundle.')
+    parser.add_argument('--repeats', type=int, default=20, help='Fresh interpreters per format.')
+    args = parser.parse_args()
+
+    results = [
+        {
+            'format': 'pickles (model + vectorizer + stopwords)',
+            'size_bytes': sum(os.path.getsize(path) for path in PICKLE_FILES),
+            'cold_load_ms': cold_load_ms(LOAD_PICKLES.format(paths=PICKLE_FILES), args.repeats),
+        },
+        {
+            'format': 'model_bundle.bin',
+            'size_bytes': os.path.getsize(BUNDLE_FILE),
+            'cold_load_ms': cold_load_ms(LOAD_BUNDLE.format(path=BUNDLE_FILE), args.repeats),
+        },
+    ]
+    print(pd.DataFrame(results).to_string(index=False))
+    print(json.dumps(results))
+
+
+if __name__ == '__main__':
+    main()
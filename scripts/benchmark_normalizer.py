@@ -0,0 +1,93 @@
+# Microbenchmark of text normalization: the former five regex passes vs the single-pass tokenizer,
+# and the per-review cost of every lemmatizer backend that is installed, with and without the lemma cache.
+# End-to-end normalization is also timed across a process pool as data transformation runs it,
+# pool startup included, so small inputs do not profit.
+#
+# Usage (from the repo root):
+#     python -m scripts.benchmark_normalizer --reviews 1000 --repeats 5 --n-jobs 4
+
+import os
+import re
+import time
+import string
+import argparse
+
+import pandas as pd
+
+from flask_app.normalizer import CachedLemmatizer, load_lemmatizer, normalize_texts, normalize_texts_parallel, tokenize
+
+DATA_FILE_PATH = os.path.join('notebooks', 'IMDB.csv')
+BACKENDS = ('none', 'wordnet', 'spacy')
+
+
+def legacy_clean(text: str, stopwords) -> list:
+    text = re.sub(r'https?://\S+|www\.\S+', '', text)
+    text = re.sub(r'\d+', '', text)
+    text = text.lower()
+    text = re.sub(rf"[{re.escape(string.punctuation)}]", ' ', text)
+    text = text.replace('؛', "")
+    text = re.sub(r'\s+', ' ', text).strip()
+    return [word for word in text.split() if word not in stopwords]
+
+
+def us_per_review(function, reviews: list, repeats: int) -> float:
+    """Best of `repeats` runs over all reviews, in microseconds per review."""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(reviews)
+        best = min(best, time.perf_counter() - start)
+    return round(1e6 * best / len(reviews), 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark text normalization per review.')
+    parser.add_argument('--reviews', type=int, default=1000)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--n-jobs', type=int, default=os.cpu_count(), help='Worker processes of the parallel run.')
+    parser.add_argument('--chunk-size', type=int, default=250)
+    args = parser.parse_args()
+
+    reviews = pd.read_csv(DATA_FILE_PATH)['review'].astype(str).tolist()[:args.reviews]
+    stopwords = set(pd.read_pickle(os.path.join('models', 'stopwords.pkl'))) if os.path.exists(os.path.join('models', 'stopwords.pkl')) else set()
+
+    results = [
+        {'step': 'clean: five regex passes', 'us_per_review': us_per_review(lambda texts: [legacy_clean(text, stopwords) for text in texts], reviews, args.repeats)},
+        {'step': 'clean: single-pass tokenize', 'us_per_review': us_per_review(lambda texts: [tokenize(text, stopwords) for text in texts], reviews, args.repeats)},
+    ]
+
+    token_lists = [tokenize(review, stopwords) for review in reviews]
+    for backend in BACKENDS:
+        try:
+            lemmatizer = load_lemmatizer(backend)
+        except (ImportError, LookupError, OSError) as e:
+            print(f'Skipping the {backend} lemmatizer, it is not installed: {type(e).__name__}')
+            continue
+        results.append({
+            'step': f'lemmatize: {backend}',
+            'us_per_review': us_per_review(lambda texts: lemmatizer.lemmatize_many(token_lists), reviews, args.repeats),
+        })
+        if lemmatizer.context_free:
+            # best of the repeats, i.e. a warm cache as after pre-warming from training
+            cached = CachedLemmatizer(lemmatizer)
+            results.append({
+                'step': f'lemmatize: {backend} + lemma cache',
+                'us_per_review': us_per_review(lambda texts: cached.lemmatize_many(token_lists), reviews, args.repeats),
+            })
+        results.append({
+            'step': f'normalize: {backend}, serial',
+            'us_per_review': us_per_review(lambda texts: normalize_texts(texts, stopwords, lemmatizer), reviews, args.repeats),
+        })
+        results.append({
+            'step': f'normalize: {backend}, n_jobs={args.n_jobs}',
+            'us_per_review': us_per_review(
+                lambda texts: normalize_texts_parallel(texts, stopwords, lemmatizer, n_jobs=args.n_jobs, chunk_size=args.chunk_size),
+                reviews, args.repeats
+            ),
+        })
+
+    print(pd.DataFrame(results).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+# Benchmark the spaCy lemmatizer backend of serving: full vs lean pipeline, per-call nlp() vs nlp.pipe
+#
+# Usage (from the repo root):
+#     python -m scripts.benchmark_preprocessing --reviews 500 --batch-size 64
+#
+# Serving defaults to LEMMATIZER=wordnet; this measures the pipeline LEMMATIZER=spacy would load. No model
+# bundle is loaded, a bundle trained with another lemmatizer would be rejected, so texts run through the
+# serving tokenizer and the spaCy lemmatizer alone, with the stopwords of models/stopwords.pkl if present.
+# Every pipeline mode is measured in its own fresh interpreter so the resident memory numbers are not
+# polluted by the other mode.
+
+import os
+import sys
+import json
+import time
+import pickle
+import argparse
+import subprocess
+
+import pandas as pd
+
+DATA_FILE_PATH = os.path.join('notebooks', 'IMDB.csv')
+STOPWORDS_FILE_PATH = os.path.join('models', 'stopwords.pkl')
+MODES = ('full', 'lean')
+
+
+def rss_mb() -> float:
+    """Resident set size of the current process in MiB."""
+    import psutil
+    return psutil.Process().memory_info().rss / (1024 * 1024)
+
+
+def run_worker(n_reviews: int, batch_size: int, n_process: int) -> dict:
+    """Loads the spaCy pipeline of the current SPACY_PIPELINE_MODE the way serving does and times both preprocessing paths."""
+    from flask_app.app import load_nlp
+    from flask_app.normalizer import load_lemmatizer, normalize_text, normalize_texts
+
+    stopwords = set()
+    if os.path.exists(STOPWORDS_FILE_PATH):
+        with open(STOPWORDS_FILE_PATH, 'rb') as file:
+            stopwords = pickle.load(file)
+
+    baseline_rss = rss_mb()
+    start = time.perf_counter()
+    lemmatizer = load_lemmatizer('spacy', nlp=load_nlp())
+    load_seconds = time.perf_counter() - start
+    loaded_rss = rss_mb()
+
+    reviews = pd.read_csv(DATA_FILE_PATH)['review'].astype(str).tolist()[:n_reviews]
+
+    # warm up so first-call allocations are not billed to either path
+    normalize_texts(reviews[:8], stopwords, lemmatizer, batch_size=batch_size)
+
+    start = time.perf_counter()
+    for review in reviews:
+        normalize_text(review, stopwords, lemmatizer)
+    single_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    normalize_texts(reviews, stopwords, lemmatizer, batch_size=batch_size, n_process=n_process)
+    pipe_seconds = time.perf_counter() - start
+
+    return {
+        'mode': os.environ['SPACY_PIPELINE_MODE'],
+        'pipe_names': lemmatizer.nlp.pipe_names,
+        'reviews': len(reviews),
+        'load_seconds': round(load_seconds, 3),
+        'rss_before_load_mb': round(baseline_rss, 1),
+        'rss_after_load_mb': round(loaded_rss, 1),
+        'peak_rss_mb': round(rss_mb(), 1),
+        'single_ms_per_review': round(1000 * single_seconds / len(reviews), 3),
+        'pipe_ms_per_review': round(1000 * pipe_seconds / len(reviews), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark serving text preprocessing.')
+    parser.add_argument('--reviews', type=int, default=500, help='Number of IMDB reviews to preprocess.')
+    parser.add_argument('--batch-size', type=int, default=64, help='nlp.pipe batch size.')
+    parser.add_argument('--n-process', type=int, default=1, help='nlp.pipe process count.')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.reviews, args.batch_size, args.n_process)))
+        return
+
+    results = []
+    for mode in MODES:
+        env = dict(os.environ, SPACY_PIPELINE_MODE=mode)
+        completed = subprocess.run(
+            [sys.executable, '-m', 'scripts.benchmark_preprocessing', '--worker',
+             '--reviews', str(args.reviews), '--batch-size', str(args.batch_size), '--n-process', str(args.n_process)],
+            env=env, capture_output=True, text=True, check=True
+        )
+        results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    columns = ['mode', 'load_seconds', 'rss_after_load_mb', 'peak_rss_mb', 'single_ms_per_review', 'pipe_ms_per_review']
+    print(pd.DataFrame(results)[columns].to_string(index=False))
+    for result in results:
+        print(f"{result['mode']}: {result['pipe_names']}")
+
+
+if __name__ == '__main__':
+    main()
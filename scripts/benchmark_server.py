@@ -0,0 +1,112 @@
+# Benchmark the Werkzeug dev server against the pre-fork production server
+#
+# Usage (from the repo root, with models/ populated):
+#     python -m scripts.benchmark_server --workers 2 --concurrency 8 --duration 20
+#
+# Each server is started in its own process tree, driven with concurrent POST /predict requests
+# of real IMDB reviews, and its memory is sampled while under load. RSS is summed over the
+# master and its workers, which double counts shared pages; PSS splits shared pages between the
+# processes that map them and is the number to compare for copy-on-write sharing.
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import psutil
+
+DATA_FILE_PATH = os.path.join('notebooks', 'IMDB.csv')
+PORT = 5055
+
+
+def wait_until_up(url: str, timeout: float=120) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return
+        except OSError:
+            time.sleep(0.25)
+    raise TimeoutError(f'Server at {url} did not come up within {timeout}s')
+
+
+def tree_memory_mb(pid: int) -> tuple[float, float]:
+    """Returns (summed RSS, summed PSS) in MiB of a process and all its children."""
+    root = psutil.Process(pid)
+    rss = pss = 0
+    for process in [root, *root.children(recursive=True)]:
+        info = process.memory_full_info()
+        rss += info.rss
+        pss += getattr(info, 'pss', info.rss)
+    return rss / (1024 * 1024), pss / (1024 * 1024)
+
+
+def drive_load(url: str, reviews: list, concurrency: int, duration: float) -> dict:
+    """Sends POST /predict requests from `concurrency` threads for `duration` seconds."""
+    deadline = time.monotonic() + duration
+
+    def worker(offset: int) -> int:
+        sent = 0
+        while time.monotonic() < deadline:
+            body = urllib.parse.urlencode({'text': reviews[(offset + sent) % len(reviews)]}).encode()
+            urllib.request.urlopen(url, data=body, timeout=30).read()
+            sent += 1
+        return sent
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        total = sum(executor.map(worker, range(0, concurrency * 997, 997)))
+    return {'requests': total, 'throughput_rps': round(total / (time.monotonic() - start), 1)}
+
+
+def run_server(name: str, command: list, env: dict, reviews: list, args) -> dict:
+    process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        base_url = f'http://127.0.0.1:{PORT}'
+        wait_until_up(base_url + '/readyz')
+        idle_rss, idle_pss = tree_memory_mb(process.pid)
+        result = drive_load(base_url + '/predict', reviews, args.concurrency, args.duration)
+        loaded_rss, loaded_pss = tree_memory_mb(process.pid)
+        return {
+            'server': name,
+            **result,
+            'idle_rss_mb': round(idle_rss, 1),
+            'idle_pss_mb': round(idle_pss, 1),
+            'loaded_rss_mb': round(loaded_rss, 1),
+            'loaded_pss_mb': round(loaded_pss, 1),
+        }
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare dev server and pre-fork server throughput and memory.')
+    parser.add_argument('--workers', type=int, default=2, help='Pre-fork worker count.')
+    parser.add_argument('--threads', type=int, default=4, help='Threads per pre-fork worker.')
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrent client threads.')
+    parser.add_argument('--duration', type=float, default=20, help='Seconds of load per server.')
+    args = parser.parse_args()
+
+    reviews = pd.read_csv(DATA_FILE_PATH)['review'].astype(str).tolist()
+    # caching would turn repeated reviews into dictionary lookups and hide the serving cost
+    env = dict(os.environ, PORT=str(PORT), PREDICTION_CACHE_SIZE='0')
+
+    results = [
+        run_server('dev (single process)', [sys.executable, '-m', 'flask_app.app'], env, reviews, args),
+        run_server(
+            f'prefork ({args.workers}x{args.threads})', [sys.executable, '-m', 'flask_app.server'],
+            dict(env, SERVER_BIND=f'127.0.0.1:{PORT}', SERVER_WORKERS=str(args.workers), SERVER_THREADS=str(args.threads)),
+            reviews, args
+        ),
+    ]
+    print(pd.DataFrame(results).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
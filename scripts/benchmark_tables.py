@@ -0,0 +1,66 @@
+# Benchmark of the pipeline's table format: CSV as the stages used to exchange it vs save_table/load_table Parquet.
+#
+# Usage (from the repo root):
+#     python -m scripts.benchmark_tables --rows 50000 --repeats 5
+#
+# The IMDB reviews (repeated up to --rows) are written as CSV with the pandas index, as data transformation
+# used to write them, and as zstd Parquet with explicit dtypes. Reported are file size and the best-of-repeats
+# time to load the whole table and only the labels.
+
+import os
+import time
+import shutil
+import argparse
+import tempfile
+
+import pandas as pd
+
+from src.utils import load_table, save_table
+from src.constants import TRANSFORMED_DATA_DTYPES
+
+DATA_FILE_PATH = os.path.join('notebooks', 'IMDB.csv')
+
+
+def best_seconds(function, repeats: int) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CSV vs Parquet pipeline tables.')
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    data = pd.read_csv(DATA_FILE_PATH)
+    data = pd.concat([data] * (args.rows // len(data) + 1), ignore_index=True).iloc[:args.rows]
+    data['sentiment'] = (data['sentiment'] == 'positive').astype(int)
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        csv_path = os.path.join(tmp_dir, 'train.csv')
+        parquet_path = os.path.join(tmp_dir, 'train.parquet')
+        data.to_csv(csv_path)
+        save_table(data, parquet_path, dtypes=TRANSFORMED_DATA_DTYPES)
+
+        results = [
+            {'format': 'csv (with index)', 'size_mb': os.path.getsize(csv_path) / 2**20,
+             'load_all_s': best_seconds(lambda: pd.read_csv(csv_path), args.repeats),
+             'load_labels_s': best_seconds(lambda: pd.read_csv(csv_path, usecols=['sentiment']), args.repeats)},
+            {'format': 'parquet zstd', 'size_mb': os.path.getsize(parquet_path) / 2**20,
+             'load_all_s': best_seconds(lambda: load_table(parquet_path), args.repeats),
+             'load_labels_s': best_seconds(lambda: load_table(parquet_path, columns=['sentiment']), args.repeats)},
+        ]
+    finally:
+        shutil.rmtree(tmp_dir)
+
+    print(f'{args.rows} rows')
+    print(pd.DataFrame(results).round(4).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+# Benchmark of model training: the in-memory LogisticRegression fit vs out-of-core SGD over feature chunks.
+#
+# Usage (from the repo root):
+#     python -m scripts.benchmark_training --rows 200000 --epochs 5 --chunk-size 10000
+#
+# The first 800 IMDB reviews, repeated up to --rows, are hashed into a sparse features file; the last 200
+# are the test set. Each trainer runs in a fresh interpreter with the settings of params.yaml, reporting
+# wall time, test accuracy and the process's peak RSS (VmHWM, imports included).
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from src.utils import save_sparse_features
+from src.entity.config_entity import ModelTrainerConfig
+from flask_app.normalizer import IdentityLemmatizer, normalize_texts
+
+DATA_FILE_PATH = os.path.join('notebooks', 'IMDB.csv')
+
+TRAINER = '''
+import sys, json, time
+mode, train_path, test_path, settings = sys.argv[1], sys.argv[2], sys.argv[3], json.loads(sys.argv[4])
+from sklearn.linear_model import LogisticRegression
+from src.utils import load_sparse_features
+from src.components.model_training import train_out_of_core
+start = time.perf_counter()
+if mode == 'in_memory':
+    X, y, _ = load_sparse_features(train_path)
+    model = LogisticRegression(**settings['model_params']).fit(X, y)
+else:
+    model = train_out_of_core(train_path, settings['sgd_params'], settings['epochs'], settings['chunk_size'])
+seconds = time.perf_counter() - start
+X_test, y_test, _ = load_sparse_features(test_path)
+with open('/proc/self/status') as status:
+    peak_kb = next(int(line.split()[1]) for line in status if line.startswith('VmHWM'))
+print(json.dumps({'seconds': seconds, 'accuracy': model.score(X_test, y_test), 'peak_rss_mb': peak_kb / 1024}))
+'''
+
+
+def main():
+    config = ModelTrainerConfig()
+    parser = argparse.ArgumentParser(description='Benchmark in-memory vs out-of-core model training.')
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--n-features', type=int, default=2**18)
+    parser.add_argument('--epochs', type=int, default=config.epochs)
+    parser.add_argument('--chunk-size', type=int, default=config.chunk_size)
+    args = parser.parse_args()
+
+    data = pd.read_csv(DATA_FILE_PATH)
+    texts = normalize_texts(data['review'].astype(str).tolist(), set(), IdentityLemmatizer())
+    labels = (data['sentiment'] == 'positive').astype(int).values
+    vectorizer = HashingVectorizer(n_features=args.n_features, alternate_sign=False, norm=None)
+    train_features, test_features = vectorizer.transform(texts[:800]), vectorizer.transform(texts[800:])
+    repeats = [index % 800 for index in range(args.rows)]
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        train_path, test_path = os.path.join(tmp_dir, 'train.npz'), os.path.join(tmp_dir, 'test.npz')
+        save_sparse_features(train_path, train_features[repeats], labels[:800][repeats], [])
+        save_sparse_features(test_path, test_features, labels[800:], [])
+        settings = json.dumps({'model_params': config.model_params, 'sgd_params': config.sgd_params,
+                               'epochs': args.epochs, 'chunk_size': args.chunk_size})
+
+        results = []
+        for mode in ('in_memory', 'out_of_core'):
+            output = subprocess.run([sys.executable, '-c', TRAINER, mode, train_path, test_path, settings],
+                                    capture_output=True, text=True, check=True).stdout
+            results.append({'mode': mode, **json.loads(output.strip().splitlines()[-1])})
+    finally:
+        shutil.rmtree(tmp_dir)
+
+    print(f'{args.rows} rows, {args.n_features} hashed features, {args.epochs} epochs of {args.chunk_size}-row chunks')
+    print(pd.DataFrame(results).round(3).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+# Benchmark of hyperparameter search: the successive-halving tuning stage vs a naive GridSearchCV over the same grid.
+#
+# Usage (from the repo root):
+#     python -m scripts.benchmark_tuning --rows 20000 --max-features 5000 --n-jobs 1
+#
+# The IMDB reviews, repeated up to --rows, are vectorized once into a sparse features file. Both searches use the
+# C grid, penalties, solvers and folds of params.yaml; the grid fits every candidate on every fold of all the rows.
+# Repeated reviews land in training and validation folds alike, so only the cost of the searches is compared.
+
+import os
+import time
+import shutil
+import argparse
+import tempfile
+
+import pandas as pd
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import GridSearchCV, StratifiedKFold
+
+from src.utils import save_sparse_features
+from src.entity.config_entity import HyperparameterTuningConfig
+from src.components.hyperparameter_tuning import successive_halving_search
+from flask_app.normalizer import IdentityLemmatizer, normalize_texts
+
+DATA_FILE_PATH = os.path.join('notebooks', 'IMDB.csv')
+
+
+def main():
+    config = HyperparameterTuningConfig()
+    parser = argparse.ArgumentParser(description='Benchmark the tuning stage against a naive grid search.')
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--max-features', type=int, default=5000)
+    parser.add_argument('--n-jobs', type=int, default=config.n_jobs)
+    args = parser.parse_args()
+
+    data = pd.read_csv(DATA_FILE_PATH)
+    texts = normalize_texts(data['review'].astype(str).tolist(), set(), IdentityLemmatizer())
+    labels = (data['sentiment'] == 'positive').astype(int).values
+    repeats = [index % len(texts) for index in range(args.rows)]
+    features = CountVectorizer(max_features=args.max_features).fit_transform(texts)[repeats]
+    labels = labels[repeats]
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        file_path = os.path.join(tmp_dir, 'train.npz')
+        save_sparse_features(file_path, features, labels, [])
+
+        start = time.perf_counter()
+        report = successive_halving_search(file_path, C_grid=config.C_grid, solvers=config.solvers, cv=config.cv,
+                                           halving_factor=config.halving_factor, min_samples=config.min_samples,
+                                           max_iter=config.max_iter, scoring=config.scoring, n_jobs=args.n_jobs)
+        halving_seconds = time.perf_counter() - start
+    finally:
+        shutil.rmtree(tmp_dir)
+
+    grid = [{'penalty': [penalty], 'solver': [solver], 'C': config.C_grid} for penalty, solver in config.solvers.items()]
+    search = GridSearchCV(LogisticRegression(max_iter=config.max_iter), grid, scoring=config.scoring, n_jobs=args.n_jobs,
+                          cv=StratifiedKFold(n_splits=config.cv, shuffle=True, random_state=42))
+    start = time.perf_counter()
+    search.fit(features, labels)
+    grid_seconds = time.perf_counter() - start
+
+    results = [
+        {'search': 'successive halving', 'seconds': halving_seconds, 'fitted rows': report['fitted_rows']},
+        {'search': 'naive grid', 'seconds': grid_seconds, 'fitted rows': report['grid_fitted_rows']},
+    ]
+    print(f'{args.rows} rows, {features.shape[1]} features, {len(grid) * len(config.C_grid)} candidates, {config.cv} folds, n_jobs={args.n_jobs}')
+    print(pd.DataFrame(results).round(3).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+# HTTP load test of the Flask service with a stored latency/throughput baseline
+#
+# Usage (from the repo root, with models/ populated):
+#     python -m scripts.load_test --concurrency 8 --duration 20
+#     python -m scripts.load_test --update-baseline      # after an intended performance change
+#
+# Starts the service locally (the pre-fork server by default), waits for /readyz, then drives every
+# endpoint in turn from `concurrency` client threads with real IMDB reviews. Throughput and
+# p50/p95/p99 latency per endpoint are written to a JSON report and compared with the baseline:
+# the script exits with status 1 if any endpoint got slower than the tolerance allows.
+#
+# Baselines only compare on the same hardware and settings, the report records both. The prediction
+# cache is disabled so repeated reviews are scored every time.
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import subprocess
+import http.client
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from scripts.benchmark_server import wait_until_up
+
+DATA_FILE_PATH = os.path.join('notebooks', 'IMDB.csv')
+REPORT_FILE_PATH = os.path.join('reports', 'load_test.json')
+BASELINE_FILE_PATH = os.path.join('reports', 'load_test_baseline.json')
+HOST = '127.0.0.1'
+PORT = 5056
+ENDPOINTS = ('/predict', '/predict/batch', '/predict/stream')
+# Latencies may grow and throughput may shrink by this fraction before it counts as a regression.
+DEFAULT_TOLERANCE = 0.25
+
+
+def build_request(endpoint: str, reviews: list, index: int, batch_size: int) -> tuple[bytes, str]:
+    """Returns (body, content type) of the index-th request to an endpoint."""
+    if endpoint == '/predict':
+        return urllib.parse.urlencode({'text': reviews[index % len(reviews)]}).encode(), 'application/x-www-form-urlencoded'
+    texts = [reviews[(index * batch_size + offset) % len(reviews)] for offset in range(batch_size)]
+    if endpoint == '/predict/batch':
+        return json.dumps({'texts': texts}).encode(), 'application/json'
+    return ''.join(json.dumps(text) + '\n' for text in texts).encode(), 'application/x-ndjson'
+
+
+def drive_endpoint(endpoint: str, reviews: list, concurrency: int, duration: float, warmup: float, batch_size: int) -> dict:
+    """Sends requests from `concurrency` keep-alive clients, latencies of the warmup period are dropped."""
+    measure_from = time.monotonic() + warmup
+    deadline = measure_from + duration
+
+    def client(offset: int) -> tuple[list, int]:
+        connection = http.client.HTTPConnection(HOST, PORT, timeout=60)
+        latencies, errors, sent = [], 0, 0
+        while time.monotonic() < deadline:
+            body, content_type = build_request(endpoint, reviews, offset + sent, batch_size)
+            sent += 1
+            start = time.monotonic()
+            try:
+                connection.request('POST', endpoint, body=body, headers={'Content-Type': content_type})
+                response = connection.getresponse()
+                response.read()
+                ok = response.status == 200
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                ok = False
+            if start >= measure_from:
+                if ok:
+                    latencies.append(time.monotonic() - start)
+                else:
+                    errors += 1
+        connection.close()
+        return latencies, errors
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(client, range(0, concurrency * 997, 997)))
+
+    latencies = [latency for client_latencies, _ in results for latency in client_latencies]
+    errors = sum(client_errors for _, client_errors in results)
+    texts_per_request = 1 if endpoint == '/predict' else batch_size
+    return summarize(latencies, errors, duration, texts_per_request)
+
+
+def summarize(latencies: list, errors: int, duration: float, texts_per_request: int=1) -> dict:
+    """Throughput and latency percentiles (ms) of one endpoint run."""
+    if not latencies:
+        return {'requests': 0, 'errors': errors, 'throughput_rps': 0.0, 'texts_per_second': 0.0,
+                'p50_ms': None, 'p95_ms': None, 'p99_ms': None}
+    p50, p95, p99 = np.percentile(np.asarray(latencies) * 1000, [50, 95, 99])
+    throughput = len(latencies) / duration
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput_rps': round(throughput, 2),
+        'texts_per_second': round(throughput * texts_per_request, 2),
+        'p50_ms': round(float(p50), 2),
+        'p95_ms': round(float(p95), 2),
+        'p99_ms': round(float(p99), 2),
+    }
+
+
+def compare_to_baseline(report: dict, baseline: dict, tolerance: float=DEFAULT_TOLERANCE) -> list:
+    """Returns a message per regression of an endpoint present in both the report and the baseline."""
+    regressions = []
+    for endpoint, current in report['endpoints'].items():
+        previous = baseline['endpoints'].get(endpoint)
+        if previous is None:
+            continue
+        if current['errors'] > previous['errors']:
+            regressions.append(f"{endpoint}: {current['errors']} errors, baseline had {previous['errors']}")
+        if current['throughput_rps'] < previous['throughput_rps'] * (1 - tolerance):
+            regressions.append(f"{endpoint}: throughput {current['throughput_rps']} rps, baseline {previous['throughput_rps']} rps")
+        for key in ('p50_ms', 'p95_ms', 'p99_ms'):
+            if previous[key] is None:
+                continue
+            if current[key] is None or current[key] > previous[key] * (1 + tolerance):
+                regressions.append(f"{endpoint}: {key} {current[key]}, baseline {previous[key]}")
+    return regressions
+
+
+def start_server(server: str, workers: int, threads: int) -> subprocess.Popen:
+    env = dict(os.environ, PORT=str(PORT), PREDICTION_CACHE_SIZE='0', SERVER_BIND=f'{HOST}:{PORT}',
+               SERVER_WORKERS=str(workers), SERVER_THREADS=str(threads))
+    module = 'flask_app.server' if server == 'prefork' else 'flask_app.app'
+    return subprocess.Popen([sys.executable, '-m', module], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the Flask service and compare with a stored baseline.')
+    parser.add_argument('--server', choices=('prefork', 'dev'), default='prefork')
+    parser.add_argument('--workers', type=int, default=2, help='Pre-fork worker count.')
+    parser.add_argument('--threads', type=int, default=4, help='Threads per pre-fork worker.')
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrent client connections.')
+    parser.add_argument('--duration', type=float, default=20, help='Measured seconds per endpoint.')
+    parser.add_argument('--warmup', type=float, default=3, help='Unmeasured seconds of load before each endpoint run.')
+    parser.add_argument('--batch-size', type=int, default=32, help='Reviews per /predict/batch and /predict/stream request.')
+    parser.add_argument('--endpoints', nargs='+', choices=ENDPOINTS, default=list(ENDPOINTS))
+    parser.add_argument('--report', default=REPORT_FILE_PATH)
+    parser.add_argument('--baseline', default=BASELINE_FILE_PATH)
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--update-baseline', action='store_true', help='Store this run as the new baseline.')
+    args = parser.parse_args()
+
+    reviews = pd.read_csv(DATA_FILE_PATH)['review'].astype(str).tolist()
+    report = {
+        'settings': {key: getattr(args, key) for key in ('server', 'workers', 'threads', 'concurrency', 'duration', 'batch_size')},
+        'machine': {'cpu_count': os.cpu_count(), 'platform': platform.platform(), 'python': platform.python_version()},
+        'endpoints': {},
+    }
+
+    process = start_server(args.server, args.workers, args.threads)
+    try:
+        wait_until_up(f'http://{HOST}:{PORT}/readyz')
+        for endpoint in args.endpoints:
+            report['endpoints'][endpoint] = drive_endpoint(endpoint, reviews, args.concurrency, args.duration, args.warmup, args.batch_size)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+    print(pd.DataFrame.from_dict(report['endpoints'], orient='index').to_string())
+    os.makedirs(os.path.dirname(args.report) or '.', exist_ok=True)
+    with open(args.report, 'w') as file:
+        json.dump(report, file, indent=4)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as file:
+            json.dump(report, file, indent=4)
+        print(f'Baseline written to {args.baseline}')
+        return
+    if not os.path.exists(args.baseline):
+        print(f'No baseline at {args.baseline}, run with --update-baseline to create one')
+        return
+
+    with open(args.baseline, 'r') as file:
+        baseline = json.load(file)
+    if baseline['settings'] != report['settings'] or baseline['machine']['cpu_count'] != report['machine']['cpu_count']:
+        print('Warning: baseline was recorded with different settings or hardware, comparison may be meaningless')
+    regressions = compare_to_baseline(report, baseline, args.tolerance)
+    if regressions:
+        print('PERFORMANCE REGRESSION against baseline:')
+        for regression in regressions:
+            print(f'  {regression}')
+        sys.exit(1)
+    print(f'No regression against {args.baseline} (tolerance {args.tolerance:.0%})')
+
+
+if __name__ == '__main__':
+    main()
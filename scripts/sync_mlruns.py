@@ -0,0 +1,42 @@
+# Syncs runs logged offline to the local tracking directory (model_evaluation.offline, or no DagsHub credentials)
+# to the DagsHub MLflow server.
+#
+# Usage (from the repo root, with DAGSHUB_USERNAME and DAGSHUB_TOKEN set):
+#     python -m scripts.sync_mlruns [--register]
+#
+# Every run not synced yet is recreated remotely with its params, metrics, tags and artifacts. With --register the
+# model of the newest synced run is registered under the model name and alias of the evaluation stage.
+
+import argparse
+
+import mlflow
+from mlflow.tracking import MlflowClient
+
+from src.utils.mlflow_logger import resolve_tracking_uri, sync_runs
+from src.entity.config_entity import ModelEvaluationConfig
+from src.components.model_evaluation import ModelEvaluation, dagshub_tracking_uri
+
+
+def main():
+    config = ModelEvaluationConfig()
+    parser = argparse.ArgumentParser(description='Sync offline MLflow runs to the remote tracking server.')
+    parser.add_argument('--register', action='store_true', help='register the model of the newest synced run')
+    args = parser.parse_args()
+
+    remote_uri = dagshub_tracking_uri()
+    if remote_uri is None:
+        raise SystemExit('DAGSHUB_USERNAME and DAGSHUB_TOKEN must be set to sync runs')
+
+    local_client = MlflowClient(tracking_uri=resolve_tracking_uri(local_tracking_dir=config.local_tracking_dir))
+    synced = sync_runs(local_client, MlflowClient(tracking_uri=remote_uri), config.experiment_name, max_workers=config.upload_workers)
+    print(f'{len(synced)} run(s) synced')
+
+    if args.register and synced:
+        mlflow.set_tracking_uri(remote_uri)
+        model_info = {'run_id': synced[-1][1], 'model_path': config.model_artifact_path}
+        ModelEvaluation(model_trainer_artifact=None, feature_engineering_artifact=None, model_evaluation_config=config).register_model(
+            model_name=config.model_name, alias=config.model_alias, model_info=model_info)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,14 @@
 import os
+import json
+import base64
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 from src.logger import logging
 from src.exception import handle_exception, CustomException
 from src.configurations.azure_connection import CreateBlobServiceClient
 
+from azure.core import MatchConditions
 from azure.core.exceptions import ResourceNotFoundError, ServiceRequestError, ResourceExistsError, AzureError
 
 import pickle
@@ -13,8 +19,8 @@ logger = logging.getLogger('Azure Storage Service')
 class AzureBlobStorage:
     """A Class to interact with Azure Blob Storage Account, for data upload and retrieval."""
 
-    def __init__(self):
-        self.blob_service_client = CreateBlobServiceClient().blob_service_client
+    def __init__(self, blob_service_client=None):
+        self.blob_service_client = blob_service_client or CreateBlobServiceClient().blob_service_client
      
     @handle_exception   
     def is_file_available(self, container_name: str, file_path: str) -> bool:
@@ -45,7 +51,7 @@ class AzureBlobStorage:
         
         
     @handle_exception
-    def upload_file(self, file_path: str, file_blob_path: str,  container_name: str, remove: bool=True) -> None:
+    def upload_file(self, file_path: str, file_blob_path: str,  container_name: str, remove: bool=True) -> str:
         """This method uploads file to Azure Storage Service.
         
         Arguments:
@@ -53,6 +59,9 @@ class AzureBlobStorage:
             file_blob_path(str): file path in the container to upload.
             container_name(str): Name of the Container.
             remove(bool): If True, deletes the local file after upload.
+        
+        Returns:
+            str: `file_blob_path` once the upload succeeded, None on failure.
         """
         try:
             logger.info(f'Uploading file from {file_path} to {file_blob_path} in {container_name} blob storage container on Azure...')
@@ -66,7 +75,7 @@ class AzureBlobStorage:
                 os.remove(file_path)
                 logger.info(f'Local file {file_path} deleted after upload!')
                 
-            return
+            return file_blob_path
         except ServiceRequestError as e:
             logger.error('There is a network error os DNS faliure, client cannot reach the Azure service.')
             raise CustomException(e)
@@ -117,6 +126,140 @@ class AzureBlobStorage:
             raise CustomException(e)
         
     
+    @handle_exception
+    def get_etag(self, file_blob_path: str, container_name: str) -> str:
+        """Returns the ETag of a blob, which changes whenever the blob is overwritten.
+        
+        Arguments:
+            file_blob_path(str): Path of the file in the container.
+            container_name(str): Name of the Container.
+        """
+        try:
+            blob_client = self.blob_service_client.get_blob_client(container=container_name, blob=file_blob_path)
+            return blob_client.get_blob_properties().etag
+        except ResourceNotFoundError as e:
+            logger.error('ResourceError! Blob not found in container.')
+            raise CustomException(e)
+        except AzureError as e:
+            logger.error('There is some kind of Azure Error!')
+            raise CustomException(e)
+        
+    
+    @handle_exception
+    def download_to_file(self, file_blob_path: str, container_name: str, file_save_path: str, max_concurrency: int=4,
+                         chunk_size: int=4 * 1024 * 1024, verify: bool=True) -> str:
+        """Streams a blob straight into a local file, fetching byte ranges concurrently.
+        
+        Ranges of `chunk_size` bytes are downloaded by `max_concurrency` threads and written in place
+        into `<file_save_path>.part`, so memory holds at most one range per thread whatever the blob
+        size. Finished ranges are recorded in `<file_save_path>.part.json`; a rerun after a failure
+        resumes with the missing ranges, unless the blob changed (its ETag differs) in between.
+        Every range is requested with If-Match on the ETag of the first request.
+        
+        With `verify`, each range is checked against its transactional MD5 (ranges up to 4 MiB),
+        and the finished file against the blob's Content-MD5 when it has one. A mismatch discards
+        the partial download. The file is moved to `file_save_path` only once complete and verified.
+        
+        Arguments:
+            file_blob_path(str): Path of the file in the container.
+            container_name(str): Name of the Container.
+            file_save_path(str): Path where file is to be saved.
+            max_concurrency(int): Number of ranges downloaded at once.
+            chunk_size(int): Size of a range in bytes.
+            verify(bool): Verify range and file checksums.
+            
+        Returns:
+            str: `file_save_path`.
+        """
+        part_path, state_path = f'{file_save_path}.part', f'{file_save_path}.part.json'
+        try:
+            blob_client = self.blob_service_client.get_blob_client(container=container_name, blob=file_blob_path)
+            properties = blob_client.get_blob_properties()
+            size, etag = properties.size, properties.etag
+            
+            state = {'etag': etag, 'size': size, 'chunk_size': chunk_size, 'done': []}
+            if os.path.exists(state_path) and os.path.exists(part_path):
+                with open(state_path, 'r') as file:
+                    saved_state = json.load(file)
+                if all(saved_state.get(key) == state[key] for key in ('etag', 'size', 'chunk_size')):
+                    state = saved_state
+                    logger.info(f"Resuming download, {len(state['done'])} range(s) already on disk")
+            
+            os.makedirs(os.path.dirname(file_save_path) or '.', exist_ok=True)
+            if not state['done']:
+                with open(part_path, 'wb') as file:
+                    file.truncate(size)
+            
+            done = set(state['done'])
+            offsets = [offset for offset in range(0, size, chunk_size) if offset not in done]
+            logger.info(f'Downloading {len(offsets)} range(s) of {chunk_size} bytes, {max_concurrency} at a time...')
+            
+            def download_range(offset: int) -> int:
+                stream = blob_client.download_blob(offset=offset, length=min(chunk_size, size - offset), etag=etag,
+                                                   match_condition=MatchConditions.IfNotModified, validate_content=verify)
+                with open(part_path, 'r+b') as file:
+                    file.seek(offset)
+                    for chunk in stream.chunks():
+                        file.write(chunk)
+                return offset
+            
+            error = None
+            with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+                futures = [executor.submit(download_range, offset) for offset in offsets]
+                for future in as_completed(futures):
+                    if future.cancelled():
+                        continue
+                    if future.exception() is not None:
+                        # ranges already in flight still finish and are recorded, the rest is left for a resume
+                        error = error or future.exception()
+                        for pending in futures:
+                            pending.cancel()
+                        continue
+                    state['done'].append(future.result())
+                    with open(f'{state_path}.tmp', 'w') as file:
+                        json.dump(state, file)
+                    os.replace(f'{state_path}.tmp', state_path)
+            if error is not None:
+                raise error
+            
+            expected_md5 = properties.content_settings.content_md5
+            if verify and expected_md5:
+                digest = hashlib.md5()
+                with open(part_path, 'rb') as file:
+                    for block in iter(lambda: file.read(1024 * 1024), b''):
+                        digest.update(block)
+                if digest.digest() != bytes(expected_md5):
+                    os.remove(part_path)
+                    if os.path.exists(state_path):
+                        os.remove(state_path)
+                    raise CustomException(f'MD5 mismatch for {file_blob_path}: expected {base64.b64encode(bytes(expected_md5)).decode()}, '
+                                          f'got {base64.b64encode(digest.digest()).decode()}')
+                logger.info('Content-MD5 verified.')
+            elif verify:
+                logger.warning(f'{file_blob_path} has no Content-MD5, only the ranges were verified')
+            
+            os.replace(part_path, file_save_path)
+            if os.path.exists(state_path):
+                os.remove(state_path)
+            logger.info(f'Downloaded {size} bytes to {file_save_path}')
+            
+            return file_save_path
+        except ResourceNotFoundError as e:
+            logger.error('ResourceError! Blob not found in container.')
+            raise CustomException(e)
+        except ServiceRequestError as e:
+            logger.error('There is a network error os DNS faliure, client cannot reach the Azure service.')
+            raise CustomException(e)
+        except AzureError as e:
+            logger.error('There is some kind of Azure Error!')
+            raise CustomException(e)
+        except CustomException:
+            raise
+        except Exception as e:
+            logger.error('An Unexpected Error occured!')
+            raise CustomException(e)
+        
+    
     @handle_exception
     def create_container(self, container_name: str):
         """Creates a new container in Storage Account.
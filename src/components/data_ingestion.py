@@ -29,17 +29,17 @@ class DataIngestion:
             blob_storage_client = AzureBlobStorage()
             logger.info('Downloading data from Blob Storage...')
             
-            data = blob_storage_client.download_file(
+            # Streamed to disk range by range, the dataset is never held in memory.
+            saved_path = blob_storage_client.download_to_file(
                         file_blob_path=self.data_ingestion_config.blob_data_path,
                         file_save_path=self.data_ingestion_config.raw_data_file_path,
-                        container_name=BLOB_CONTAINER
+                        container_name=BLOB_CONTAINER,
+                        max_concurrency=self.data_ingestion_config.max_concurrency,
+                        chunk_size=self.data_ingestion_config.chunk_size
                     )
-            logger.debug('Got the data!')
-            logger.debug(f'Saving data in {os.path.relpath(path=self.data_ingestion_config.raw_data_file_path, start=ROOT_DIR)}')
-            os.makedirs(os.path.dirname(self.data_ingestion_config.raw_data_file_path), exist_ok=True)
-            
-            with open(self.data_ingestion_config.raw_data_file_path, 'wb') as file:
-                file.write(data)
+            if saved_path is None:
+                raise CustomException(f'Could not download {self.data_ingestion_config.blob_data_path}')
+            logger.debug(f'Data saved in {os.path.relpath(path=saved_path, start=ROOT_DIR)}')
             
             logger.info('Data downloaded and saved!')
             
@@ -1,13 +1,11 @@
 import os
+import time
 import pickle
 
 import numpy as np
-from pandas import DataFrame, read_csv
-import re
+from pandas import DataFrame, Series
 import nltk
-import string
 from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
 from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import FunctionTransformer
@@ -17,35 +15,39 @@ nltk.download('wordnet')
 
 from src.logger import logging
 from src.exception import CustomException, handle_exception
+from src.constants import TRANSFORMED_DATA_DTYPES
 from src.entity.config_entity import DataTransformationConfig, DataIngestionConfig
 from src.entity.artifact_entity import DataTransformationArtifact, DataIngestionArtifact
+from src.utils import load_table, save_json, save_table
+from src.utils.text_cache import PreprocessedTextCache
+from flask_app.normalizer import PREPROCESSOR_VERSION, CachedLemmatizer, cache_lemmas, load_lemmatizer, normalize_text, normalize_texts_parallel
 
 logger = logging.getLogger('Data Transformation')
 
 
-lemmatizer = WordNetLemmatizer()
+lemmatizer = cache_lemmas(load_lemmatizer(DataTransformationConfig.lemmatizer), max_size=DataTransformationConfig.lemma_cache_size)
 stop_words = set(stopwords.words("english"))
 
 with open('models/stopwords.pkl', 'wb') as file:
     pickle.dump(stop_words, file)
 
 def preprocess_text(text):
-    """Helper function to preprocess a single text string."""
-    text = re.sub(r'https?://\S+|www\.\S+', '', text)
-    text = re.sub(r'\d+', '', text)
-    text = text.lower()
-    text = re.sub(rf"[{re.escape(string.punctuation)}]", ' ', text)
-    text = text.replace('؛', "")
-    text = re.sub(r'\s+', ' ', text).strip()
-    
-    words = text.split()
-    words = [word for word in words if word not in stop_words]
-    words = [lemmatizer.lemmatize(word) for word in words]
-    
-    return ' '.join(words)
+    """Helper function to preprocess a single text string, shared with serving through flask_app.normalizer."""
+    return normalize_text(text, stop_words, lemmatizer)
+
+def apply_preprocessing(series, n_jobs=1, chunk_size=2000, text_cache=None):
+    """Preprocesses a Series, chunked across `n_jobs` processes. Output order and values match the serial run.
 
-def apply_preprocessing(series):
-    return series.apply(preprocess_text)
+    With a `text_cache`, only distinct texts missing from it are preprocessed.
+    """
+    compute = lambda texts: normalize_texts_parallel(texts, stop_words, lemmatizer, n_jobs=n_jobs, chunk_size=chunk_size)
+    if text_cache is None:
+        return Series(compute(series.tolist()), index=series.index)
+    
+    texts, stats = text_cache.normalize(series.tolist(), compute)
+    logger.info(f"Preprocessed text cache: {stats['hits']} hits, {stats['computed']} computed, "
+                f"{stats['texts'] - stats['unique']} duplicates skipped out of {stats['texts']} texts")
+    return Series(texts, index=series.index)
 
 preprocess_pipeline = Pipeline([('preprocess', FunctionTransformer(apply_preprocessing, validate=False))])
 
@@ -56,6 +58,25 @@ class DataTransformation:
     def __init__(self, data_ingestion_artifact: DataIngestionArtifact, data_transformation_config: DataTransformationConfig=DataTransformationConfig()):
         self.data_transformation_config = data_transformation_config
         self.data_ingestion_artifact = data_ingestion_artifact
+        self.text_cache = None
+        
+    
+    @handle_exception
+    def open_text_cache(self):
+        """Opens the persistent cache of preprocessed text and pre-warms the lemma cache from it."""
+        try:
+            file_path = self.data_transformation_config.text_cache_file_path
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            namespace = PreprocessedTextCache.make_namespace(PREPROCESSOR_VERSION, lemmatizer.name, stop_words)
+            self.text_cache = PreprocessedTextCache(file_path=file_path, namespace=namespace)
+            logger.info(f'Using preprocessed text cache {file_path} ({namespace})')
+            
+            exported = self.text_cache.load_lemmas()
+            if exported is not None and isinstance(lemmatizer, CachedLemmatizer):
+                lemmatizer.warm(exported)
+        except Exception as e:
+            logger.error(f'Error occured in open_text_cache() method: {e}')
+            raise CustomException(e)
         
         
     @handle_exception
@@ -91,28 +112,54 @@ class DataTransformation:
         """
         try:
             logger.info('Transforming text...')
-                            
+            
+            n_jobs = self.data_transformation_config.n_jobs
+            start_time = time.perf_counter()
+            preprocess_pipeline.set_params(preprocess__kw_args={
+                'n_jobs': n_jobs,
+                'chunk_size': self.data_transformation_config.chunk_size,
+                'text_cache': self.text_cache,
+            })
             dataframe[col] = preprocess_pipeline.transform(dataframe[col])
+            seconds = time.perf_counter() - start_time
             
             dataframe = dataframe.dropna(subset=[col])
             
-            logger.info('Text Transformation Completed!')
+            logger.info(f'Text Transformation Completed! {len(dataframe)} texts in {seconds:.1f}s ({len(dataframe) / max(seconds, 1e-9):.0f} texts/sec, n_jobs={n_jobs})')
             return dataframe
         except Exception as e:
             logger.error('Error occured in transform_dataframe() method!')
             raise CustomException(e)
         
     
+    @handle_exception
+    def save_lemma_cache(self):
+        """Saves the lemmas seen while transforming, serving pre-warms its lemma cache with them."""
+        try:
+            if isinstance(lemmatizer, CachedLemmatizer):
+                logger.info(f'Lemma cache: {len(lemmatizer)} tokens, {lemmatizer.hit_rate:.1%} hit rate over {lemmatizer.lookups} lookups')
+                lemma_cache = lemmatizer.export()
+            else:
+                # Still written, so the DVC output exists whichever lemmatizer is configured.
+                logger.info(f'The {lemmatizer.name} lemmatizer is not cached per token, saving an empty lemma cache')
+                lemma_cache = {'lemmatizer': lemmatizer.name, 'same': [], 'changed': {}}
+            
+            if self.text_cache is not None:
+                self.text_cache.save_lemmas(lemma_cache)
+            os.makedirs(os.path.dirname(self.data_transformation_config.lemma_cache_file_path), exist_ok=True)
+            save_json(dictionary=lemma_cache, file_path=self.data_transformation_config.lemma_cache_file_path)
+        except Exception as e:
+            logger.error(f'Error occured in save_lemma_cache() method: {e}')
+            raise CustomException(e)
+        
+    
     @handle_exception
     def save_transformed_data(self, train_data: DataFrame, test_data: DataFrame):
         """This function takes raw data and uses to preprocess_dataframe() method to perform transformation and save it to artifact."""
         try:
             logger.info('Saving train_data and test_data files')
-            os.makedirs(os.path.dirname(self.data_transformation_config.train_data_file_path), exist_ok=True)
-            os.makedirs(os.path.dirname(self.data_transformation_config.test_data_file_path), exist_ok=True)
-            
-            train_data.to_csv(self.data_transformation_config.train_data_file_path)
-            test_data.to_csv(self.data_transformation_config.test_data_file_path)
+            save_table(train_data, self.data_transformation_config.train_data_file_path, dtypes=TRANSFORMED_DATA_DTYPES)
+            save_table(test_data, self.data_transformation_config.test_data_file_path, dtypes=TRANSFORMED_DATA_DTYPES)
             logger.info('Train and Test data files saved to artifact!')
             
         except Exception as e:
@@ -127,14 +174,21 @@ class DataTransformation:
         try:
             logger.info('Inititated Data Transformation...')
             
-            dataframe = read_csv(self.data_ingestion_artifact.raw_data_file_path)
+            dataframe = load_table(self.data_ingestion_artifact.raw_data_file_path, columns=list(TRANSFORMED_DATA_DTYPES))
             dataframe = self.preprocess_dataframe(dataframe)
             
             train_data, test_data = train_test_split(dataframe, test_size=self.data_transformation_config.test_size, random_state=42)
-            train_data = self.transform_dataframe(train_data)
-            test_data = self.transform_dataframe(test_data)
-            
-            self.save_transformed_data(train_data=train_data, test_data=test_data)
+            if self.data_transformation_config.use_text_cache:
+                self.open_text_cache()
+            try:
+                train_data = self.transform_dataframe(train_data)
+                test_data = self.transform_dataframe(test_data)
+                
+                self.save_transformed_data(train_data=train_data, test_data=test_data)
+                self.save_lemma_cache()
+            finally:
+                if self.text_cache is not None:
+                    self.text_cache.close()
             
             data_transformation_artifact = DataTransformationArtifact(
                 train_data_file_path=self.data_transformation_config.train_data_file_path,
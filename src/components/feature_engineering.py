@@ -2,13 +2,16 @@ import os
 import yaml
 import pickle
 
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import pandas as pd
-from sklearn.feature_extraction.text import CountVectorizer
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
 
 from src.logger import logging
 from src.constants import ROOT_DIR
-from src.utils import load_csv, save_binary_file
+from src.utils import load_table, save_binary_file, save_sparse_features
 from src.exception import handle_exception, CustomException
 from src.entity.config_entity import FeatureEngineeringConfig, DataTransformationConfig
 from src.entity.artifact_entity import FeatureEngineeringArtifact, DataTransformationArtifact
@@ -16,6 +19,19 @@ from src.entity.artifact_entity import FeatureEngineeringArtifact, DataTransform
 logger = logging.getLogger('Feature Engineering')
 
 
+def hash_features(vectorizer: HashingVectorizer, texts, n_jobs: int=1, chunk_size: int=5000) -> sparse.csr_matrix:
+    """Transforms texts with a stateless HashingVectorizer, chunks in parallel across `n_jobs` processes (-1 for every core).
+
+    No fit pass is needed, so every chunk is featurized independently; chunks are stacked in input order.
+    """
+    n_jobs = os.cpu_count() if n_jobs < 0 else n_jobs
+    chunks = [texts[start:start + chunk_size] for start in range(0, len(texts), chunk_size)]
+    if n_jobs <= 1 or len(chunks) <= 1:
+        return vectorizer.transform(texts)
+    with ProcessPoolExecutor(max_workers=min(n_jobs, len(chunks))) as executor:
+        return sparse.vstack(list(executor.map(vectorizer.transform, chunks)), format='csr')
+
+
 class FeatureEngineering:
     """This class is responsible for Feature Engineering in pipeline."""
     
@@ -45,12 +61,10 @@ class FeatureEngineering:
             logger.debug(f'Type of X_train_bow: {type(X_train_bow)}')
             logger.debug(f'Type of X_test_bow: {type(X_test_bow)}')
             
-            train_df = pd.DataFrame(X_train_bow.toarray())
-            train_df['label'] = y_train
-            
-            test_df = pd.DataFrame(X_test_bow.toarray())
-            test_df['label'] = y_test
-            logger.debug(f'X_train_bow and X_test_bow converted into {type(train_df)} and merged respective labels.')
+            # Kept sparse: a dense copy grows with rows x max_features, the CSR matrix only with the tokens present.
+            train_features = (X_train_bow, y_train)
+            test_features = (X_test_bow, y_test)
+            logger.debug(f'X_train_bow has {X_train_bow.nnz} non-zeros out of {X_train_bow.shape[0] * X_train_bow.shape[1]} cells.')
         
             logger.info('Bag of words applied and Data Transformed.')
             
@@ -58,21 +72,26 @@ class FeatureEngineering:
             
             os.makedirs(os.path.dirname(self.feature_engineering_config.vectorizer_file_path), exist_ok=True)
             
+            # stop_words_ holds every term pruned by max_features, it is only kept for introspection
+            # and would otherwise make the pickle scale with the corpus vocabulary.
+            if hasattr(vectorizer, 'stop_words_'):
+                delattr(vectorizer, 'stop_words_')
+            
             save_binary_file(obj=vectorizer, file_path=self.feature_engineering_config.vectorizer_file_path)
             logger.debug(f'Vectorizer object saved to {os.path.relpath(start=ROOT_DIR, path=self.feature_engineering_config.vectorizer_file_path)}')
             
-            return train_df, test_df
+            return train_features, test_features, vectorizer.get_feature_names_out()
         except Exception as e:
             logger.error(f'Error during bag of words transformation: {e}')
             raise
     
     @handle_exception
-    def save_data(self, dataframe: pd.DataFrame, file_path: str) -> None:
-        """Save the dataframe to a csv file"""
+    def save_data(self, features: tuple, feature_names: np.ndarray, file_path: str) -> None:
+        """Save a (CSR matrix, labels) pair with the vocabulary to a .npz file"""
         try:
             logger.info(f'Saving {os.path.basename(file_path)} to {os.path.relpath(path=file_path, start=ROOT_DIR)}')
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            dataframe.to_csv(file_path, index=False)
+            X, y = features
+            save_sparse_features(file_path=file_path, features=X, labels=y, feature_names=feature_names)
             
             logger.info(f'File saved!')
         except Exception as e:
@@ -80,18 +99,44 @@ class FeatureEngineering:
             raise
     
     
+    @handle_exception
+    def apply_hashing(self, train_data: pd.DataFrame, test_data: pd.DataFrame) -> tuple:
+        """Apply a stateless Hashing Vectorizer to the data, featurizing chunks in parallel."""
+        try:
+            config = self.feature_engineering_config
+            logger.info(f'Hashing the data into {config.n_features} features...')
+            # norm=None keeps raw counts like CountVectorizer, and lets serving score a text token by token.
+            vectorizer = HashingVectorizer(n_features=config.n_features, alternate_sign=config.alternate_sign, norm=None)
+            
+            X_train = hash_features(vectorizer, train_data['review'].values, n_jobs=config.n_jobs, chunk_size=config.chunk_size)
+            X_test = hash_features(vectorizer, test_data['review'].values, n_jobs=config.n_jobs, chunk_size=config.chunk_size)
+            logger.info('Hashing applied and Data Transformed.')
+            
+            # Saved for the pickle fallback of serving, it holds only the settings.
+            save_binary_file(obj=vectorizer, file_path=config.vectorizer_file_path)
+            
+            # Hashed columns have no names.
+            return (X_train, train_data['sentiment'].values), (X_test, test_data['sentiment'].values), np.asarray([], dtype=str)
+        except Exception as e:
+            logger.error(f'Error during hashing transformation: {e}')
+            raise
+    
+    
     @handle_exception
     def initiate_feature_engineering(self) -> FeatureEngineeringArtifact:
         """This method is responsible for initiating feature engineering."""
         try:
             logger.info('Initiated Feature Engineering Process...')
-            train_data = load_csv(self.data_transformation_artifact.train_data_file_path)
-            test_data = load_csv(self.data_transformation_artifact.test_data_file_path)
+            train_data = load_table(self.data_transformation_artifact.train_data_file_path, columns=['review', 'sentiment'])
+            test_data = load_table(self.data_transformation_artifact.test_data_file_path, columns=['review', 'sentiment'])
             
-            train_df, test_df = self.apply_bow(train_data=train_data, test_data=test_data, max_features=self.feature_engineering_config.max_features)
+            if self.feature_engineering_config.vectorizer == 'hashing':
+                train_features, test_features, feature_names = self.apply_hashing(train_data=train_data, test_data=test_data)
+            else:
+                train_features, test_features, feature_names = self.apply_bow(train_data=train_data, test_data=test_data, max_features=self.feature_engineering_config.max_features)
             
-            self.save_data(dataframe=train_df, file_path=self.feature_engineering_config.featured_train_data_file_path)
-            self.save_data(dataframe=test_df, file_path=self.feature_engineering_config.featured_test_data_file_path)
+            self.save_data(features=train_features, feature_names=feature_names, file_path=self.feature_engineering_config.featured_train_data_file_path)
+            self.save_data(features=test_features, feature_names=feature_names, file_path=self.feature_engineering_config.featured_test_data_file_path)
             
             logger.info('Feature Engineering Completed!')
             
@@ -0,0 +1,215 @@
+import os
+import math
+import time
+import json
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import StratifiedKFold
+
+from src.logger import logging
+from src.utils import load_sparse_features, save_json
+from src.entity.config_entity import HyperparameterTuningConfig, FeatureEngineeringConfig, ModelTrainerConfig
+from src.entity.artifact_entity import HyperparameterTuningArtifact, FeatureEngineeringArtifact
+
+logger = logging.getLogger('Hyperparameter Tuning')
+
+# liblinear ignores warm_start, every point of its C path is fitted from scratch.
+_WARM_START_SOLVERS = ('lbfgs', 'newton-cg', 'newton-cholesky', 'sag', 'saga')
+
+# Feature matrix of the worker process, loaded once per process and shared by every trial it runs.
+_worker_features = {}
+
+
+def _init_worker(file_path: str) -> None:
+    if _worker_features.get('file_path') != file_path:
+        X, y, _ = load_sparse_features(file_path=file_path)
+        _worker_features.update(file_path=file_path, X=X, y=y)
+
+
+def _fit_path(penalty: str, solver: str, C_path: list, train_index: np.ndarray, validation_index: np.ndarray,
+              max_iter: int, scoring: str) -> list:
+    """Fits one fold along an ascending C path, each fit starting from the previous coefficients, and scores every C."""
+    X, y = _worker_features['X'], _worker_features['y']
+    X_train, y_train = X[train_index], y[train_index]
+    X_validation, y_validation = X[validation_index], y[validation_index]
+    scorer = get_scorer(scoring)
+
+    model = LogisticRegression(penalty=penalty, solver=solver, max_iter=max_iter, warm_start=solver in _WARM_START_SOLVERS)
+    scores = []
+    for C in sorted(C_path):
+        model.set_params(C=C)
+        model.fit(X_train, y_train)
+        scores.append((C, scorer(model, X_validation, y_validation)))
+    return scores
+
+
+def successive_halving_search(file_path: str, C_grid: list, solvers: dict, cv: int=3, halving_factor: int=3,
+                              min_samples: int=1000, max_iter: int=1000, scoring: str='accuracy', n_jobs: int=-1,
+                              random_state: int=42) -> dict:
+    """Searches LogisticRegression's C and penalty with successive halving over training-set size.
+
+    Every (penalty, C) pair starts on a small stratified subsample; after each rung only the best
+    1 / `halving_factor` of them survive, and the subsample grows `halving_factor` times, so the
+    last rung scores the finalists on every row. Within a rung, one task per penalty and fold walks
+    the surviving Cs in ascending order, warm-starting each fit from the previous one. Tasks run on
+    `n_jobs` processes (-1 for every core), each loading the features once from `file_path`.
+
+    Args:
+        solvers (dict): Solver used for each penalty to search, e.g. {'l1': 'liblinear', 'l2': 'lbfgs'}.
+
+    Returns:
+        dict: The best params, the scores of every rung and the amount of fitting done.
+    """
+    n_jobs = os.cpu_count() if n_jobs < 0 else n_jobs
+    # Loaded here before the pool starts, so forked workers inherit the matrix instead of reading it again.
+    _worker_features.clear()
+    _init_worker(file_path)
+    y = _worker_features['y']
+    n_rows = len(y)
+
+    candidates = [(penalty, float(C)) for penalty in solvers for C in C_grid]
+    n_rungs = max(1, math.ceil(math.log(len(candidates), halving_factor)))
+    order = np.random.default_rng(random_state).permutation(n_rows)
+    folds = StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state)
+
+    executor = ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(file_path,)) if n_jobs > 1 else None
+    rungs, fitted_rows = [], 0
+    try:
+        for rung in range(n_rungs):
+            n_samples = n_rows if rung == n_rungs - 1 else min(n_rows, max(min_samples, n_rows // halving_factor ** (n_rungs - 1 - rung)))
+            subsample = order[:n_samples]
+
+            tasks = []
+            for train_index, validation_index in folds.split(subsample, y[subsample]):
+                for penalty in solvers:
+                    C_path = [C for candidate_penalty, C in candidates if candidate_penalty == penalty]
+                    if C_path:
+                        tasks.append((penalty, solvers[penalty], C_path, subsample[train_index], subsample[validation_index], max_iter, scoring))
+                        fitted_rows += len(train_index) * len(C_path)
+
+            mapper = executor.map if executor is not None else map
+            fold_scores = {}
+            for (penalty, *_), scores in zip(tasks, mapper(_fit_path, *zip(*tasks))):
+                for C, score in scores:
+                    fold_scores.setdefault((penalty, C), []).append(score)
+
+            ranked = sorted(candidates, key=lambda candidate: np.mean(fold_scores[candidate]), reverse=True)
+            rungs.append({
+                'n_samples': int(n_samples),
+                'scores': [{'penalty': penalty, 'C': C, 'score': float(np.mean(fold_scores[(penalty, C)]))} for penalty, C in ranked],
+            })
+            logger.info(f'Rung {rung + 1}/{n_rungs}: {len(candidates)} candidates on {n_samples} rows, best {ranked[0]} '
+                        f'with {scoring} {np.mean(fold_scores[ranked[0]]):.4f}')
+            candidates = ranked[:max(1, math.ceil(len(ranked) / halving_factor))]
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    penalty, C = candidates[0]
+    n_grid = len(solvers) * len(C_grid)
+    return {
+        'best_params': {'C': C, 'solver': solvers[penalty], 'penalty': penalty},
+        'scoring': scoring,
+        'rungs': rungs,
+        # A plain grid fits every candidate on every training fold of the full data.
+        'fitted_rows': int(fitted_rows),
+        'grid_fitted_rows': int(n_grid * cv * (n_rows - n_rows // cv)),
+    }
+
+
+class HyperparameterTuning:
+    """Tunes the Logistic Regression parameters on the featured training data, for ModelTrainer to use."""
+
+    def __init__(self,
+                 feature_engineering_artifact: FeatureEngineeringArtifact,
+                 hyperparameter_tuning_config: HyperparameterTuningConfig=HyperparameterTuningConfig()
+                 ):
+
+        self.feature_engineering_artifact = feature_engineering_artifact
+        self.hyperparameter_tuning_config = hyperparameter_tuning_config
+
+
+    def initiate_hyperparameter_tuning(self) -> HyperparameterTuningArtifact:
+        """Runs the search and saves the best params with the search report."""
+        try:
+            config = self.hyperparameter_tuning_config
+            logger.info(f'Searching C in {config.C_grid} for penalties {list(config.solvers)}...')
+            start_time = time.perf_counter()
+            report = successive_halving_search(
+                file_path=self.feature_engineering_artifact.featured_train_data_file_path,
+                C_grid=config.C_grid,
+                solvers=config.solvers,
+                cv=config.cv,
+                halving_factor=config.halving_factor,
+                min_samples=config.min_samples,
+                max_iter=config.max_iter,
+                scoring=config.scoring,
+                n_jobs=config.n_jobs
+            )
+            report['search_seconds'] = time.perf_counter() - start_time
+            logger.info(f"Best params {report['best_params']} found in {report['search_seconds']:.1f}s, "
+                        f"fitting {report['fitted_rows'] / report['grid_fitted_rows']:.0%} of the rows a full grid would")
+
+            os.makedirs(os.path.dirname(config.tuning_report_file_path), exist_ok=True)
+            save_json(dictionary=report, file_path=config.tuning_report_file_path)
+
+            return HyperparameterTuningArtifact(
+                tuning_report_file_path=config.tuning_report_file_path,
+                best_params=report['best_params']
+            )
+        except Exception as e:
+            logger.error(f'An Unexpected error occured in initiate_hyperparameter_tuning() method: {e}')
+            raise
+
+
+def load_best_params(file_path: str) -> dict:
+    """Reads the best params of a tuning report, None when tuning was skipped."""
+    with open(file_path, 'r') as file:
+        return json.load(file)['best_params']
+
+
+def tuning_skip_reason(model_trainer_config: ModelTrainerConfig) -> str:
+    """Why tuning must not run for this training config, None when it should.
+
+    Out-of-core training exists because train.npz does not fit in memory, and tuning loads it whole.
+    """
+    if model_trainer_config.mode == 'out_of_core':
+        return 'model_training.mode is out_of_core'
+    if not model_trainer_config.use_tuned_params:
+        return 'model_training.use_tuned_params is false'
+    return None
+
+
+def save_skipped_report(file_path: str, reason: str) -> None:
+    """Writes a tuning report without best params, which ModelTrainer ignores."""
+    logger.info(f'Skipping hyperparameter tuning: {reason}')
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    save_json(dictionary={'skipped': reason, 'best_params': None}, file_path=file_path)
+
+
+def main():
+    """Main Function"""
+
+    hyperparameter_tuning_config = HyperparameterTuningConfig()
+    skip_reason = tuning_skip_reason(model_trainer_config=ModelTrainerConfig())
+    if skip_reason is not None:
+        save_skipped_report(file_path=hyperparameter_tuning_config.tuning_report_file_path, reason=skip_reason)
+        return
+
+    feature_engineering_config = FeatureEngineeringConfig()
+
+    hyperparameter_tuning = HyperparameterTuning(
+        feature_engineering_artifact=FeatureEngineeringArtifact(
+            featured_train_data_file_path=feature_engineering_config.featured_train_data_file_path, featured_test_data_file_path=feature_engineering_config.featured_test_data_file_path, vectorizer_file_path=feature_engineering_config.vectorizer_file_path
+            ),
+        hyperparameter_tuning_config=hyperparameter_tuning_config
+        )
+
+    hyperparameter_tuning.initiate_hyperparameter_tuning()
+
+if __name__=='__main__':
+    main()
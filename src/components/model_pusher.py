@@ -60,7 +60,10 @@ def main():
     
     # Load configuration
     model_trainer_config = ModelTrainerConfig()
-    model_trainer_artifact = ModelTrainerArtifact(model_object_file_path=model_trainer_config.model_object_file_path)
+    model_trainer_artifact = ModelTrainerArtifact(
+        model_object_file_path=model_trainer_config.model_object_file_path,
+        model_bundle_file_path=model_trainer_config.model_bundle_file_path
+        )
     model_pusher_config = ModelPusherConfig()
     
     # Create ModelPusher instance
@@ -1,18 +1,41 @@
 import os
+import json
+import time
 
 import numpy as np
 import pandas as pd
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 
 from src.logger import logging
 from src.exception import handle_exception, CustomException
-from src.utils import load_csv, load_yaml, save_binary_file
+from src.utils import SparseFeatureReader, load_binary, load_sparse_features, load_yaml, save_binary_file
+from flask_app.bundle import export_linear_bundle
+from src.components.hyperparameter_tuning import load_best_params
 from src.entity.config_entity import ModelTrainerConfig, FeatureEngineeringConfig
 from src.entity.artifact_entity import ModelTrainerArtifact, FeatureEngineeringArtifact
 
 logger = logging.getLogger('Model Trainer')
 
 
+def train_out_of_core(file_path: str, sgd_params: dict, epochs: int, chunk_size: int, random_state: int=42) -> SGDClassifier:
+    """Trains a logistic-loss SGDClassifier with partial_fit over row chunks of a sparse features file.
+
+    Only one chunk of features is in memory at a time. Chunks are visited in a new random order every
+    epoch, the order is seeded so a run is reproducible.
+    """
+    model = SGDClassifier(loss='log_loss', random_state=random_state, **sgd_params)
+    rng = np.random.default_rng(random_state)
+    with SparseFeatureReader(file_path) as reader:
+        classes = np.unique(reader.labels)
+        starts = np.arange(0, len(reader), chunk_size)
+        for epoch in range(epochs):
+            for start in rng.permutation(starts):
+                X_chunk, y_chunk = reader.rows(int(start), int(start) + chunk_size)
+                model.partial_fit(X_chunk, y_chunk, classes=classes)
+            logger.debug(f'Epoch {epoch + 1}/{epochs} done')
+    return model
+
+
 class ModelTrainer:
     
     def __init__(self, 
@@ -42,19 +65,73 @@ class ModelTrainer:
             logger.error(f'Unexpected error occured in build_model_and_train_model() method: {e}')
             raise
         
+    def get_model_params(self) -> dict:
+        """Returns the params found by hyperparameter tuning when enabled and available, else model_params."""
+        config = self.model_trainer_config
+        if config.use_tuned_params and os.path.exists(config.tuning_report_file_path):
+            params = load_best_params(file_path=config.tuning_report_file_path)
+            if params is not None:
+                logger.info(f'Using tuned model params {params}')
+                return params
+        return config.model_params
+        
+    def build_and_train_model_out_of_core(self, file_path: str) -> SGDClassifier:
+        """Trains an SGD logistic model chunk by chunk, for training sets that do not fit in memory."""
+        try:
+            config = self.model_trainer_config
+            logger.info(f'Training Model out of core: {config.epochs} epochs over chunks of {config.chunk_size} rows...')
+            start_time = time.perf_counter()
+            model = train_out_of_core(file_path=file_path, sgd_params=config.sgd_params, epochs=config.epochs, chunk_size=config.chunk_size)
+            logger.info(f'Model Trained in {time.perf_counter() - start_time:.1f}s!')
+            return model
+        except Exception as e:
+            logger.error(f'Unexpected error occured in build_and_train_model_out_of_core() method: {e}')
+            raise
+        
+    def export_model_bundle(self, model: LogisticRegression) -> None:
+        """Exports vocabulary, weights and stopwords as the single versioned bundle used for serving."""
+        try:
+            logger.debug('Exporting serving model bundle...')
+            vectorizer = load_binary(file_path=self.feature_engineering_artifact.vectorizer_file_path)
+            stopwords = load_binary(file_path=self.model_trainer_config.stopwords_file_path)
+            lemma_cache = None
+            if os.path.exists(self.model_trainer_config.lemma_cache_file_path):
+                with open(self.model_trainer_config.lemma_cache_file_path, 'r') as file:
+                    lemma_cache = json.load(file)
+            
+            content_hash = export_linear_bundle(
+                file_path=self.model_trainer_config.model_bundle_file_path,
+                vectorizer=vectorizer,
+                model=model,
+                stopwords=stopwords,
+                preprocessor_version=self.model_trainer_config.preprocessor_version,
+                lemmatizer=self.model_trainer_config.lemmatizer,
+                lemma_cache=lemma_cache
+            )
+            logger.info(f'Model bundle exported with content hash {content_hash[:12]}')
+        except Exception as e:
+            logger.error(f'Unexpected error occured in export_model_bundle() method: {e}')
+            raise
+        
     def initiate_model_training(self) -> ModelTrainerArtifact:
         """Initiates Model Training."""
         try:
-            logger.debug('Loading Training Data...')
-            train = load_csv(file_path=self.feature_engineering_artifact.featured_train_data_file_path)
-            X_train, y_train = train.iloc[:, :-1].values, train.iloc[:, -1].values
-            
-            model = self.build_and_train_model(X_train=X_train, y_train=y_train, params=self.model_trainer_config.model_params)
+            train_file_path = self.feature_engineering_artifact.featured_train_data_file_path
+            if self.model_trainer_config.mode == 'out_of_core':
+                model = self.build_and_train_model_out_of_core(file_path=train_file_path)
+            else:
+                logger.debug('Loading Training Data...')
+                X_train, y_train, _ = load_sparse_features(file_path=train_file_path)
+                model = self.build_and_train_model(X_train=X_train, y_train=y_train, params=self.get_model_params())
             
             logger.debug('Saving Model Object...')
             save_binary_file(obj=model, file_path=self.model_trainer_config.model_object_file_path)
+            self.export_model_bundle(model=model)
             
-            model_trainer_artifact = ModelTrainerArtifact(model_object_file_path=self.model_trainer_config.model_object_file_path)
+            model_trainer_artifact = ModelTrainerArtifact(
+                model_object_file_path=self.model_trainer_config.model_object_file_path,
+                model_bundle_file_path=self.model_trainer_config.model_bundle_file_path
+            )
             
             return model_trainer_artifact
         except Exception as e:
@@ -3,6 +3,7 @@ from datetime import datetime
 from from_root import from_root
 from pathlib import Path
 import logging
+from flask_app.normalizer import PREPROCESSOR_VERSION
 
 ROOT_DIR = Path(from_root())
 
@@ -53,18 +54,27 @@ INGESTED_DATA_FILE_NAME: str = 'data.csv'
 
 # Data Transformation
 DATA_TRANSFORMATION_DIR: str = 'transformed_data'
-TRAIN_DATA_FILE: str = 'train.csv'
-TEST_DATA_FILE: str = 'test.csv'
+TRAIN_DATA_FILE: str = 'train.parquet'
+TEST_DATA_FILE: str = 'test.parquet'
+TRANSFORMED_DATA_DTYPES: dict = {'review': 'str', 'sentiment': 'int8'}
+LEMMA_CACHE_FILE_NAME: str = 'lemma_cache.json'
+TEXT_CACHE_DIR: str = 'cache'
+TEXT_CACHE_FILE_NAME: str = 'preprocessed_text.sqlite'
 
 # Feature Engineering
 FEATURE_ENGINEERING_DIR: str = 'feature'
 VECTORIZER_FILE_NAME: str = 'vectorizer.pkl'
 MAX_FEATURES: int = 20
-FEATURED_TRAIN_FILE_NAME: str = 'train.csv'
-FEATURED_TEST_FILE_NAME: str = 'test.csv' 
+FEATURED_TRAIN_FILE_NAME: str = 'train.npz'
+FEATURED_TEST_FILE_NAME: str = 'test.npz'
+
+# Hyperparameter Tuning
+TUNING_REPORT_FILE_NAME: str = 'tuning.json'
 
 # Model Training
 MODEL_OBJECT_FILE_NAME: str = 'model.pkl'
+MODEL_BUNDLE_FILE_NAME: str = 'model_bundle.bin'
+STOPWORDS_FILE_NAME: str = 'stopwords.pkl'
 
 # Model Evaluation
 REPORTS_DIR: str = 'reports'
@@ -74,6 +84,15 @@ EXPERIMENT_INFO_FILE_NAME: str = 'experiment_info.json'
 MODEL_NAME: str = 'imdb_sentiment_model3'
 MODELS_DIR: str = 'models'
 MODEL_ALIAS: str = 'challenger'
+MLFLOW_EXPERIMENT_NAME: str = 'My-DVC-Pipeline'
+MLFLOW_LOCAL_TRACKING_DIR: str = 'mlruns'
+MLFLOW_MODEL_ARTIFACT_PATH: str = 'model'
+
+
+# Batch Prediction
+PREDICTIONS_DIR: str = 'predictions'
+BATCH_PREDICTION_TEXT_COLUMN: str = 'review'
+BLOB_URI_PREFIX: str = 'az://'
 
 
 # Model Pusher
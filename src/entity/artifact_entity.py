@@ -20,9 +20,16 @@ class FeatureEngineeringArtifact:
     vectorizer_file_path: str
     
 
+@dataclass
+class HyperparameterTuningArtifact:
+    tuning_report_file_path: str
+    best_params: dict
+
+
 @dataclass
 class ModelTrainerArtifact:
     model_object_file_path: str
+    model_bundle_file_path: str
     
 
 @dataclass
@@ -33,4 +40,11 @@ class ModelEvaluationArtifact:
 @dataclass
 class ModelPusherArtifact:
     model_blob_file_path: str
-    container_name: str
\ No newline at end of file
+    container_name: str
+    
+
+@dataclass
+class BatchPredictionArtifact:
+    output_dir: str
+    rows: int
+    rows_per_second: float
@@ -23,6 +23,8 @@ training_pipeline_config: TrainingPipelineConfig = TrainingPipelineConfig()
 class DataIngestionConfig:
     raw_data_file_path: str = os.path.join(training_pipeline_config.artifact_dir, DATA_INGESTION_DIR, INGESTED_DATA_FILE_NAME)
     blob_data_path: str = os.path.join(DATA_BLOB_DIR, DATA_FILE_NAME)
+    max_concurrency: int = params['data_ingestion']['max_concurrency']
+    chunk_size: int = params['data_ingestion']['chunk_size']
     
     
 @dataclass
@@ -31,20 +33,56 @@ class DataTransformationConfig:
     train_data_file_path: str = os.path.join(transformed_data_dir, TRAIN_DATA_FILE)
     test_data_file_path: str = os.path.join(transformed_data_dir, TEST_DATA_FILE)
     test_size: float = params['data_transformation']['test_size']
+    lemmatizer: str = params['data_transformation']['lemmatizer']
+    lemma_cache_size: int = params['data_transformation']['lemma_cache_size']
+    n_jobs: int = params['data_transformation']['n_jobs']
+    chunk_size: int = params['data_transformation']['chunk_size']
+    use_text_cache: bool = params['data_transformation']['text_cache']
+    text_cache_file_path: str = os.path.join(training_pipeline_config.artifact_dir, TEXT_CACHE_DIR, TEXT_CACHE_FILE_NAME)
+    lemma_cache_file_path: str = os.path.join(MODELS_DIR, LEMMA_CACHE_FILE_NAME)
     
 @dataclass
 class FeatureEngineeringConfig:
     feature_engineering_dir: str = os.path.join(training_pipeline_config.artifact_dir, FEATURE_ENGINEERING_DIR)
     vectorizer_file_path: str = os.path.join(MODELS_DIR, VECTORIZER_FILE_NAME)
+    vectorizer: str = params['feature_engineering']['vectorizer']
     max_features: str = params['feature_engineering']['max_features']
+    n_features: int = params['feature_engineering']['n_features']
+    alternate_sign: bool = params['feature_engineering']['alternate_sign']
+    n_jobs: int = params['feature_engineering']['n_jobs']
+    chunk_size: int = params['feature_engineering']['chunk_size']
     featured_train_data_file_path: str = os.path.join(feature_engineering_dir, FEATURED_TRAIN_FILE_NAME)
     featured_test_data_file_path: str = os.path.join(feature_engineering_dir, FEATURED_TEST_FILE_NAME)
 
 
+@dataclass
+class HyperparameterTuningConfig:
+    C_grid: list = field(default_factory=lambda: params['hyperparameter_tuning']['C_grid'])
+    solvers: dict = field(default_factory=lambda: params['hyperparameter_tuning']['solvers'])
+    cv: int = params['hyperparameter_tuning']['cv']
+    halving_factor: int = params['hyperparameter_tuning']['halving_factor']
+    min_samples: int = params['hyperparameter_tuning']['min_samples']
+    max_iter: int = params['hyperparameter_tuning']['max_iter']
+    scoring: str = params['hyperparameter_tuning']['scoring']
+    n_jobs: int = params['hyperparameter_tuning']['n_jobs']
+    tuning_report_file_path: str = os.path.join(REPORTS_DIR, TUNING_REPORT_FILE_NAME)
+
+
 @dataclass
 class ModelTrainerConfig:
     model_params: dict = field(default_factory=lambda: params['model_params'])
     model_object_file_path: str = os.path.join(MODELS_DIR, MODEL_OBJECT_FILE_NAME)
+    model_bundle_file_path: str = os.path.join(MODELS_DIR, MODEL_BUNDLE_FILE_NAME)
+    stopwords_file_path: str = os.path.join(MODELS_DIR, STOPWORDS_FILE_NAME)
+    preprocessor_version: str = PREPROCESSOR_VERSION
+    lemmatizer: str = params['data_transformation']['lemmatizer']
+    lemma_cache_file_path: str = os.path.join(MODELS_DIR, LEMMA_CACHE_FILE_NAME)
+    mode: str = params['model_training']['mode']
+    epochs: int = params['model_training']['epochs']
+    chunk_size: int = params['model_training']['chunk_size']
+    sgd_params: dict = field(default_factory=lambda: params['model_training']['sgd_params'])
+    use_tuned_params: bool = params['model_training']['use_tuned_params']
+    tuning_report_file_path: str = os.path.join(REPORTS_DIR, TUNING_REPORT_FILE_NAME)
     
     
 @dataclass
@@ -52,9 +90,32 @@ class ModelEvaluationConfig:
     metrics_file_path = os.path.join(REPORTS_DIR, METRICS_FILE_NAME)
     experiment_info_file_path = os.path.join(REPORTS_DIR, EXPERIMENT_INFO_FILE_NAME)
     models_dir =  os.path.join(MODELS_DIR)
+    model_artifact_path: str = MLFLOW_MODEL_ARTIFACT_PATH
     # model_stage: str = MODEL_STAGE
     model_name: str = MODEL_NAME
     model_alias: str = MODEL_ALIAS
+    experiment_name: str = MLFLOW_EXPERIMENT_NAME
+    offline: bool = params['model_evaluation']['offline']
+    local_tracking_dir: str = os.path.join(MLFLOW_LOCAL_TRACKING_DIR)
+    upload_workers: int = params['model_evaluation']['upload_workers']
+    chunk_size: int = params['model_evaluation']['chunk_size']
+    threshold: float = params['model_evaluation']['threshold']
+    bootstrap_samples: int = params['model_evaluation']['bootstrap_samples']
+    confidence_level: float = params['model_evaluation']['confidence_level']
+    sweep_points: int = params['model_evaluation']['sweep_points']
+    
+
+@dataclass
+class BatchPredictionConfig:
+    input_path: str
+    output_dir: str = os.path.join(PREDICTIONS_DIR)
+    text_column: str = BATCH_PREDICTION_TEXT_COLUMN
+    id_column: str = None
+    chunk_size: int = params['batch_prediction']['chunk_size']
+    n_workers: int = params['batch_prediction']['n_workers']
+    models_dir: str = os.path.join(MODELS_DIR)
+    staging_dir: str = os.path.join(training_pipeline_config.artifact_dir, PREDICTIONS_DIR)
+    container_name: str = BLOB_CONTAINER
     
 
 @dataclass
@@ -0,0 +1,266 @@
+import os
+import sys
+import json
+import time
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from src.logger import logging
+from src.exception import CustomException, handle_exception
+from src.constants import BLOB_URI_PREFIX
+from src.entity.config_entity import BatchPredictionConfig
+from src.entity.artifact_entity import BatchPredictionArtifact
+
+logger = logging.getLogger('Batch Prediction')
+
+# Set in every worker by _init_worker, the serving module with its model loaded.
+_serving = None
+
+MANIFEST_FILE_NAME = '_manifest.json'
+
+
+def _init_worker(models_dir: str):
+    """Loads the serving model once per worker process."""
+    global _serving
+    os.environ['MODELS_DIR'] = models_dir
+    os.environ['MODEL_RELOAD_INTERVAL'] = '0'
+    from flask_app import app as serving
+
+    if not serving.resources.wait():
+        raise RuntimeError(f'Could not load the model from {models_dir}: {serving.resources.error}')
+    _serving = serving
+
+
+def _score_chunk(texts: list) -> tuple[list, list]:
+    """Runs the serving preprocessing and scorer over one chunk of raw texts."""
+    return _serving.score_texts(texts)
+
+
+def parse_blob_uri(uri: str) -> tuple[str, str]:
+    """Splits 'az://container/path/to/file' into ('container', 'path/to/file')."""
+    container_name, _, blob_path = uri[len(BLOB_URI_PREFIX):].partition('/')
+    return container_name, blob_path
+
+
+def iter_chunks(file_path: str, chunk_size: int, columns: list):
+    """Yields DataFrames of at most `chunk_size` rows from a CSV or Parquet file, never reading the whole file."""
+    if file_path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(file_path).iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(file_path, chunksize=chunk_size, usecols=columns)
+
+
+class BatchPrediction:
+    """Scores a CSV or Parquet file chunk by chunk across a process pool.
+
+    Every chunk is written as its own part file (`part-00000.csv`, ...) once it is scored, so a
+    rerun after a crash skips the parts that already exist and resumes from the first missing one.
+    A manifest next to the parts records the input, its ETag or size and the chunk size, and a
+    rerun whose parts would not line up with the existing ones is refused instead of resumed.
+    Input and output can be `az://container/path` URIs, they are staged through `staging_dir`.
+    """
+
+    def __init__(self, batch_prediction_config: BatchPredictionConfig):
+        self.batch_prediction_config = batch_prediction_config
+        self._blob_storage = None
+
+    @property
+    def blob_storage(self):
+        if self._blob_storage is None:
+            from src.cloud_storage.azure_storage import AzureBlobStorage
+            self._blob_storage = AzureBlobStorage()
+        return self._blob_storage
+
+    def fetch_input(self) -> tuple[str, str]:
+        """Returns a local path for the input file, downloading it first if it lives in blob storage, and its version.
+
+        The version is the blob's ETag, or the size of a local file. A staged blob is only reused while
+        the blob still has the ETag it was downloaded with.
+        """
+        input_path = self.batch_prediction_config.input_path
+        if not input_path.startswith(BLOB_URI_PREFIX):
+            return input_path, f'size:{os.path.getsize(input_path)}'
+
+        container_name, blob_path = parse_blob_uri(input_path)
+        etag = self.blob_storage.get_etag(file_blob_path=blob_path, container_name=container_name)
+        if etag is None:
+            raise CustomException(f'Could not read the properties of {input_path}')
+        local_path = os.path.join(self.batch_prediction_config.staging_dir, 'input', os.path.basename(blob_path))
+        etag_path = f'{local_path}.etag'
+        if os.path.exists(local_path) and os.path.exists(etag_path):
+            with open(etag_path, 'r') as file:
+                if file.read() == etag:
+                    logger.info(f'Reusing staged input {local_path}')
+                    return local_path, f'etag:{etag}'
+
+        logger.info(f'Downloading {input_path}...')
+        saved_path = self.blob_storage.download_to_file(file_blob_path=blob_path, container_name=container_name, file_save_path=local_path)
+        if saved_path is None:
+            raise CustomException(f'Could not download {input_path}')
+        with open(etag_path, 'w') as file:
+            file.write(etag)
+        return saved_path, f'etag:{etag}'
+
+    def local_output_dir(self) -> str:
+        output_dir = self.batch_prediction_config.output_dir
+        if output_dir.startswith(BLOB_URI_PREFIX):
+            container_name, blob_prefix = parse_blob_uri(output_dir)
+            return os.path.join(self.batch_prediction_config.staging_dir, 'output', container_name, blob_prefix)
+        return output_dir
+
+    def check_manifest(self, output_dir: str, input_version: str) -> None:
+        """Writes the manifest of a new output dir, or checks that existing parts were cut the same way.
+
+        Raises:
+            CustomException: When the output dir holds parts of another input, input version or chunk size,
+                or parts without a manifest, which a resume would silently drop or duplicate rows of.
+        """
+        config = self.batch_prediction_config
+        manifest = {'input_path': config.input_path, 'input_version': input_version, 'chunk_size': config.chunk_size}
+        manifest_path = os.path.join(output_dir, MANIFEST_FILE_NAME)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r') as file:
+                saved_manifest = json.load(file)
+            if saved_manifest != manifest:
+                raise CustomException(f'{output_dir} holds parts of {saved_manifest}, they do not line up with {manifest}. '
+                                      'Use another output dir or delete it to start over.')
+            return
+        if any(name.startswith('part-') for name in os.listdir(output_dir)):
+            raise CustomException(f'{output_dir} holds parts without a {MANIFEST_FILE_NAME}, refusing to resume them.')
+        with open(f'{manifest_path}.tmp', 'w') as file:
+            json.dump(manifest, file)
+        os.replace(f'{manifest_path}.tmp', manifest_path)
+
+    def write_part(self, chunk: pd.DataFrame, labels: list, probabilities: list, part_path: str, output_format: str) -> None:
+        """Writes one scored chunk atomically, uploading it first when the output lives in blob storage.
+
+        The local part file is only renamed into place once the upload succeeded, so a failed upload
+        leaves no part behind and a rerun scores the chunk again instead of skipping it.
+        """
+        config = self.batch_prediction_config
+        columns = {'row': chunk.index}
+        if config.id_column is not None:
+            columns[config.id_column] = chunk[config.id_column].values
+        columns['label'] = labels
+        columns['probability'] = probabilities
+        predictions = pd.DataFrame(columns)
+
+        tmp_path = f'{part_path}.tmp'
+        if output_format == 'parquet':
+            predictions.to_parquet(tmp_path, index=False)
+        else:
+            predictions.to_csv(tmp_path, index=False)
+
+        if config.output_dir.startswith(BLOB_URI_PREFIX):
+            container_name, blob_prefix = parse_blob_uri(config.output_dir)
+            blob_path = f'{blob_prefix.rstrip("/")}/{os.path.basename(part_path)}'
+            uploaded = self.blob_storage.upload_file(file_path=tmp_path, file_blob_path=blob_path, container_name=container_name, remove=False)
+            if uploaded is None:
+                os.remove(tmp_path)
+                raise CustomException(f'Could not upload {os.path.basename(part_path)} to {config.output_dir}')
+        os.replace(tmp_path, part_path)
+
+    def predict(self) -> BatchPredictionArtifact:
+        """Scores every chunk that has no part file yet, keeping at most two chunks per worker in flight."""
+        config = self.batch_prediction_config
+        input_file, input_version = self.fetch_input()
+        output_dir = self.local_output_dir()
+        os.makedirs(output_dir, exist_ok=True)
+        self.check_manifest(output_dir, input_version)
+        output_format = 'parquet' if input_file.endswith('.parquet') else 'csv'
+        columns = [config.text_column] + ([config.id_column] if config.id_column else [])
+
+        if config.n_workers > 0:
+            executor = ProcessPoolExecutor(max_workers=config.n_workers, initializer=_init_worker, initargs=(config.models_dir,))
+            submit = lambda texts: executor.submit(_score_chunk, texts)
+        else:
+            _init_worker(config.models_dir)
+            executor = None
+            submit = lambda texts: _score_chunk(texts)
+        max_in_flight = max(1, 2 * config.n_workers)
+
+        in_flight, rows, skipped, offset = deque(), 0, 0, 0
+        start_time = time.perf_counter()
+
+        def finish_oldest():
+            nonlocal rows
+            chunk, part_path, result = in_flight.popleft()
+            labels, probabilities = result.result() if executor is not None else result
+            self.write_part(chunk, labels, probabilities, part_path, output_format)
+            rows += len(chunk)
+            logger.info(f'Wrote {os.path.basename(part_path)}, {rows / (time.perf_counter() - start_time):.0f} rows/sec')
+
+        try:
+            for index, chunk in enumerate(iter_chunks(input_file, config.chunk_size, columns)):
+                chunk.index = range(offset, offset + len(chunk))
+                offset += len(chunk)
+                part_path = os.path.join(output_dir, f'part-{index:05d}.{output_format}')
+                if os.path.exists(part_path):
+                    skipped += 1
+                    continue
+
+                texts = chunk[config.text_column].fillna('').astype(str).tolist()
+                in_flight.append((chunk, part_path, submit(texts)))
+                if len(in_flight) >= max_in_flight:
+                    finish_oldest()
+
+            while in_flight:
+                finish_oldest()
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        seconds = time.perf_counter() - start_time
+        rows_per_second = rows / seconds if seconds > 0 else 0.0
+        if skipped:
+            logger.info(f'Resumed: skipped {skipped} chunks that were already scored')
+        logger.info(f'Scored {rows} rows in {seconds:.1f}s ({rows_per_second:.0f} rows/sec)')
+
+        return BatchPredictionArtifact(output_dir=output_dir, rows=rows, rows_per_second=round(rows_per_second, 1))
+
+    @handle_exception
+    def initiate_batch_prediction(self) -> BatchPredictionArtifact:
+        """Initiates batch prediction."""
+        try:
+            logger.info('Initiated Batch Prediction...')
+            batch_prediction_artifact = self.predict()
+            logger.info('Batch Prediction Completed!')
+            return batch_prediction_artifact
+        except Exception as e:
+            logger.error(f'Unexpected error occured in initiate_batch_prediction() method: {e}')
+            raise CustomException(e)
+
+
+def main():
+    defaults = BatchPredictionConfig(input_path='')
+    parser = argparse.ArgumentParser(description='Score a CSV or Parquet file of reviews with the serving model.')
+    parser.add_argument('--input', required=True, help='Local CSV/Parquet file or az://container/path URI.')
+    parser.add_argument('--output', default=defaults.output_dir, help='Directory or az://container/prefix for the part files.')
+    parser.add_argument('--text-column', default=defaults.text_column)
+    parser.add_argument('--id-column', default=None, help='Column copied next to every prediction.')
+    parser.add_argument('--chunk-size', type=int, default=defaults.chunk_size)
+    parser.add_argument('--workers', type=int, default=defaults.n_workers, help='Worker processes, 0 scores in this process.')
+    parser.add_argument('--models-dir', default=defaults.models_dir)
+    args = parser.parse_args()
+
+    batch_prediction = BatchPrediction(BatchPredictionConfig(
+        input_path=args.input,
+        output_dir=args.output,
+        text_column=args.text_column,
+        id_column=args.id_column,
+        chunk_size=args.chunk_size,
+        n_workers=args.workers,
+        models_dir=args.models_dir,
+    ))
+    if batch_prediction.initiate_batch_prediction() is None:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
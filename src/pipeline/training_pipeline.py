@@ -4,16 +4,19 @@ from src.exception import CustomException, handle_exception
 from src.components.data_ingestion import DataIngestion 
 from src.components.data_transformation import DataTransformation
 from src.components.feature_engineering import FeatureEngineering
+from src.components.hyperparameter_tuning import HyperparameterTuning, tuning_skip_reason
 from src.components.model_training import ModelTrainer
 
 from src.entity.config_entity import (DataIngestionConfig,
                                       DataTransformationConfig,
                                       FeatureEngineeringConfig,
+                                      HyperparameterTuningConfig,
                                       ModelTrainerConfig)
 
 from src.entity.artifact_entity import (DataIngestionArtifact,
                                         DataTransformationArtifact,
                                         FeatureEngineeringArtifact,
+                                        HyperparameterTuningArtifact,
                                         ModelTrainerArtifact)
  
 logger = logging.getLogger('Training Pipeline')
@@ -25,6 +28,7 @@ class TrainingPipeline:
         self.data_ingestion_config = DataIngestionConfig()
         self.data_transformation_config = DataTransformationConfig()
         self.feature_engineering_config = FeatureEngineeringConfig()
+        self.hyperparameter_tuning_config = HyperparameterTuningConfig()
         self.model_trainer_config = ModelTrainerConfig()
     
     
@@ -74,6 +78,23 @@ class TrainingPipeline:
             raise CustomException(e)
         
     
+    @handle_exception
+    def start_hyperparameter_tuning(self, feature_engineering_artifact: FeatureEngineeringArtifact) -> HyperparameterTuningArtifact:
+        """This method of TrainPipeline class is responsible for starting Hyperparameter Tuning component"""
+        try:
+            hyperparameter_tuning = HyperparameterTuning(
+                feature_engineering_artifact=feature_engineering_artifact,
+                hyperparameter_tuning_config=self.hyperparameter_tuning_config
+            )
+            
+            hyperparameter_tuning_artifact = hyperparameter_tuning.initiate_hyperparameter_tuning()
+            
+            return hyperparameter_tuning_artifact
+        except Exception as e:
+            logger.error(f'An Unexpected error occured in start_hyperparameter_tuning() method: {e}')
+            raise CustomException(e)
+        
+    
     @handle_exception
     def start_model_training(self, feature_engineering_artifact: FeatureEngineeringArtifact) -> ModelTrainerArtifact:
         """This method of TrainPipeline class is responsible for starting Model Training component"""
@@ -99,6 +120,9 @@ class TrainingPipeline:
             
             feature_engineering_artifact = self.start_feature_engineering(data_transformation_artifact=data_transformation_artifact)
             
+            if tuning_skip_reason(model_trainer_config=self.model_trainer_config) is None:
+                self.start_hyperparameter_tuning(feature_engineering_artifact=feature_engineering_artifact)
+            
             model_training_artifact = self.start_model_training(feature_engineering_artifact=feature_engineering_artifact)
             
             logger.info('🎉🎉🎉Training Pipeline Completed! 🎋🌿')
@@ -2,8 +2,11 @@ import os
 import pickle
 import yaml
 import json
+import zipfile
 
+import numpy as np
 import pandas as pd
+from scipy import sparse
 
 from src.logger import logging
 from src.constants import ROOT_DIR
@@ -88,4 +91,149 @@ def save_json(dictionary: dict, file_path: str):
     except Exception as e:
         logger.error(f'Unexpected Error occured!')
         raise
-    
\ No newline at end of file
+    
+
+def save_sparse_features(file_path: str, features, labels, feature_names) -> None:
+    """Saves a CSR feature matrix, its labels and the feature names to one uncompressed .npz file."""
+    try:
+        logger.debug(f'Saving sparse features {os.path.relpath(file_path, ROOT_DIR)}')
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        features = features.tocsr()
+        np.savez(
+            file_path,
+            data=features.data,
+            indices=features.indices,
+            indptr=features.indptr,
+            shape=np.asarray(features.shape),
+            labels=np.asarray(labels),
+            feature_names=np.asarray(feature_names, dtype=str),
+        )
+        logger.debug('File saved successfully!')
+    except Exception as e:
+        logger.error(f'Unexpected error occured while saving sparse features: {e}')
+        raise
+
+
+def load_sparse_features(file_path: str) -> tuple:
+    """Loads (features, labels, feature_names) saved by save_sparse_features(), features as a CSR matrix."""
+    try:
+        logger.debug(f'Loading sparse features {os.path.relpath(file_path, ROOT_DIR)}')
+        with np.load(file_path, allow_pickle=False) as arrays:
+            features = sparse.csr_matrix((arrays['data'], arrays['indices'], arrays['indptr']), shape=tuple(arrays['shape']))
+            labels = arrays['labels']
+            feature_names = arrays['feature_names']
+        logger.debug('File Successfully loaded!')
+        return features, labels, feature_names
+    except FileNotFoundError:
+        logger.error(f'File {os.path.relpath(path=file_path, start=ROOT_DIR)} not found!')
+        raise
+    except Exception as e:
+        logger.error(f'An Unexpected error occured in load_sparse_features() function: {e}')
+        raise
+
+
+def save_table(dataframe: pd.DataFrame, file_path: str, dtypes: dict=None, compression: str='zstd') -> None:
+    """Saves a DataFrame without its index, as compressed Parquet for a `.parquet` path and CSV otherwise.
+
+    Columns are cast to `dtypes` first; Parquet stores them in its schema, so load_table() reads the
+    same types back without parsing text or inferring anything.
+    """
+    try:
+        logger.debug(f'Saving table {os.path.relpath(file_path, ROOT_DIR)}')
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        if dtypes:
+            dataframe = dataframe.astype(dtypes)
+        if file_path.endswith('.parquet'):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            pq.write_table(pa.Table.from_pandas(dataframe, preserve_index=False), file_path, compression=compression)
+        else:
+            dataframe.to_csv(file_path, index=False)
+        logger.debug('File saved successfully!')
+    except Exception as e:
+        logger.error(f'Unexpected error occured while saving table: {e}')
+        raise
+
+
+def load_table(file_path: str, columns: list=None, memory_map: bool=True) -> pd.DataFrame:
+    """Loads a table saved by save_table(), or any CSV, reading only `columns` if given.
+
+    Parquet files are memory-mapped by default, so column chunks are paged in from the OS cache
+    instead of being copied through read buffers.
+    """
+    try:
+        logger.debug(f'Loading table {os.path.relpath(path=file_path, start=ROOT_DIR)}')
+        if file_path.endswith('.parquet'):
+            import pyarrow.parquet as pq
+
+            dataframe = pq.read_table(file_path, columns=columns, memory_map=memory_map).to_pandas()
+        else:
+            dataframe = pd.read_csv(file_path, usecols=columns)
+        logger.debug('File Successfully loaded!')
+        return dataframe
+    except FileNotFoundError:
+        logger.error(f'File {os.path.relpath(path=file_path, start=ROOT_DIR)} not found!')
+        raise
+    except Exception as e:
+        logger.error(f'An Unexpected error occured in load_table() function: {e}')
+        raise
+
+
+class SparseFeatureReader:
+    """Reads row ranges of a file written by save_sparse_features() without loading the whole matrix.
+
+    np.savez stores every array uncompressed inside the zip, so a row range of the CSR data and
+    indices is a byte range of the archive that can be seeked to directly. Only the row pointers
+    and the labels, a few bytes per row, are held in memory.
+    """
+
+    # fixed size of a zip local file header, followed by the file name and the extra field
+    _LOCAL_HEADER_SIZE = 30
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._file = open(file_path, 'rb')
+        self._arrays = {}
+        with zipfile.ZipFile(file_path) as archive:
+            for info in archive.infolist():
+                if info.compress_type != zipfile.ZIP_STORED:
+                    raise ValueError(f'{file_path} is compressed, rows can only be read from np.savez files')
+                self._file.seek(info.header_offset + 26)
+                name_length, extra_length = np.frombuffer(self._file.read(4), dtype='<u2')
+                self._file.seek(info.header_offset + self._LOCAL_HEADER_SIZE + int(name_length) + int(extra_length))
+                version = np.lib.format.read_magic(self._file)
+                read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+                shape, _, dtype = read_header(self._file)
+                self._arrays[info.filename[:-len('.npy')]] = (self._file.tell(), shape, dtype)
+        self.shape = tuple(int(size) for size in self._read('shape'))
+        self.indptr = self._read('indptr')
+        self.labels = self._read('labels')
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def _read(self, name: str, start: int=0, stop: int=None) -> np.ndarray:
+        offset, shape, dtype = self._arrays[name]
+        stop = shape[0] if stop is None else stop
+        self._file.seek(offset + start * dtype.itemsize)
+        return np.frombuffer(self._file.read((stop - start) * dtype.itemsize), dtype=dtype)
+
+    def rows(self, start: int, stop: int) -> tuple:
+        """Returns (features, labels) of rows [start, stop), features as a CSR matrix."""
+        stop = min(stop, len(self))
+        first, last = int(self.indptr[start]), int(self.indptr[stop])
+        features = sparse.csr_matrix(
+            (self._read('data', first, last), self._read('indices', first, last), self.indptr[start:stop + 1] - first),
+            shape=(stop - start, self.shape[1])
+        )
+        return features, self.labels[start:stop]
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
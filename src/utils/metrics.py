@@ -0,0 +1,132 @@
+import numpy as np
+from scipy.special import expit
+
+from src.utils import SparseFeatureReader
+
+# Upper bound on bootstrap weight cells (replicates x rows) materialized at once.
+_MAX_BOOTSTRAP_CELLS = 4_000_000
+
+METRIC_NAMES = ('accuracy', 'precision', 'recall', 'f1', 'auc')
+
+
+def positive_scores(model, features) -> np.ndarray:
+    """Positive-class probabilities of a binary classifier from a single pass over `features`.
+
+    Linear models are scored with decision_function and squashed with the logistic function, which is
+    what predict_proba does for them, and `probability > 0.5` is what predict returns.
+    """
+    if hasattr(model, 'decision_function'):
+        return expit(model.decision_function(features))
+    return model.predict_proba(features)[:, 1]
+
+
+def score_features_file(model, file_path: str, chunk_size: int=10000) -> tuple[np.ndarray, np.ndarray]:
+    """Scores a features file written by save_sparse_features chunk by chunk, never holding the whole matrix.
+
+    Returns:
+        tuple: (labels, positive-class probabilities) of every row, in file order.
+    """
+    with SparseFeatureReader(file_path) as reader:
+        scores = np.empty(len(reader), dtype=np.float64)
+        for start in range(0, len(reader), chunk_size):
+            features, _ = reader.rows(start, start + chunk_size)
+            scores[start:start + features.shape[0]] = positive_scores(model, features)
+        return np.asarray(reader.labels), scores
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    # 0 where the denominator is 0, like sklearn's zero_division default
+    return np.divide(numerator, denominator, out=np.zeros(np.broadcast(numerator, denominator).shape), where=denominator != 0)
+
+
+def _weighted_metrics(weights: np.ndarray, positive: np.ndarray, n_predicted: int, group_starts: np.ndarray) -> dict:
+    """Metrics of every row of `weights`, a (replicates, rows) matrix of row counts over the score-sorted rows.
+
+    The first `n_predicted` rows are the ones predicted positive. AUC is computed over groups of
+    tied scores, counting half of the tied negatives, as the Mann-Whitney statistic.
+    """
+    positive_weights = weights * positive
+    negative_weights = weights - positive_weights
+    total = weights.sum(axis=1)
+    positives = positive_weights.sum(axis=1)
+    negatives = total - positives
+
+    true_positives = positive_weights[:, :n_predicted].sum(axis=1)
+    predicted_positives = weights[:, :n_predicted].sum(axis=1)
+    false_positives = predicted_positives - true_positives
+    true_negatives = negatives - false_positives
+
+    precision = _safe_divide(true_positives, predicted_positives)
+    recall = _safe_divide(true_positives, positives)
+
+    group_positives = np.add.reduceat(positive_weights, group_starts, axis=1)
+    group_negatives = np.add.reduceat(negative_weights, group_starts, axis=1)
+    negatives_below = negatives[:, None] - np.cumsum(group_negatives, axis=1)
+    pairs = positives * negatives
+    auc = np.divide((group_positives * (negatives_below + 0.5 * group_negatives)).sum(axis=1), pairs,
+                    out=np.full(pairs.shape, np.nan), where=pairs != 0)
+
+    return {
+        'accuracy': _safe_divide(true_positives + true_negatives, total),
+        'precision': precision,
+        'recall': recall,
+        'f1': _safe_divide(2 * precision * recall, precision + recall),
+        'auc': auc,
+    }
+
+
+def evaluate_scores(labels, scores, threshold: float=0.5, n_bootstrap: int=1000, confidence_level: float=0.95,
+                    sweep_points: int=101, random_state: int=42) -> dict:
+    """Computes the binary classification metrics of positive-class scores from a single sort.
+
+    Rows are sorted by score once. Accuracy, precision, recall and F1 at `threshold` (predicted positive
+    when the score is above it), the AUC, and the same metrics at `sweep_points` evenly spaced thresholds
+    in [0, 1] are all read off cumulative label counts of that order. Bootstrap confidence intervals
+    reuse it too: each replicate is a row of resampling counts, and a block of replicates is evaluated
+    with matrix operations.
+
+    Returns:
+        dict: The metrics, their `confidence_level` percentile intervals and the threshold sweep.
+    """
+    labels, scores = np.asarray(labels), np.asarray(scores, dtype=np.float64)
+    order = np.argsort(-scores, kind='stable')
+    sorted_scores, positive = scores[order], (labels[order] == 1)
+    n_rows = len(sorted_scores)
+    group_starts = np.flatnonzero(np.r_[True, sorted_scores[1:] != sorted_scores[:-1]])
+    # rows scored above a threshold t are the first searchsorted(-sorted_scores, -t) rows
+    n_predicted = int(np.searchsorted(-sorted_scores, -threshold, side='left'))
+
+    point = _weighted_metrics(np.ones((1, n_rows)), positive, n_predicted, group_starts)
+    report = {name: float(point[name][0]) for name in METRIC_NAMES}
+    report.update(n_samples=n_rows, threshold=threshold)
+
+    if n_bootstrap:
+        rng = np.random.default_rng(random_state)
+        block = max(1, _MAX_BOOTSTRAP_CELLS // max(n_rows, 1))
+        replicates = {name: [] for name in METRIC_NAMES}
+        for start in range(0, n_bootstrap, block):
+            size = min(block, n_bootstrap - start)
+            draws = rng.integers(0, n_rows, size=(size, n_rows)) + np.arange(size)[:, None] * n_rows
+            weights = np.bincount(draws.ravel(), minlength=size * n_rows).reshape(size, n_rows)
+            for name, values in _weighted_metrics(weights, positive, n_predicted, group_starts).items():
+                replicates[name].append(values)
+        tail = (1 - confidence_level) / 2 * 100
+        report['confidence_intervals'] = {
+            name: [float(bound) for bound in np.nanpercentile(np.concatenate(values), [tail, 100 - tail])]
+            for name, values in replicates.items()
+        }
+        report.update(bootstrap_samples=n_bootstrap, confidence_level=confidence_level)
+
+    thresholds = np.linspace(0, 1, sweep_points)
+    predicted = np.searchsorted(-sorted_scores, -thresholds, side='left')
+    true_positives = np.r_[0, np.cumsum(positive)][predicted]
+    positives = int(positive.sum())
+    precision = _safe_divide(true_positives, predicted)
+    recall = _safe_divide(true_positives, np.full(predicted.shape, positives))
+    f1 = _safe_divide(2 * precision * recall, precision + recall)
+    accuracy = (true_positives + (n_rows - positives) - (predicted - true_positives)) / max(n_rows, 1)
+    report['threshold_sweep'] = [
+        {'threshold': float(t), 'accuracy': float(a), 'precision': float(p), 'recall': float(r), 'f1': float(f)}
+        for t, a, p, r, f in zip(thresholds, accuracy, precision, recall, f1)
+    ]
+    return report
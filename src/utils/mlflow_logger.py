@@ -0,0 +1,164 @@
+import os
+import time
+import shutil
+import tempfile
+
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from mlflow.tracking import MlflowClient
+from mlflow.entities import Metric, Param, RunTag
+
+from src.logger import logging
+
+logger = logging.getLogger('MLflow Logger')
+
+# Limits of one log_batch request enforced by the tracking server.
+MAX_PARAMS_TAGS_PER_BATCH = 100
+MAX_METRICS_PER_BATCH = 1000
+MAX_ENTITIES_PER_BATCH = 1000
+
+
+def resolve_tracking_uri(remote_uri: str=None, local_tracking_dir: str='mlruns') -> str:
+    """Returns `remote_uri`, or the file store URI of `local_tracking_dir` when there is no remote to log to."""
+    if remote_uri:
+        return remote_uri
+    return Path(local_tracking_dir).resolve().as_uri()
+
+
+def batch_entities(params: list, metrics: list, tags: list):
+    """Splits params, metrics and tags into (params, metrics, tags) batches within the log_batch limits."""
+    params, metrics, tags = list(params), list(metrics), list(tags)
+    while params or metrics or tags:
+        batch_params = params[:MAX_PARAMS_TAGS_PER_BATCH]
+        batch_tags = tags[:MAX_PARAMS_TAGS_PER_BATCH - len(batch_params)]
+        batch_metrics = metrics[:min(MAX_METRICS_PER_BATCH, MAX_ENTITIES_PER_BATCH - len(batch_params) - len(batch_tags))]
+        params, tags, metrics = params[len(batch_params):], tags[len(batch_tags):], metrics[len(batch_metrics):]
+        yield batch_params, batch_metrics, batch_tags
+
+
+class BatchedRunLogger:
+    """Logs to an MLflow run with few round trips to the tracking server.
+
+    Params, metrics and tags are collected in memory and sent with log_batch on `flush()`, as few
+    requests as the batch limits allow instead of one per value. Artifact and model uploads are
+    handed to a thread pool as soon as they are logged, and `wait()` flushes and blocks until every
+    upload is done, raising the first upload error. Usable as a context manager that waits on exit.
+    """
+
+    def __init__(self, run_id: str, client: MlflowClient=None, max_workers: int=2):
+        self.run_id = run_id
+        self.client = client or MlflowClient()
+        self._params, self._metrics, self._tags = {}, {}, {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='mlflow-upload')
+        self._futures = []
+
+    def log_params(self, params: dict) -> None:
+        self._params.update({name: str(value) for name, value in params.items()})
+
+    def log_metrics(self, metrics: dict, step: int=0) -> None:
+        timestamp = int(time.time() * 1000)
+        self._metrics.update({name: Metric(name, float(value), timestamp, step) for name, value in metrics.items()})
+
+    def set_tags(self, tags: dict) -> None:
+        self._tags.update({name: str(value) for name, value in tags.items()})
+
+    def flush(self) -> int:
+        """Sends everything collected since the last flush and returns the number of log_batch calls made."""
+        params = [Param(name, value) for name, value in self._params.items()]
+        tags = [RunTag(name, value) for name, value in self._tags.items()]
+        calls = 0
+        for batch_params, batch_metrics, batch_tags in batch_entities(params, list(self._metrics.values()), tags):
+            self.client.log_batch(self.run_id, metrics=batch_metrics, params=batch_params, tags=batch_tags)
+            calls += 1
+        self._params, self._metrics, self._tags = {}, {}, {}
+        logger.debug(f'Logged {len(params)} params, {len(tags)} tags and the metrics in {calls} batch call(s)')
+        return calls
+
+    def submit(self, function, *args, **kwargs):
+        """Runs `function` on the upload pool, `wait()` surfaces its exception."""
+        future = self._executor.submit(function, *args, **kwargs)
+        self._futures.append(future)
+        return future
+
+    def log_artifact(self, local_path: str, artifact_path: str=None):
+        return self.submit(self.client.log_artifact, self.run_id, local_path, artifact_path)
+
+    def log_sklearn_model(self, model, artifact_path: str='model'):
+        """Saves the model in the MLflow sklearn format and uploads it as `artifact_path`, in the background."""
+        return self.submit(self._log_sklearn_model, model, artifact_path)
+
+    def _log_sklearn_model(self, model, artifact_path: str) -> None:
+        import mlflow.sklearn
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            model_dir = os.path.join(tmp_dir, 'model')
+            mlflow.sklearn.save_model(model, model_dir)
+            self.client.log_artifacts(self.run_id, model_dir, artifact_path)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def wait(self) -> None:
+        """Flushes, then blocks until every background upload has finished."""
+        try:
+            self.flush()
+            wait(self._futures)
+            for future in self._futures:
+                future.result()
+        finally:
+            self._futures = []
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        try:
+            if exc_type is None:
+                self.wait()
+        finally:
+            self.close()
+
+
+def sync_runs(local_client: MlflowClient, remote_client: MlflowClient, experiment_name: str, max_workers: int=2) -> list:
+    """Replays the runs of a local tracking directory on a remote tracking server.
+
+    Each run not synced yet is recreated in the remote experiment of the same name with its params,
+    latest metrics, tags and artifacts, then tagged `sync.remote_run_id` locally so it is skipped
+    next time. Returns the (local run id, remote run id) pairs synced, oldest first.
+    """
+    experiment = local_client.get_experiment_by_name(experiment_name)
+    if experiment is None:
+        return []
+    remote_experiment = remote_client.get_experiment_by_name(experiment_name)
+    remote_experiment_id = remote_experiment.experiment_id if remote_experiment else remote_client.create_experiment(experiment_name)
+
+    synced = []
+    runs = local_client.search_runs([experiment.experiment_id], order_by=['attributes.start_time ASC'])
+    for run in runs:
+        if 'sync.remote_run_id' in run.data.tags:
+            continue
+        tags = {name: value for name, value in run.data.tags.items() if not name.startswith('mlflow.') or name == 'mlflow.runName'}
+        remote_run = remote_client.create_run(remote_experiment_id, start_time=run.info.start_time)
+        remote_run_id = remote_run.info.run_id
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            with BatchedRunLogger(remote_run_id, client=remote_client, max_workers=max_workers) as run_logger:
+                run_logger.log_params(run.data.params)
+                run_logger.log_metrics(run.data.metrics)
+                run_logger.set_tags({**tags, 'sync.local_run_id': run.info.run_id})
+                artifacts_dir = local_client.download_artifacts(run.info.run_id, '', dst_path=tmp_dir)
+                if os.listdir(artifacts_dir):
+                    run_logger.submit(remote_client.log_artifacts, remote_run_id, artifacts_dir)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        remote_client.set_terminated(remote_run_id, status=run.info.status, end_time=run.info.end_time)
+        local_client.set_tag(run.info.run_id, 'sync.remote_run_id', remote_run_id)
+        logger.info(f'Synced run {run.info.run_id} as {remote_run_id}')
+        synced.append((run.info.run_id, remote_run_id))
+    return synced
@@ -0,0 +1,88 @@
+import json
+import sqlite3
+import hashlib
+
+from src.logger import logging
+
+logger = logging.getLogger('Text Cache')
+
+# SQLite allows at most 999 bound parameters per statement in older builds.
+_MAX_PARAMETERS = 900
+
+
+class PreprocessedTextCache:
+    """On-disk cache of normalized review text, content addressed by the raw text.
+
+    Every entry is keyed by a hash of the raw text and a namespace naming everything else that shapes
+    the output (preprocessor version, lemmatizer backend, stopwords), so a change to any of them misses
+    instead of returning stale text. The cache lives outside the DVC outputs and survives
+    `dvc repro --force`, so a rerun only normalizes reviews it has never seen.
+
+    Arguments:
+        file_path(str): SQLite database file, created if missing.
+        namespace(str): Identifies the preprocessing configuration, see make_namespace().
+    """
+
+    def __init__(self, file_path: str, namespace: str):
+        self.file_path = file_path
+        self.namespace = namespace
+        self._prefix = namespace.encode('utf-8') + b'\0'
+        self._connection = sqlite3.connect(file_path)
+        self._connection.execute('CREATE TABLE IF NOT EXISTS texts (key BLOB PRIMARY KEY, normalized TEXT NOT NULL) WITHOUT ROWID')
+        self._connection.execute('CREATE TABLE IF NOT EXISTS lemmas (namespace TEXT PRIMARY KEY, exported TEXT NOT NULL)')
+        self._connection.commit()
+
+    @staticmethod
+    def make_namespace(preprocessor_version: str, lemmatizer_name: str, stopwords) -> str:
+        stopwords_digest = hashlib.blake2b('\n'.join(sorted(stopwords)).encode('utf-8'), digest_size=8).hexdigest()
+        return f'{preprocessor_version}:{lemmatizer_name}:{stopwords_digest}'
+
+    def key(self, text: str) -> bytes:
+        return hashlib.blake2b(self._prefix + text.encode('utf-8'), digest_size=16).digest()
+
+    def get_many(self, keys: list) -> dict:
+        """Returns {key: normalized text} for the keys that are cached."""
+        found = {}
+        for start in range(0, len(keys), _MAX_PARAMETERS):
+            batch = keys[start:start + _MAX_PARAMETERS]
+            query = f"SELECT key, normalized FROM texts WHERE key IN ({','.join('?' * len(batch))})"
+            found.update(self._connection.execute(query, batch).fetchall())
+        return found
+
+    def put_many(self, items: dict) -> None:
+        with self._connection:
+            self._connection.executemany('INSERT OR REPLACE INTO texts (key, normalized) VALUES (?, ?)', items.items())
+
+    def normalize(self, texts: list, compute) -> tuple[list, dict]:
+        """Normalizes `texts` in order, computing only distinct texts that are not cached yet.
+
+        Arguments:
+            texts(list): Raw texts.
+            compute: Callable normalizing a list of raw texts, called at most once with the misses.
+
+        Returns:
+            tuple: The normalized texts and counts of texts, unique texts, cache hits and computed texts.
+        """
+        keys = [self.key(text) for text in texts]
+        unique = dict(zip(keys, texts))
+        found = self.get_many(list(unique))
+        missing = [key for key in unique if key not in found]
+        if missing:
+            computed = dict(zip(missing, compute([unique[key] for key in missing])))
+            self.put_many(computed)
+            found.update(computed)
+        stats = {'texts': len(texts), 'unique': len(unique), 'hits': len(unique) - len(missing), 'computed': len(missing)}
+        return [found[key] for key in keys], stats
+
+    def load_lemmas(self):
+        """Returns the lemma cache export saved for this namespace, or None."""
+        row = self._connection.execute('SELECT exported FROM lemmas WHERE namespace = ?', (self.namespace,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_lemmas(self, exported: dict) -> None:
+        """Keeps the lemmas seen so far, a rerun that computes few texts still exports all of them."""
+        with self._connection:
+            self._connection.execute('INSERT OR REPLACE INTO lemmas (namespace, exported) VALUES (?, ?)', (self.namespace, json.dumps(exported)))
+
+    def close(self) -> None:
+        self._connection.close()
@@ -0,0 +1,19 @@
+import numpy as np
+
+POSITIVE = ['great', 'loved', 'wonderful', 'brilliant', 'superb']
+NEGATIVE = ['awful', 'boring', 'terrible', 'hated', 'waste']
+NEUTRAL = ['movie', 'plot', 'cast', 'story', 'film', 'scene']
+
+
+def make_reviews(n: int, seed: int, sentiment_words: int=2, flip_rate: float=0.0) -> tuple[list, np.ndarray]:
+    """Random reviews of `sentiment_words` words of their label's class followed by four neutral words.
+
+    With `flip_rate`, that share of the reviews draws its sentiment words from the other class instead.
+    """
+    rng = np.random.default_rng(seed)
+    labels = rng.integers(0, 2, n)
+    reviews = []
+    for label in labels:
+        positive = bool(label) ^ bool(flip_rate and rng.random() < flip_rate)
+        reviews.append(' '.join(rng.choice(POSITIVE if positive else NEGATIVE, sentiment_words).tolist() + rng.choice(NEUTRAL, 4).tolist()))
+    return reviews, labels
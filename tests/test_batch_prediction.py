@@ -0,0 +1,162 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from src.exception import CustomException
+from src.entity.config_entity import BatchPredictionConfig
+from src.pipeline.predict_model import BatchPrediction, parse_blob_uri
+
+REVIEWS = [
+    "This movie was wonderful, I loved every minute of it.",
+    "A boring, badly acted waste of time.",
+    "Great cast, great script, would watch again!",
+    "Terrible. I walked out after twenty minutes.",
+    "",
+]
+
+
+class StubBlobStorage:
+    """Records uploads like AzureBlobStorage.upload_file, returning None (a handled failure) from `fail_on` on.
+
+    Blobs in `blobs` are served to download_to_file, with their ETag bumped on every overwrite.
+    """
+
+    def __init__(self, fail_on: int=None):
+        self.uploads, self.fail_on = {}, fail_on
+        self.blobs, self.etags, self.downloads = {}, {}, 0
+
+    def put_blob(self, container_name: str, file_blob_path: str, data: bytes) -> None:
+        key = (container_name, file_blob_path)
+        self.blobs[key] = data
+        self.etags[key] = f'"0x{len(self.etags) + 1}"'
+
+    def get_etag(self, file_blob_path: str, container_name: str):
+        return self.etags.get((container_name, file_blob_path))
+
+    def download_to_file(self, file_blob_path: str, container_name: str, file_save_path: str):
+        self.downloads += 1
+        os.makedirs(os.path.dirname(file_save_path), exist_ok=True)
+        with open(file_save_path, 'wb') as file:
+            file.write(self.blobs[(container_name, file_blob_path)])
+        return file_save_path
+
+    def upload_file(self, file_path: str, file_blob_path: str, container_name: str, remove: bool=True):
+        if self.fail_on is not None and len(self.uploads) >= self.fail_on:
+            return None
+        with open(file_path, 'rb') as file:
+            self.uploads[(container_name, file_blob_path)] = file.read()
+        return file_blob_path
+
+
+class BatchPredictionTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.data = pd.DataFrame({'id': [10, 11, 12, 13, 14], 'review': REVIEWS})
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def run_prediction(self, input_path: str, chunk_size: int=2, storage: StubBlobStorage=None):
+        config = BatchPredictionConfig(
+            input_path=input_path,
+            output_dir=os.path.join(self.tmp_dir, 'out'),
+            id_column='id',
+            chunk_size=chunk_size,
+            n_workers=0,
+            staging_dir=os.path.join(self.tmp_dir, 'staging'),
+        )
+        batch_prediction = BatchPrediction(config)
+        batch_prediction._blob_storage = storage
+        return batch_prediction.predict()
+
+    @staticmethod
+    def parts(output_dir: str) -> list:
+        return sorted(name for name in os.listdir(output_dir) if name.startswith('part-'))
+
+    def test_csv_is_scored_chunk_by_chunk(self):
+        input_path = os.path.join(self.tmp_dir, 'reviews.csv')
+        self.data.to_csv(input_path, index=False)
+
+        artifact = self.run_prediction(input_path)
+
+        self.assertEqual(artifact.rows, 5)
+        parts = self.parts(artifact.output_dir)
+        self.assertEqual(parts, ['part-00000.csv', 'part-00001.csv', 'part-00002.csv'])
+        predictions = pd.concat(pd.read_csv(os.path.join(artifact.output_dir, part)) for part in parts)
+        self.assertEqual(predictions['row'].tolist(), [0, 1, 2, 3, 4])
+        self.assertEqual(predictions['id'].tolist(), [10, 11, 12, 13, 14])
+        self.assertTrue(predictions['label'].isin([0, 1]).all())
+        self.assertTrue(predictions['probability'].between(0, 1).all())
+
+    def test_resume_skips_finished_parts(self):
+        input_path = os.path.join(self.tmp_dir, 'reviews.parquet')
+        self.data.to_parquet(input_path, index=False)
+        output_dir = self.run_prediction(input_path).output_dir
+        # stands in for a part scored before the crash, resuming must keep it as is
+        finished = pd.DataFrame({'row': [0, 1], 'id': [10, 11], 'label': [1, 1], 'probability': [0.5, 0.5]})
+        finished.to_parquet(os.path.join(output_dir, 'part-00000.parquet'), index=False)
+        for part in ('part-00001.parquet', 'part-00002.parquet'):
+            os.remove(os.path.join(output_dir, part))
+
+        artifact = self.run_prediction(input_path)
+
+        self.assertEqual(artifact.rows, 3)
+        self.assertTrue(pd.read_parquet(os.path.join(output_dir, 'part-00000.parquet')).equals(finished))
+        self.assertEqual(pd.read_parquet(os.path.join(output_dir, 'part-00002.parquet'))['row'].tolist(), [4])
+
+    def test_refuses_to_resume_misaligned_parts(self):
+        input_path = os.path.join(self.tmp_dir, 'reviews.csv')
+        self.data.to_csv(input_path, index=False)
+        output_dir = self.run_prediction(input_path).output_dir
+
+        with self.assertRaises(CustomException):
+            self.run_prediction(input_path, chunk_size=3)
+        self.data.iloc[:4].to_csv(input_path, index=False)
+        with self.assertRaises(CustomException):
+            self.run_prediction(input_path)
+
+        os.remove(os.path.join(output_dir, '_manifest.json'))
+        with self.assertRaises(CustomException):
+            self.run_prediction(input_path)
+
+    def test_changed_input_blob_is_downloaded_again_and_not_resumed(self):
+        storage = StubBlobStorage()
+        storage.put_blob('data', 'nightly/reviews.csv', self.data.to_csv(index=False).encode())
+        self.assertEqual(self.run_prediction('az://data/nightly/reviews.csv', storage=storage).rows, 5)
+        self.assertEqual(self.run_prediction('az://data/nightly/reviews.csv', storage=storage).rows, 0)
+        self.assertEqual(storage.downloads, 1)
+
+        storage.put_blob('data', 'nightly/reviews.csv', self.data.iloc[:3].to_csv(index=False).encode())
+        with self.assertRaises(CustomException):
+            self.run_prediction('az://data/nightly/reviews.csv', storage=storage)
+        self.assertEqual(storage.downloads, 2)
+
+    def test_failed_upload_is_not_committed_and_is_retried(self):
+        input_path = os.path.join(self.tmp_dir, 'reviews.csv')
+        self.data.to_csv(input_path, index=False)
+        config = BatchPredictionConfig(input_path=input_path, output_dir='az://predictions/nightly', id_column='id',
+                                       chunk_size=2, n_workers=0, staging_dir=os.path.join(self.tmp_dir, 'staging'))
+
+        batch_prediction = BatchPrediction(config)
+        batch_prediction._blob_storage = StubBlobStorage(fail_on=1)
+        with self.assertRaises(CustomException):
+            batch_prediction.predict()
+        output_dir = batch_prediction.local_output_dir()
+        self.assertEqual(self.parts(output_dir), ['part-00000.csv'])
+
+        storage = StubBlobStorage()
+        batch_prediction._blob_storage = storage
+        self.assertEqual(batch_prediction.predict().rows, 3)
+        self.assertEqual(sorted(storage.uploads), [('predictions', 'nightly/part-00001.csv'), ('predictions', 'nightly/part-00002.csv')])
+        self.assertEqual(self.parts(output_dir), ['part-00000.csv', 'part-00001.csv', 'part-00002.csv'])
+
+    def test_parse_blob_uri(self):
+        self.assertEqual(parse_blob_uri('az://data/nightly/reviews.csv'), ('data', 'nightly/reviews.csv'))
+
+
+if __name__ == '__main__':
+    unittest.main()
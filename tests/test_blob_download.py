@@ -0,0 +1,149 @@
+import os
+import json
+import base64
+import hashlib
+import shutil
+import tempfile
+import threading
+import unittest
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from azure.storage.blob import BlobServiceClient
+
+from src.cloud_storage.azure_storage import AzureBlobStorage
+
+ACCOUNT_NAME = 'devstoreaccount1'
+# Azurite's well-known development account key
+ACCOUNT_KEY = 'Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsuFq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw=='
+
+
+class BlobStandInHandler(BaseHTTPRequestHandler):
+    """Azurite-style stand-in serving the blob properties and ranged GETs the download path uses."""
+
+    def log_message(self, *args):
+        pass
+
+    def _headers(self, status: int, length: int, extra: dict) -> None:
+        self.send_response(status)
+        headers = {
+            'Content-Length': str(length),
+            'Content-Type': 'application/octet-stream',
+            'ETag': self.server.etag,
+            'Last-Modified': formatdate(usegmt=True),
+            'x-ms-blob-type': 'BlockBlob',
+            'x-ms-request-id': '0',
+            'x-ms-version': self.headers.get('x-ms-version', '2025-05-05'),
+            **extra,
+        }
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+
+    def _blob(self):
+        _, account, container, blob = self.path.split('?')[0].split('/', 3)
+        return self.server.blobs.get((container, blob))
+
+    def do_HEAD(self):
+        data = self._blob()
+        if data is None:
+            self._headers(404, 0, {'x-ms-error-code': 'BlobNotFound'})
+            return
+        extra = {'Content-MD5': base64.b64encode(self.server.content_md5 or hashlib.md5(data).digest()).decode()} if self.server.with_md5 else {}
+        self._headers(200, len(data), extra)
+
+    def do_GET(self):
+        data = self._blob()
+        start, end = (int(bound) for bound in self.headers['x-ms-range'].split('=')[1].split('-'))
+        with self.server.lock:
+            self.server.range_requests.append(start)
+            failing = self.server.fail_after is not None and len(self.server.range_requests) > self.server.fail_after
+        if failing:
+            self._headers(500, 0, {'x-ms-error-code': 'InternalError'})
+            return
+        if self.headers.get('If-Match') not in (None, self.server.etag):
+            self._headers(412, 0, {'x-ms-error-code': 'ConditionNotMet'})
+            return
+
+        body = data[start:end + 1]
+        extra = {'Content-Range': f'bytes {start}-{start + len(body) - 1}/{len(data)}'}
+        if self.headers.get('x-ms-range-get-content-md5') == 'true':
+            extra['Content-MD5'] = base64.b64encode(hashlib.md5(body).digest()).decode()
+        self._headers(206, len(body), extra)
+        self.wfile.write(body)
+
+
+class StreamingBlobDownloadTests(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), BlobStandInHandler)
+        self.data = os.urandom(1_000_003)
+        self.server.blobs = {('data', 'IMDB.csv'): self.data}
+        self.server.etag, self.server.with_md5, self.server.content_md5 = '"0x8D0000000000001"', True, None
+        self.server.range_requests, self.server.fail_after, self.server.lock = [], None, threading.Lock()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        client = BlobServiceClient(account_url=f'http://127.0.0.1:{self.server.server_port}/{ACCOUNT_NAME}',
+                                   credential={'account_name': ACCOUNT_NAME, 'account_key': ACCOUNT_KEY}, retry_total=0)
+        self.storage = AzureBlobStorage(blob_service_client=client)
+        self.tmp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.tmp_dir, 'ingested_data', 'data.csv')
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.tmp_dir)
+
+    def download(self):
+        return self.storage.download_to_file(file_blob_path='IMDB.csv', container_name='data', file_save_path=self.file_path,
+                                             max_concurrency=4, chunk_size=64 * 1024)
+
+    def read_file(self) -> bytes:
+        with open(self.file_path, 'rb') as file:
+            return file.read()
+
+    def test_downloads_ranges_concurrently_into_the_file(self):
+        self.assertEqual(self.download(), self.file_path)
+
+        self.assertEqual(self.read_file(), self.data)
+        self.assertEqual(sorted(self.server.range_requests), list(range(0, len(self.data), 64 * 1024)))
+        self.assertEqual(os.listdir(os.path.dirname(self.file_path)), ['data.csv'])
+
+    def test_resumes_a_failed_download(self):
+        self.server.fail_after = 5
+        self.assertIsNone(self.download())
+        self.assertFalse(os.path.exists(self.file_path))
+        with open(f'{self.file_path}.part.json') as file:
+            done = json.load(file)['done']
+        self.assertEqual(len(done), 5)
+
+        self.server.fail_after, self.server.range_requests = None, []
+        self.assertEqual(self.download(), self.file_path)
+
+        self.assertEqual(self.read_file(), self.data)
+        # only the ranges that did not complete the first time are fetched again
+        self.assertEqual(sorted(self.server.range_requests + done), list(range(0, len(self.data), 64 * 1024)))
+
+    def test_restarts_when_the_blob_changed(self):
+        self.server.fail_after = 5
+        self.download()
+        self.server.fail_after, self.server.etag = None, '"0x8D0000000000002"'
+        self.server.blobs[('data', 'IMDB.csv')] = self.data = os.urandom(500_000)
+        self.server.range_requests = []
+
+        self.assertEqual(self.download(), self.file_path)
+        self.assertEqual(self.read_file(), self.data)
+        self.assertEqual(len(self.server.range_requests), -(-len(self.data) // (64 * 1024)))
+
+    def test_md5_mismatch_discards_the_download(self):
+        self.server.content_md5 = hashlib.md5(b'something else').digest()
+        self.assertIsNone(self.download())
+        self.assertEqual(os.listdir(os.path.dirname(self.file_path)), [])
+
+    def test_missing_blob(self):
+        self.assertIsNone(self.storage.download_to_file(file_blob_path='missing.csv', container_name='data', file_save_path=self.file_path))
+        self.assertFalse(os.path.exists(self.file_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
+import json
 import unittest
-from flask_app.app import app
+from flask_app.app import app, preprocess_text, preprocess_batch, resources
 
 class FlaskAppTests(unittest.TestCase):
     
@@ -18,6 +19,51 @@ class FlaskAppTests(unittest.TestCase):
         self.assertTrue(b'Positive' in response.data or b'Negative' in response.data,
                         "Response should contain either Positive or Negative")
         
+    def test_predict_batch(self):
+        texts = ["I love this!", "This was a terrible waste of time.", "I love this!"]
+        response = self.client.post('/predict/batch', json=dict(texts=texts))
+        self.assertEqual(response.status_code, 200)
+        body = response.get_json()
+        self.assertEqual(len(body['labels']), len(texts))
+        self.assertEqual(len(body['probabilities']), len(texts))
+        self.assertTrue(all(label in (0, 1) for label in body['labels']))
+        self.assertTrue(all(0.0 <= p <= 1.0 for p in body['probabilities']))
+        self.assertEqual(body['labels'][0], body['labels'][2])
+        
+    def test_preprocess_batch_matches_single(self):
+        texts = ["I loved the movies, 10/10!", "Visit www.example.com for the worst plot ever", ""]
+        self.assertEqual(preprocess_batch(texts, batch_size=2), [preprocess_text(text) for text in texts])
+        
+    def test_predict_batch_rejects_bad_payload(self):
+        response = self.client.post('/predict/batch', json=dict(texts="not a list"))
+        self.assertEqual(response.status_code, 400)
+        
+    def test_predict_stream(self):
+        body = b'"I love this!"\n{"id": "r2", "text": "This was a terrible waste of time."}\n{"oops": 1}\n'
+        response = self.client.post('/predict/stream', data=body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 200)
+        lines = [json.loads(line) for line in response.data.splitlines()]
+        self.assertEqual([line['line'] for line in lines], [1, 2, 3])
+        self.assertEqual(lines[1]['id'], 'r2')
+        self.assertTrue(all(line['label'] in (0, 1) for line in lines[:2]))
+        self.assertIn('error', lines[2])
+        
+    def test_stage_and_input_length_metrics(self):
+        self.client.post('/predict/batch', json=dict(texts=["A stage timing check, surely never cached before."]))
+        metrics = self.client.get('/metrics').data
+        for stage in (b'clean', b'lemmatize', b'predict'):
+            self.assertIn(b'model_stage_latency_seconds_count{stage="' + stage + b'"}', metrics)
+        self.assertIn(b'model_stage_latency_seconds_bucket{le="0.0001",stage="clean"}', metrics)
+        self.assertIn(b'model_input_length_chars_count', metrics)
+        
+    def test_health_and_readiness(self):
+        self.assertEqual(self.client.get('/healthz').status_code, 200)
+        self.assertTrue(resources.wait())
+        response = self.client.get('/readyz')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['status'], 'ready')
+        self.assertIn(b'app_startup_seconds{stage="total"}', self.client.get('/metrics').data)
+        
 
 if __name__=='__main__':
     unittest.main()
\ No newline at end of file
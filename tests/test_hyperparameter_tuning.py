@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from src.utils import save_json, save_sparse_features
+from src.entity.config_entity import ModelTrainerConfig
+from src.components.model_training import ModelTrainer
+from src.components.hyperparameter_tuning import save_skipped_report, successive_halving_search, tuning_skip_reason
+from tests.synthetic_reviews import make_reviews
+
+SEARCH = {'C_grid': [0.001, 0.01, 0.1, 1, 10], 'solvers': {'l1': 'liblinear', 'l2': 'lbfgs'}, 'cv': 3, 'min_samples': 200}
+
+
+class HyperparameterTuningTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.mkdtemp()
+        # One review in four takes its sentiment word from the other class, so strong regularization underfits.
+        reviews, labels = make_reviews(1800, seed=0, sentiment_words=1, flip_rate=0.25)
+        features = HashingVectorizer(n_features=2**8, alternate_sign=False, norm=None).transform(reviews)
+        cls.file_path = os.path.join(cls.tmp_dir, 'train.npz')
+        save_sparse_features(cls.file_path, features, labels, [])
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir)
+
+    def test_halving_keeps_the_best_candidates_on_growing_subsamples(self):
+        report = successive_halving_search(self.file_path, n_jobs=1, **SEARCH)
+
+        self.assertEqual([len(rung['scores']) for rung in report['rungs']], [10, 4, 2])
+        self.assertEqual([rung['n_samples'] for rung in report['rungs']], [200, 600, 1800])
+        for rung, next_rung in zip(report['rungs'], report['rungs'][1:]):
+            survivors = {(score['penalty'], score['C']) for score in rung['scores'][:len(next_rung['scores'])]}
+            self.assertEqual({(score['penalty'], score['C']) for score in next_rung['scores']}, survivors)
+
+        best = report['best_params']
+        self.assertEqual(best['solver'], SEARCH['solvers'][best['penalty']])
+        self.assertEqual((best['penalty'], best['C']), (report['rungs'][-1]['scores'][0]['penalty'], report['rungs'][-1]['scores'][0]['C']))
+        self.assertGreater(best['C'], 0.001)
+        self.assertLess(report['fitted_rows'], report['grid_fitted_rows'] / 2)
+
+    def test_process_pool_matches_serial_search(self):
+        serial = successive_halving_search(self.file_path, n_jobs=1, **SEARCH)
+        parallel = successive_halving_search(self.file_path, n_jobs=2, **SEARCH)
+        self.assertEqual(parallel, serial)
+
+    def test_model_trainer_uses_tuned_params(self):
+        report_path = os.path.join(self.tmp_dir, 'tuning.json')
+        tuned = {'C': 10.0, 'solver': 'lbfgs', 'penalty': 'l2'}
+        save_json(dictionary={'best_params': tuned}, file_path=report_path)
+
+        config = ModelTrainerConfig(use_tuned_params=True, tuning_report_file_path=report_path)
+        self.assertEqual(ModelTrainer(feature_engineering_artifact=None, model_trainer_config=config).get_model_params(), tuned)
+
+        config = ModelTrainerConfig(use_tuned_params=False, tuning_report_file_path=report_path)
+        self.assertEqual(ModelTrainer(feature_engineering_artifact=None, model_trainer_config=config).get_model_params(), config.model_params)
+
+    def test_skipped_tuning_falls_back_to_model_params(self):
+        self.assertIsNone(tuning_skip_reason(ModelTrainerConfig(mode='in_memory', use_tuned_params=True)))
+        self.assertIsNotNone(tuning_skip_reason(ModelTrainerConfig(mode='in_memory', use_tuned_params=False)))
+        reason = tuning_skip_reason(ModelTrainerConfig(mode='out_of_core', use_tuned_params=True))
+        self.assertIn('out_of_core', reason)
+
+        report_path = os.path.join(self.tmp_dir, 'skipped', 'tuning.json')
+        save_skipped_report(file_path=report_path, reason=reason)
+        config = ModelTrainerConfig(use_tuned_params=True, tuning_report_file_path=report_path)
+        self.assertEqual(ModelTrainer(feature_engineering_artifact=None, model_trainer_config=config).get_model_params(), config.model_params)
+
+
+if __name__ == '__main__':
+    unittest.main()
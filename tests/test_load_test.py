@@ -0,0 +1,34 @@
+import unittest
+
+from scripts.load_test import compare_to_baseline, summarize
+
+
+def report(throughput: float, p99: float, errors: int=0) -> dict:
+    return {'endpoints': {'/predict': {'errors': errors, 'throughput_rps': throughput, 'p50_ms': 10.0, 'p95_ms': 20.0, 'p99_ms': p99}}}
+
+
+class LoadTestTests(unittest.TestCase):
+
+    def test_summarize_percentiles(self):
+        summary = summarize([0.001 * ms for ms in range(1, 101)], errors=2, duration=10, texts_per_request=4)
+        self.assertEqual(summary['requests'], 100)
+        self.assertEqual(summary['throughput_rps'], 10.0)
+        self.assertEqual(summary['texts_per_second'], 40.0)
+        self.assertAlmostEqual(summary['p50_ms'], 50.5)
+        self.assertLessEqual(summary['p95_ms'], summary['p99_ms'])
+
+    def test_within_tolerance_passes(self):
+        self.assertEqual(compare_to_baseline(report(90, 35), report(100, 30), tolerance=0.25), [])
+
+    def test_regressions_are_reported(self):
+        regressions = compare_to_baseline(report(70, 40, errors=3), report(100, 30), tolerance=0.25)
+        self.assertEqual(len(regressions), 3)
+        self.assertTrue(any('throughput' in regression for regression in regressions))
+        self.assertTrue(any('p99_ms' in regression for regression in regressions))
+
+    def test_endpoints_missing_from_baseline_are_ignored(self):
+        self.assertEqual(compare_to_baseline(report(1, 1000), {'endpoints': {}}), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
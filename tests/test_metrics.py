@@ -0,0 +1,86 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+from scipy import sparse
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
+
+from src.utils import save_sparse_features
+from src.utils.metrics import evaluate_scores, score_features_file
+
+
+def make_scores(n: int, seed: int) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    labels = rng.integers(0, 2, n)
+    # rounded to two decimals so many scores tie, and some sit exactly on the thresholds
+    scores = np.round(np.clip(rng.normal(0.5 + 0.2 * (labels - 0.5), 0.2), 0, 1), 2)
+    return labels, scores
+
+
+class EvaluateScoresTests(unittest.TestCase):
+
+    def test_matches_sklearn_metrics(self):
+        labels, scores = make_scores(3000, seed=0)
+        report = evaluate_scores(labels, scores, n_bootstrap=0)
+        predicted = (scores > 0.5).astype(int)
+
+        self.assertAlmostEqual(report['accuracy'], accuracy_score(labels, predicted))
+        self.assertAlmostEqual(report['precision'], precision_score(labels, predicted))
+        self.assertAlmostEqual(report['recall'], recall_score(labels, predicted))
+        self.assertAlmostEqual(report['f1'], f1_score(labels, predicted))
+        self.assertAlmostEqual(report['auc'], roc_auc_score(labels, scores))
+        self.assertNotIn('confidence_intervals', report)
+
+    def test_threshold_sweep(self):
+        labels, scores = make_scores(1000, seed=1)
+        sweep = evaluate_scores(labels, scores, n_bootstrap=0, sweep_points=11)['threshold_sweep']
+
+        self.assertEqual(len(sweep), 11)
+        for point in sweep:
+            predicted = (scores > point['threshold']).astype(int)
+            self.assertAlmostEqual(point['accuracy'], accuracy_score(labels, predicted))
+            self.assertAlmostEqual(point['precision'], precision_score(labels, predicted, zero_division=0))
+            self.assertAlmostEqual(point['recall'], recall_score(labels, predicted))
+            self.assertAlmostEqual(point['f1'], f1_score(labels, predicted, zero_division=0))
+
+    def test_bootstrap_intervals_match_resampled_metrics(self):
+        labels, scores = make_scores(500, seed=2)
+        report = evaluate_scores(labels, scores, n_bootstrap=400, random_state=7)
+        self.assertEqual(report, evaluate_scores(labels, scores, n_bootstrap=400, random_state=7))
+
+        rng = np.random.default_rng(3)
+        resampled = [rng.integers(0, len(labels), len(labels)) for _ in range(400)]
+        aucs = [roc_auc_score(labels[rows], scores[rows]) for rows in resampled]
+        for name in ('accuracy', 'precision', 'recall', 'f1', 'auc'):
+            low, high = report['confidence_intervals'][name]
+            self.assertLess(low, report[name])
+            self.assertGreater(high, report[name])
+        # same sampling distribution as resampling rows and rescoring them with sklearn
+        np.testing.assert_allclose(report['confidence_intervals']['auc'], np.percentile(aucs, [2.5, 97.5]), atol=0.01)
+
+
+class ScoreFeaturesFileTests(unittest.TestCase):
+
+    def test_chunked_scores_match_predict_proba(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            features = sparse.random(1000, 30, density=0.2, format='csr', random_state=0)
+            labels = np.random.default_rng(0).integers(0, 2, 1000)
+            model = LogisticRegression().fit(features, labels)
+            file_path = os.path.join(tmp_dir, 'test.npz')
+            save_sparse_features(file_path, features, labels, [])
+
+            loaded_labels, scores = score_features_file(model, file_path, chunk_size=128)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+        np.testing.assert_array_equal(loaded_labels, labels)
+        np.testing.assert_allclose(scores, model.predict_proba(features)[:, 1], atol=1e-12)
+        np.testing.assert_array_equal((scores > 0.5).astype(int), model.predict(features))
+
+
+if __name__ == '__main__':
+    unittest.main()
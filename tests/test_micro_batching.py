@@ -0,0 +1,84 @@
+import time
+import threading
+import unittest
+
+from flask_app.batching import MicroBatcher
+
+
+class MicroBatcherTests(unittest.TestCase):
+
+    def setUp(self):
+        self.batches = []
+
+    def process(self, texts):
+        self.batches.append(list(texts))
+        return [text.upper() for text in texts]
+
+    def submit_concurrently(self, batcher, requests, kwargs=None, stagger: float=0):
+        results = [None] * len(requests)
+        kwargs = kwargs or [{}] * len(requests)
+
+        def worker(index):
+            results[index] = batcher.submit(requests[index], **kwargs[index])
+
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(len(requests))]
+        for thread in threads:
+            thread.start()
+            time.sleep(stagger)
+        for thread in threads:
+            thread.join(timeout=5)
+        return results
+
+    def test_concurrent_requests_are_merged_and_routed_back(self):
+        batcher = MicroBatcher(self.process, max_batch_size=64, max_wait_ms=200)
+        requests = [[f'text {index}', f'other {index}'] for index in range(10)]
+
+        results = self.submit_concurrently(batcher, requests)
+
+        self.assertEqual(results, [[text.upper() for text in request] for request in requests])
+        self.assertLess(len(self.batches), len(requests))
+
+    def test_batch_closes_when_full(self):
+        batcher = MicroBatcher(self.process, max_batch_size=2, max_wait_ms=200)
+
+        self.submit_concurrently(batcher, [['a'], ['b'], ['c'], ['d']])
+
+        self.assertTrue(all(len(batch) <= 2 for batch in self.batches))
+        self.assertEqual(sorted(text for batch in self.batches for text in batch), ['a', 'b', 'c', 'd'])
+
+    def test_overflowing_request_opens_the_next_batch(self):
+        batcher = MicroBatcher(self.process, max_batch_size=4, max_wait_ms=300)
+
+        results = self.submit_concurrently(batcher, [['a', 'b', 'c'], ['d', 'e'], ['f']], stagger=0.02)
+
+        self.assertEqual(results, [['A', 'B', 'C'], ['D', 'E'], ['F']])
+        self.assertEqual(self.batches, [['a', 'b', 'c'], ['d', 'e', 'f']])
+
+    def test_requests_for_different_models_are_never_merged(self):
+        scored = []
+
+        def process(texts, bundle):
+            scored.append((bundle, list(texts)))
+            return [f'{bundle}:{text}' for text in texts]
+
+        batcher = MicroBatcher(process, max_batch_size=64, max_wait_ms=200)
+        bundles = ['v1', 'v2', 'v1', 'v2']
+        results = self.submit_concurrently(batcher, [['a'], ['b'], ['c'], ['d']], kwargs=[{'bundle': bundle} for bundle in bundles])
+
+        self.assertEqual(results, [['v1:a'], ['v2:b'], ['v1:c'], ['v2:d']])
+        for bundle, texts in scored:
+            self.assertTrue(all(bundles['abcd'.index(text)] == bundle for text in texts))
+
+    def test_errors_reach_every_caller_in_the_batch(self):
+        def failing(texts):
+            raise RuntimeError('boom')
+
+        batcher = MicroBatcher(failing, max_batch_size=8, max_wait_ms=1)
+        with self.assertRaises(RuntimeError):
+            batcher.submit(['a'])
+        with self.assertRaises(RuntimeError):
+            batcher.submit(['b'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import os
+import shutil
+import tempfile
+import unittest
+import urllib.parse
+
+import mlflow
+import numpy as np
+from mlflow.tracking import MlflowClient
+from sklearn.linear_model import LogisticRegression
+
+from src.utils.mlflow_logger import (MAX_ENTITIES_PER_BATCH, MAX_METRICS_PER_BATCH, MAX_PARAMS_TAGS_PER_BATCH,
+                                     BatchedRunLogger, batch_entities, resolve_tracking_uri, sync_runs)
+from src.entity.config_entity import ModelEvaluationConfig
+from src.components.model_evaluation import ModelEvaluation, configure_tracking
+
+
+class CountingClient(MlflowClient):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batch_calls = 0
+
+    def log_batch(self, *args, **kwargs):
+        self.batch_calls += 1
+        return super().log_batch(*args, **kwargs)
+
+
+class BatchedRunLoggerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.client = CountingClient(tracking_uri=resolve_tracking_uri(local_tracking_dir=os.path.join(self.tmp_dir, 'mlruns')))
+        self.experiment_id = self.client.create_experiment('evaluation')
+        self.run_id = self.client.create_run(self.experiment_id).info.run_id
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_batches_stay_within_limits(self):
+        batches = list(batch_entities(range(250), range(1500), range(30)))
+        for params, metrics, tags in batches:
+            self.assertLessEqual(len(params) + len(tags), MAX_PARAMS_TAGS_PER_BATCH)
+            self.assertLessEqual(len(metrics), MAX_METRICS_PER_BATCH)
+            self.assertLessEqual(len(params) + len(metrics) + len(tags), MAX_ENTITIES_PER_BATCH)
+        self.assertEqual(sum((batch[0] for batch in batches), []), list(range(250)))
+        self.assertEqual(sum((batch[1] for batch in batches), []), list(range(1500)))
+        self.assertEqual(sum((batch[2] for batch in batches), []), list(range(30)))
+
+    def test_logs_in_batches_and_uploads_in_background(self):
+        params = {f'param_{index}': index for index in range(150)}
+        metrics = {'accuracy': 0.9, 'auc': 0.95}
+        model = LogisticRegression().fit(np.array([[0.0], [1.0], [2.0], [3.0]]), [0, 0, 1, 1])
+        artifact_path = os.path.join(self.tmp_dir, 'metrics.json')
+        with open(artifact_path, 'w') as file:
+            file.write('{}')
+
+        with BatchedRunLogger(self.run_id, client=self.client) as run_logger:
+            run_logger.log_params(params)
+            run_logger.log_metrics(metrics)
+            run_logger.set_tags({'model_class': 'LogisticRegression'})
+            run_logger.log_artifact(artifact_path)
+            run_logger.log_sklearn_model(model, 'model')
+
+        self.assertEqual(self.client.batch_calls, 2)
+        data = self.client.get_run(self.run_id).data
+        self.assertEqual(data.params, {name: str(value) for name, value in params.items()})
+        self.assertEqual(data.metrics, metrics)
+        self.assertEqual(data.tags['model_class'], 'LogisticRegression')
+        artifacts = {artifact.path for artifact in self.client.list_artifacts(self.run_id)}
+        self.assertEqual(artifacts, {'metrics.json', 'model'})
+        self.assertIn('model/MLmodel', {artifact.path for artifact in self.client.list_artifacts(self.run_id, 'model')})
+
+    def test_wait_raises_upload_errors(self):
+        with BatchedRunLogger(self.run_id, client=self.client) as run_logger:
+            run_logger.log_artifact(os.path.join(self.tmp_dir, 'missing.json'))
+            with self.assertRaises(Exception):
+                run_logger.wait()
+
+    def test_sync_replays_offline_runs_once(self):
+        with BatchedRunLogger(self.run_id, client=self.client) as run_logger:
+            run_logger.log_params({'C': 1})
+            run_logger.log_metrics({'accuracy': 0.9})
+            run_logger.log_artifact(__file__)
+        self.client.set_terminated(self.run_id)
+
+        remote_client = MlflowClient(tracking_uri=resolve_tracking_uri(local_tracking_dir=os.path.join(self.tmp_dir, 'remote')))
+        synced = sync_runs(self.client, remote_client, 'evaluation')
+        self.assertEqual([local_run_id for local_run_id, _ in synced], [self.run_id])
+
+        remote_run = remote_client.get_run(synced[0][1])
+        self.assertEqual(remote_run.data.params, {'C': '1'})
+        self.assertEqual(remote_run.data.metrics, {'accuracy': 0.9})
+        self.assertEqual(remote_run.data.tags['sync.local_run_id'], self.run_id)
+        self.assertEqual(remote_run.info.status, 'FINISHED')
+        self.assertEqual([artifact.path for artifact in remote_client.list_artifacts(synced[0][1])], [os.path.basename(__file__)])
+
+        self.assertEqual(sync_runs(self.client, remote_client, 'evaluation'), [])
+
+
+class TrackingConfigurationTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.credentials = {name: os.environ.pop(name, None) for name in ('DAGSHUB_USERNAME', 'DAGSHUB_TOKEN')}
+        self.tracking_uri = mlflow.get_tracking_uri()
+
+    def tearDown(self):
+        mlflow.set_tracking_uri(self.tracking_uri)
+        for name, value in self.credentials.items():
+            if value is not None:
+                os.environ[name] = value
+        shutil.rmtree(self.tmp_dir)
+
+    def make_config(self, offline: bool) -> ModelEvaluationConfig:
+        config = ModelEvaluationConfig()
+        config.offline, config.local_tracking_dir = offline, os.path.join(self.tmp_dir, 'mlruns')
+        return config
+
+    def test_online_without_credentials_fails(self):
+        with self.assertRaises(EnvironmentError):
+            configure_tracking(self.make_config(offline=False))
+
+    def test_offline_registers_the_logged_model(self):
+        config = self.make_config(offline=True)
+        self.assertTrue(configure_tracking(config))
+        self.assertEqual(mlflow.get_tracking_uri(), resolve_tracking_uri(local_tracking_dir=config.local_tracking_dir))
+
+        model = LogisticRegression().fit(np.array([[0.0], [1.0], [2.0], [3.0]]), [0, 0, 1, 1])
+        run_id = MlflowClient().create_run(MlflowClient().create_experiment('evaluation')).info.run_id
+        with BatchedRunLogger(run_id) as run_logger:
+            run_logger.log_sklearn_model(model, config.model_artifact_path)
+
+        ModelEvaluation(model_trainer_artifact=None, feature_engineering_artifact=None, model_evaluation_config=config).register_model(
+            model_name='imdb', alias='challenger', model_info={'run_id': run_id, 'model_path': config.model_artifact_path})
+        version = MlflowClient().get_model_version_by_alias('imdb', 'challenger')
+        self.assertEqual(version.run_id, run_id)
+        # the registered source is the logged model, not a path missing from the run
+        self.assertTrue(os.path.isfile(os.path.join(urllib.parse.urlparse(version.source).path, 'MLmodel')))
+
+
+if __name__ == '__main__':
+    unittest.main()
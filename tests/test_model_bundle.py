@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from flask_app.bundle import BundleError, export_linear_bundle, read_bundle, write_bundle
+from flask_app.scorer import CompiledLinearScorer, HashedLinearScorer, scorer_from_bundle
+
+
+TRAIN_TEXTS = ["great movie loved it", "awful boring movie", "loved the great cast", "boring awful plot"]
+TRAIN_LABELS = [1, 0, 1, 0]
+
+
+class ModelBundleTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.tmp_dir.name, 'model_bundle.bin')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_round_trip_memory_maps_arrays(self):
+        arrays = {'coef': np.arange(5, dtype=np.float64), 'counts': np.array([[1, 2], [3, 4]], dtype=np.int32)}
+        content_hash = write_bundle(self.file_path, {'name': 'test'}, arrays)
+
+        metadata, loaded, loaded_hash = read_bundle(self.file_path)
+
+        self.assertEqual(metadata, {'name': 'test'})
+        self.assertEqual(loaded_hash, content_hash)
+        self.assertIsInstance(loaded['coef'], np.memmap)
+        for name, array in arrays.items():
+            np.testing.assert_array_equal(loaded[name], array)
+
+    def test_detects_corruption(self):
+        write_bundle(self.file_path, {'name': 'test'}, {'coef': np.ones(16)})
+        with open(self.file_path, 'r+b') as file:
+            file.seek(-1, os.SEEK_END)
+            file.write(b'\x00')
+
+        with self.assertRaises(BundleError):
+            read_bundle(self.file_path)
+
+    def test_exported_linear_bundle_scores_like_sklearn(self):
+        vectorizer = CountVectorizer()
+        model = LogisticRegression().fit(vectorizer.fit_transform(TRAIN_TEXTS), TRAIN_LABELS)
+        lemma_cache = {'lemmatizer': 'wordnet', 'same': ['plot'], 'changed': {'movies': 'movie'}}
+        export_linear_bundle(self.file_path, vectorizer, model, stopwords={'the', 'a'}, preprocessor_version='v1', lemma_cache=lemma_cache)
+
+        metadata, arrays, _ = read_bundle(self.file_path)
+        scorer = CompiledLinearScorer.from_bundle(metadata, arrays)
+        texts = ["great cast", "awful awful plot", "nothing known"]
+
+        self.assertEqual(metadata['n_features'], len(vectorizer.vocabulary_))
+        self.assertEqual(metadata['stopwords'], ['a', 'the'])
+        self.assertEqual((metadata['lemmatizer'], metadata['lemma_cache']), ('wordnet', lemma_cache))
+        self.assertEqual(scorer.predict(texts), CompiledLinearScorer.from_sklearn(vectorizer, model).predict(texts))
+
+    def test_hashing_bundle_has_no_vocabulary_and_scores_like_sklearn(self):
+        vectorizer = HashingVectorizer(n_features=2**10, alternate_sign=False, norm=None)
+        model = LogisticRegression().fit(vectorizer.transform(TRAIN_TEXTS), TRAIN_LABELS)
+        export_linear_bundle(self.file_path, vectorizer, model, stopwords={'the'}, preprocessor_version='v1')
+
+        metadata, arrays, _ = read_bundle(self.file_path)
+        scorer = scorer_from_bundle(metadata, arrays)
+        texts = ["great cast", "awful awful plot", "nothing known"]
+
+        self.assertEqual((metadata['vectorizer'], metadata['n_features']), ('hashing', 2**10))
+        self.assertNotIn('vocabulary', metadata)
+        self.assertIsInstance(scorer, HashedLinearScorer)
+        np.testing.assert_allclose(scorer.decision_function(texts), model.decision_function(vectorizer.transform(texts)), atol=1e-9)
+
+        with self.assertRaises(BundleError):
+            export_linear_bundle(self.file_path, HashingVectorizer(n_features=2**10), model, stopwords=set(), preprocessor_version='v1')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+
+from flask_app.reloader import ModelBundle, ModelReloader, file_fingerprint
+
+
+class ModelReloaderTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.paths = [os.path.join(self.tmp_dir.name, name) for name in ('model.txt', 'vectorizer.txt')]
+        self.write('v1', 'v1')
+        self.swapped = []
+        self.loads = 0
+        self.reloader = ModelReloader(
+            load_bundle=self.load, validate=self.validate, watch_paths=self.paths,
+            poll_interval=0, on_swap=self.swapped.append
+        )
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, model, vectorizer):
+        for path, content in zip(self.paths, (model, vectorizer)):
+            with open(path, 'w') as file:
+                file.write(content)
+            # bump mtime explicitly so back-to-back writes are always distinguishable
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def load(self):
+        self.loads += 1
+        version = file_fingerprint(self.paths)
+        model, vectorizer = (open(path).read() for path in self.paths)
+        return ModelBundle(model=model, vectorizer=vectorizer, stopwords=set(), scorer=None, version=version, n_features=0, classes=[])
+
+    def validate(self, bundle):
+        if bundle.model != bundle.vectorizer:
+            raise ValueError('model and vectorizer versions differ')
+
+    def test_swaps_model_and_vectorizer_together_after_settling(self):
+        self.write('v2', 'v2')
+
+        self.assertFalse(self.reloader.check_for_update())
+        self.assertEqual(self.reloader.bundle.model, 'v1')
+
+        self.assertTrue(self.reloader.check_for_update())
+        self.assertEqual((self.reloader.bundle.model, self.reloader.bundle.vectorizer), ('v2', 'v2'))
+        self.assertEqual(self.swapped, [self.reloader.bundle])
+
+    def test_keeps_serving_when_new_bundle_fails_validation(self):
+        old_bundle = self.reloader.bundle
+        self.write('v2', 'v1')
+
+        self.reloader.check_for_update()
+        self.assertFalse(self.reloader.check_for_update())
+        self.assertIs(self.reloader.bundle, old_bundle)
+        self.assertEqual(self.swapped, [])
+
+    def test_rejected_version_is_not_reloaded_until_files_change(self):
+        self.write('v2', 'v1')
+
+        for _ in range(5):
+            self.assertFalse(self.reloader.check_for_update())
+        self.assertEqual(self.loads, 2)
+
+        self.write('v3', 'v3')
+        self.reloader.check_for_update()
+        self.assertTrue(self.reloader.check_for_update())
+        self.assertEqual(self.reloader.bundle.model, 'v3')
+        self.assertEqual(self.loads, 3)
+
+    def test_unchanged_files_do_not_reload(self):
+        old_bundle = self.reloader.bundle
+        self.assertFalse(self.reloader.check_for_update())
+        self.assertFalse(self.reloader.check_for_update())
+        self.assertIs(self.reloader.bundle, old_bundle)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import re
+import string
+import unittest
+
+import pandas as pd
+
+from flask_app.normalizer import (CachedLemmatizer, IdentityLemmatizer, cache_lemmas, load_lemmatizer, normalize_text,
+                                  normalize_texts, normalize_texts_parallel, tokenize)
+
+TRICKY_TEXTS = [
+    "I LOVED it!!! 10/10, see https://imdb.com/title/tt123 or www.example.com.",
+    "ht1tp://not-a-url and HTTP://UPPER.case stays",
+    "Arabic؛semicolon, tabs\tand\nnewlines,   spaces",
+    "digits inside w0rds and ٣ unicode digits, don't-stop",
+    "",
+    "   ",
+]
+
+
+class SuffixLemmatizer(IdentityLemmatizer):
+    """Context-free stand-in backend that strips a trailing 's' and counts its calls."""
+
+    name = 'suffix'
+
+    def __init__(self):
+        self.calls = 0
+
+    def lemmatize(self, tokens):
+        self.calls += len(tokens)
+        return [token[:-1] if token.endswith('s') else token for token in tokens]
+
+
+def legacy_clean(text, stopwords):
+    """The five regex passes training and serving used before flask_app.normalizer."""
+    text = re.sub(r'https?://\S+|www\.\S+', '', text)
+    text = re.sub(r'\d+', '', text)
+    text = text.lower()
+    text = re.sub(rf"[{re.escape(string.punctuation)}]", ' ', text)
+    text = text.replace('؛', "")
+    text = re.sub(r'\s+', ' ', text).strip()
+    return [word for word in text.split() if word not in stopwords]
+
+
+class NormalizerTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.reviews = pd.read_csv('notebooks/IMDB.csv')['review'].astype(str).tolist()[:200]
+        cls.stopwords = {'the', 'a', 'and', 'it', 'or', 'is'}
+
+    def test_single_pass_tokenize_matches_legacy_cleaning(self):
+        for text in TRICKY_TEXTS + self.reviews:
+            self.assertEqual(tokenize(text, self.stopwords), legacy_clean(text, self.stopwords), text)
+
+    def test_batch_matches_single(self):
+        lemmatizer = IdentityLemmatizer()
+        self.assertEqual(
+            normalize_texts(TRICKY_TEXTS, self.stopwords, lemmatizer),
+            [normalize_text(text, self.stopwords, lemmatizer) for text in TRICKY_TEXTS]
+        )
+
+    def test_spacy_backend_keeps_token_boundaries(self):
+        lemmatizer = load_lemmatizer('spacy')
+        texts = self.reviews[:20] + TRICKY_TEXTS
+        batched = normalize_texts(texts, self.stopwords, lemmatizer, batch_size=8)
+        self.assertEqual(batched, [normalize_text(text, self.stopwords, lemmatizer) for text in texts])
+        for text, normalized in zip(texts, batched):
+            self.assertEqual(len(normalized.split()), len(tokenize(text, self.stopwords)))
+
+    def test_lemma_cache_matches_backend_and_counts_hits(self):
+        backend = SuffixLemmatizer()
+        cached = CachedLemmatizer(SuffixLemmatizer(), max_size=1000)
+        token_lists = [tokenize(review, self.stopwords) for review in self.reviews]
+
+        self.assertEqual(cached.lemmatize_many(token_lists), [backend.lemmatize(tokens) for tokens in token_lists])
+        self.assertEqual(cached.lookups, sum(len(tokens) for tokens in token_lists))
+        self.assertEqual(cached.misses, cached.lemmatizer.calls)
+        self.assertLess(cached.misses, cached.lookups / 2)
+        self.assertGreater(cached.hit_rate, 0.5)
+
+    def test_lemma_cache_is_bounded(self):
+        cached = CachedLemmatizer(SuffixLemmatizer(), max_size=3)
+        self.assertEqual(cached.lemmatize(['cats', 'dogs', 'birds', 'fish', 'cows']), ['cat', 'dog', 'bird', 'fish', 'cow'])
+        self.assertEqual(len(cached), 3)
+        cached.lemmatize(['cows'])
+        self.assertEqual(cached.misses, 6)
+
+    def test_lemma_cache_export_and_warm(self):
+        trained = CachedLemmatizer(SuffixLemmatizer())
+        trained.lemmatize(['movies', 'plot', 'actors'])
+        exported = trained.export()
+        self.assertEqual(exported['same'], ['plot'])
+
+        serving = CachedLemmatizer(SuffixLemmatizer())
+        serving.warm(exported)
+        self.assertEqual(serving.lemmatize(['actors', 'plot', 'movies']), ['actor', 'plot', 'movie'])
+        self.assertEqual((serving.misses, serving.lemmatizer.calls), (0, 0))
+        with self.assertRaises(ValueError):
+            CachedLemmatizer(IdentityLemmatizer()).warm(exported)
+
+    def test_parallel_matches_serial_in_order(self):
+        serial = normalize_texts(self.reviews, self.stopwords, IdentityLemmatizer())
+        cached = CachedLemmatizer(IdentityLemmatizer())
+        parallel = normalize_texts_parallel(self.reviews, self.stopwords, cached, n_jobs=2, chunk_size=30)
+        self.assertEqual(parallel, serial)
+        # lemmas cached by the workers are merged back for save_lemma_cache()
+        self.assertEqual(cached.lookups, sum(len(text.split()) for text in serial))
+        self.assertEqual(len(cached), len({token for text in serial for token in text.split()}))
+
+    def test_contextual_lemmatizer_is_not_cached(self):
+        spacy_lemmatizer = load_lemmatizer('spacy')
+        self.assertIs(cache_lemmas(spacy_lemmatizer, max_size=1000), spacy_lemmatizer)
+        self.assertIsInstance(cache_lemmas(IdentityLemmatizer(), max_size=1000), CachedLemmatizer)
+        with self.assertRaises(ValueError):
+            CachedLemmatizer(spacy_lemmatizer)
+
+    def test_training_and_serving_produce_identical_tokens(self):
+        try:
+            from src.components import data_transformation
+        except LookupError as e:
+            self.skipTest(f'NLTK data for the training lemmatizer is not installed: {e}')
+        from flask_app import app as serving
+
+        serving.resources.wait()
+        if serving.lemmatizer.name != data_transformation.lemmatizer.name:
+            self.skipTest(f'Serving runs LEMMATIZER={serving.lemmatizer.name}, training {data_transformation.lemmatizer.name}')
+        series = pd.Series(self.reviews)
+        self.assertEqual(
+            data_transformation.apply_preprocessing(series).tolist(),
+            [serving.preprocess_text(review) for review in self.reviews]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from flask_app.bundle import export_linear_bundle, read_bundle
+from flask_app.scorer import scorer_from_bundle
+from src.utils import SparseFeatureReader, save_sparse_features
+from src.components.model_training import train_out_of_core
+from tests.synthetic_reviews import make_reviews
+
+
+class OutOfCoreTrainingTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.vectorizer = HashingVectorizer(n_features=2**10, alternate_sign=False, norm=None)
+        reviews, self.labels = make_reviews(1000, seed=0)
+        self.features = self.vectorizer.transform(reviews)
+        self.file_path = os.path.join(self.tmp_dir, 'train.npz')
+        save_sparse_features(self.file_path, self.features, self.labels, [])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_reader_returns_row_ranges(self):
+        with SparseFeatureReader(self.file_path) as reader:
+            self.assertEqual(len(reader), 1000)
+            features, labels = reader.rows(990, 1100)
+        self.assertEqual((features != self.features[990:]).nnz, 0)
+        np.testing.assert_array_equal(labels, self.labels[990:])
+
+    def test_matches_in_memory_accuracy_and_is_reproducible(self):
+        params = {'alpha': 0.0001, 'penalty': 'l2'}
+        model = train_out_of_core(self.file_path, params, epochs=3, chunk_size=128)
+        again = train_out_of_core(self.file_path, params, epochs=3, chunk_size=128)
+        np.testing.assert_array_equal(model.coef_, again.coef_)
+
+        reviews, labels = make_reviews(300, seed=1)
+        test_features = self.vectorizer.transform(reviews)
+        in_memory = LogisticRegression().fit(self.features, self.labels)
+        self.assertGreaterEqual(model.score(test_features, labels), in_memory.score(test_features, labels) - 0.02)
+
+    def test_model_exports_to_the_serving_bundle(self):
+        model = train_out_of_core(self.file_path, {'alpha': 0.0001}, epochs=2, chunk_size=256)
+        bundle_path = os.path.join(self.tmp_dir, 'model_bundle.bin')
+        export_linear_bundle(bundle_path, self.vectorizer, model, stopwords=set(), preprocessor_version='v1')
+
+        reviews, _ = make_reviews(20, seed=2)
+        scorer = scorer_from_bundle(*read_bundle(bundle_path)[:2])
+        _, probabilities = scorer.predict(reviews)
+        np.testing.assert_allclose(probabilities, model.predict_proba(self.vectorizer.transform(reviews))[:, 1], atol=1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import time
+import threading
+import unittest
+
+from prometheus_client import CollectorRegistry, Counter
+
+from flask_app.cache import PredictionCache
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class PredictionCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = CollectorRegistry()
+        self.hits = Counter('hits', 'hits', registry=self.registry)
+        self.misses = Counter('misses', 'misses', registry=self.registry)
+        self.evictions = Counter('evictions', 'evictions', ['reason'], registry=self.registry)
+        self.clock = FakeClock()
+        self.calls = []
+
+    def make_cache(self, **kwargs):
+        return PredictionCache(hits=self.hits, misses=self.misses, evictions=self.evictions, clock=self.clock, **kwargs)
+
+    def compute(self, texts):
+        self.calls.append(list(texts))
+        return [text.upper() for text in texts]
+
+    def sample(self, name, **labels):
+        return self.registry.get_sample_value(name, labels)
+
+    def test_hits_skip_computation(self):
+        cache = self.make_cache(max_size=10)
+        self.assertEqual(cache.get_many(['a', 'b', 'a'], self.compute), ['A', 'B', 'A'])
+        self.assertEqual(cache.get_many(['a  ', ' b', 'c'], self.compute), ['A', 'B', 'C'])
+
+        self.assertEqual(self.calls, [['a', 'b'], ['c']])
+        self.assertEqual(self.sample('misses_total'), 3)
+        self.assertEqual(self.sample('hits_total'), 3)
+
+    def test_evicts_least_recently_used_and_expired(self):
+        cache = self.make_cache(max_size=2, ttl=10)
+        cache.get_many(['a', 'b'], self.compute)
+        cache.get_many(['a'], self.compute)
+        cache.get_many(['c'], self.compute)
+        self.assertEqual(self.sample('evictions_total', reason='size'), 1)
+
+        cache.get_many(['a'], self.compute)
+        self.assertEqual(self.calls[-1], ['c'])
+
+        self.clock.now = 11
+        cache.get_many(['a'], self.compute)
+        self.assertEqual(self.calls[-1], ['a'])
+        self.assertEqual(self.sample('evictions_total', reason='expired'), 1)
+
+    def test_concurrent_identical_requests_compute_once(self):
+        cache = self.make_cache(max_size=10)
+        started, release = threading.Event(), threading.Event()
+
+        def slow_compute(texts):
+            started.set()
+            release.wait(timeout=5)
+            return self.compute(texts)
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(cache.get_many(['same'], slow_compute)))
+        leader.start()
+        started.wait(timeout=5)
+        followers = [threading.Thread(target=lambda: results.append(cache.get_many(['same'], self.compute))) for _ in range(4)]
+        for follower in followers:
+            follower.start()
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(timeout=5)
+
+        self.assertEqual(results, [['SAME']] * 5)
+        self.assertEqual(self.calls, [['same']])
+
+    def test_failed_computation_is_not_cached(self):
+        cache = self.make_cache(max_size=10)
+
+        def failing(texts):
+            raise RuntimeError('boom')
+
+        with self.assertRaises(RuntimeError):
+            cache.get_many(['a'], failing)
+        self.assertEqual(cache.get_many(['a'], self.compute), ['A'])
+
+    def test_short_computation_fails_every_waiter(self):
+        cache = self.make_cache(max_size=10)
+        started, release = threading.Event(), threading.Event()
+
+        def short_compute(texts):
+            started.set()
+            release.wait(timeout=5)
+            return self.compute(texts)[:1]
+
+        errors = []
+
+        def call(compute):
+            try:
+                cache.get_many(['a', 'b'], compute)
+            except ValueError as e:
+                errors.append(e)
+
+        leader = threading.Thread(target=call, args=(short_compute,), daemon=True)
+        leader.start()
+        started.wait(timeout=5)
+        follower = threading.Thread(target=call, args=(self.compute,), daemon=True)
+        follower.start()
+        time.sleep(0.1)  # let the follower join the leader's in-flight computation
+        release.set()
+        for thread in (leader, follower):
+            thread.join(timeout=5)
+            self.assertFalse(thread.is_alive())
+
+        self.assertEqual(len(errors), 2)
+        # nothing was cached or left in flight, the next caller computes both texts
+        self.assertEqual(cache.get_many(['a', 'b'], self.compute), ['A', 'B'])
+        self.assertEqual(self.calls, [['a', 'b'], ['a', 'b']])
+
+
+if __name__ == '__main__':
+    unittest.main()
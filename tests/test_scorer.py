@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from flask_app.scorer import CompiledLinearScorer, HashedLinearScorer, compile_scorer
+
+
+TRAIN_TEXTS = [
+    "great movie loved every minute", "wonderful acting great story", "brilliant film loved it",
+    "terrible plot awful acting", "boring movie hated it", "awful waste of time",
+    "great cast but boring story", "loved the music hated the ending",
+]
+TRAIN_LABELS = [1, 1, 1, 0, 0, 0, 0, 1]
+TEST_TEXTS = [
+    "great great great", "awful boring", "", "unknown words only", "Loved the GREAT film",
+    "boring boring great", "a b c", "time story movie plot",
+]
+
+
+class CompiledLinearScorerTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.vectorizer = CountVectorizer(max_features=10)
+        features = cls.vectorizer.fit_transform(TRAIN_TEXTS)
+        cls.model = LogisticRegression(C=10).fit(features, TRAIN_LABELS)
+        cls.scorer = CompiledLinearScorer.from_sklearn(cls.vectorizer, cls.model)
+
+    def test_matches_sklearn_predictions(self):
+        features = self.vectorizer.transform(TEST_TEXTS)
+        labels, probabilities = self.scorer.predict(TEST_TEXTS)
+
+        self.assertEqual(labels, self.model.predict(features).tolist())
+        np.testing.assert_allclose(probabilities, self.model.predict_proba(features)[:, 1], rtol=1e-9, atol=1e-12)
+        np.testing.assert_allclose(self.scorer.decision_function(TEST_TEXTS), self.model.decision_function(features), atol=1e-9)
+
+    def test_save_and_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'scorer.json')
+            self.scorer.save(file_path)
+            loaded = CompiledLinearScorer.load(file_path)
+
+        self.assertEqual(loaded.predict(TEST_TEXTS), self.scorer.predict(TEST_TEXTS))
+
+    def test_rejects_unsupported_vectorizer(self):
+        vectorizer = CountVectorizer(ngram_range=(1, 2)).fit(TRAIN_TEXTS)
+        model = LogisticRegression().fit(vectorizer.transform(TRAIN_TEXTS), TRAIN_LABELS)
+        with self.assertRaises(ValueError):
+            CompiledLinearScorer.from_sklearn(vectorizer, model)
+
+
+class HashedLinearScorerTests(unittest.TestCase):
+
+    def fit(self, **vectorizer_params):
+        vectorizer = HashingVectorizer(n_features=64, norm=None, **vectorizer_params)
+        model = LogisticRegression(C=10).fit(vectorizer.transform(TRAIN_TEXTS), TRAIN_LABELS)
+        return vectorizer, model
+
+    def test_matches_sklearn_with_and_without_alternate_sign(self):
+        # 64 columns force hash collisions, and sign flips with alternate_sign
+        for alternate_sign in (True, False):
+            vectorizer, model = self.fit(alternate_sign=alternate_sign)
+            scorer = compile_scorer(vectorizer, model)
+            self.assertIsInstance(scorer, HashedLinearScorer)
+
+            features = vectorizer.transform(TEST_TEXTS)
+            np.testing.assert_allclose(scorer.decision_function(TEST_TEXTS), model.decision_function(features), atol=1e-9)
+            self.assertEqual(scorer.predict(TEST_TEXTS)[0], model.predict(features).tolist())
+
+    def test_uncached_tokens_score_the_same(self):
+        vectorizer, model = self.fit(alternate_sign=True)
+        scorer = HashedLinearScorer.from_sklearn(vectorizer, model)
+        scorer.max_cached_tokens = 2
+        np.testing.assert_allclose(scorer.decision_function(TEST_TEXTS), model.decision_function(vectorizer.transform(TEST_TEXTS)), atol=1e-9)
+        self.assertEqual(len(scorer.weights), 2)
+
+    def test_save_and_load_round_trip(self):
+        scorer = compile_scorer(*self.fit())
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'scorer.json')
+            scorer.save(file_path)
+            loaded = HashedLinearScorer.load(file_path)
+
+        self.assertEqual(loaded.predict(TEST_TEXTS), scorer.predict(TEST_TEXTS))
+
+    def test_rejects_normalized_features(self):
+        vectorizer = HashingVectorizer(n_features=64)
+        model = LogisticRegression().fit(vectorizer.transform(TRAIN_TEXTS), TRAIN_LABELS)
+        with self.assertRaises(ValueError):
+            compile_scorer(vectorizer, model)
+
+
+if __name__ == '__main__':
+    unittest.main()
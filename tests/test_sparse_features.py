@@ -0,0 +1,56 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from src.utils import load_sparse_features, save_sparse_features
+from src.components.feature_engineering import hash_features
+
+REVIEWS = ['great movie', 'bad plot bad acting', 'great acting', 'boring bad movie']
+LABELS = [1, 0, 1, 0]
+
+
+class SparseFeaturesTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.tmp_dir, 'feature', 'train.npz')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_round_trip_stays_sparse(self):
+        vectorizer = CountVectorizer()
+        features = vectorizer.fit_transform(REVIEWS)
+        save_sparse_features(self.file_path, features, np.asarray(LABELS), vectorizer.get_feature_names_out())
+
+        loaded, labels, feature_names = load_sparse_features(self.file_path)
+        self.assertTrue(sparse.isspmatrix_csr(loaded))
+        self.assertEqual((loaded != features).nnz, 0)
+        np.testing.assert_array_equal(labels, LABELS)
+        self.assertEqual(list(feature_names), list(vectorizer.get_feature_names_out()))
+
+    def test_model_trained_on_loaded_features_matches_dense(self):
+        features = CountVectorizer().fit_transform(REVIEWS)
+        save_sparse_features(self.file_path, features, np.asarray(LABELS), [str(i) for i in range(features.shape[1])])
+        loaded, labels, _ = load_sparse_features(self.file_path)
+
+        sparse_model = LogisticRegression(solver='liblinear').fit(loaded, labels)
+        dense_model = LogisticRegression(solver='liblinear').fit(features.toarray(), labels)
+        np.testing.assert_allclose(sparse_model.predict_proba(loaded), dense_model.predict_proba(features.toarray()))
+
+    def test_parallel_hashing_matches_serial_in_order(self):
+        vectorizer = HashingVectorizer(n_features=2**12, norm=None)
+        texts = np.asarray(REVIEWS * 5)
+        parallel = hash_features(vectorizer, texts, n_jobs=2, chunk_size=3)
+        self.assertTrue(sparse.isspmatrix_csr(parallel))
+        self.assertEqual((parallel != vectorizer.transform(texts)).nnz, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
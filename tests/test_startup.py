@@ -0,0 +1,36 @@
+import threading
+import unittest
+
+from flask_app.startup import ResourceLoader
+
+
+class ResourceLoaderTests(unittest.TestCase):
+
+    def test_wait_loads_in_caller_thread_when_not_started(self):
+        calls = []
+        loader = ResourceLoader(lambda: calls.append(threading.current_thread()))
+        self.assertTrue(loader.wait())
+        loader.wait()
+        self.assertEqual(calls, [threading.current_thread()])
+
+    def test_not_ready_while_background_load_runs(self):
+        release = threading.Event()
+        loader = ResourceLoader(lambda: release.wait(5))
+        loader.start(background=True)
+        self.assertFalse(loader.wait(timeout=0))
+        self.assertFalse(loader.ready)
+        release.set()
+        self.assertTrue(loader.wait(timeout=5))
+
+    def test_failed_load_is_reported(self):
+        def load():
+            raise OSError('models/model_bundle.bin missing')
+
+        loader = ResourceLoader(load)
+        self.assertFalse(loader.wait())
+        self.assertTrue(loader.failed)
+        self.assertIsInstance(loader.error, OSError)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import io
+import json
+import unittest
+
+from flask_app.streaming import iter_records, stream_predictions
+
+
+def fake_predict(texts):
+    return [int('good' in text) for text in texts], [0.9 if 'good' in text else 0.1 for text in texts]
+
+
+class StreamingTests(unittest.TestCase):
+
+    def test_records_accept_strings_and_objects(self):
+        stream = io.BytesIO(b'"a good film"\n\n{"id": 7, "text": "bad"}\nnot json\n{"text": 3}\n')
+        records = list(iter_records(stream))
+        self.assertEqual([record[:3] for record in records[:2]], [(1, None, 'a good film'), (3, 7, 'bad')])
+        self.assertEqual([record[0] for record in records[2:]], [4, 5])
+        self.assertTrue(all(record[3] for record in records[2:]))
+
+    def test_overlong_line_is_skipped_without_buffering(self):
+        stream = io.BytesIO(b'"' + b'x' * 100 + b'"\n"good"\n')
+        records = list(iter_records(stream, max_line_bytes=16))
+        self.assertIn('longer than 16 bytes', records[0][3])
+        self.assertEqual(records[1][:3], (2, None, 'good'))
+
+    def test_predictions_are_streamed_in_batches_in_order(self):
+        calls = []
+
+        def predict(texts):
+            calls.append(len(texts))
+            return fake_predict(texts)
+
+        lines = b''.join(f'{json.dumps(text)}\n'.encode() for text in ['good', 'bad', 'good', 'bad', 'good'])
+        chunks = list(stream_predictions(iter_records(io.BytesIO(lines + b'[]\n')), predict, batch_size=2))
+        outputs = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+
+        self.assertEqual(calls, [2, 2, 1])
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual([output['line'] for output in outputs], [1, 2, 3, 4, 5, 6])
+        self.assertEqual([output.get('label') for output in outputs], [1, 0, 1, 0, 1, None])
+        self.assertIn('error', outputs[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
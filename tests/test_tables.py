@@ -0,0 +1,47 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from src.utils import load_table, save_table
+
+DTYPES = {'review': 'str', 'sentiment': 'int8'}
+
+
+class TableTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.data = pd.DataFrame({'review': ['great movie', '', 'bad plot'], 'sentiment': [1, 0, 0]}, index=[7, 3, 9])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_parquet_round_trip_keeps_dtypes_and_drops_index(self):
+        file_path = os.path.join(self.tmp_dir, 'transformed_data', 'train.parquet')
+        save_table(self.data, file_path, dtypes=DTYPES)
+
+        loaded = load_table(file_path)
+        self.assertEqual(list(loaded.columns), ['review', 'sentiment'])
+        self.assertEqual(str(loaded['sentiment'].dtype), 'int8')
+        self.assertEqual(loaded['review'].tolist(), ['great movie', '', 'bad plot'])
+        self.assertEqual(loaded.index.tolist(), [0, 1, 2])
+
+    def test_column_subset(self):
+        file_path = os.path.join(self.tmp_dir, 'train.parquet')
+        save_table(self.data, file_path, dtypes=DTYPES)
+        for memory_map in (True, False):
+            loaded = load_table(file_path, columns=['sentiment'], memory_map=memory_map)
+            self.assertEqual(list(loaded.columns), ['sentiment'])
+            self.assertEqual(loaded['sentiment'].tolist(), [1, 0, 0])
+
+    def test_csv_is_supported_by_extension(self):
+        file_path = os.path.join(self.tmp_dir, 'train.csv')
+        save_table(self.data, file_path)
+        self.assertEqual(load_table(file_path, columns=['sentiment'])['sentiment'].tolist(), [1, 0, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from flask_app.normalizer import IdentityLemmatizer, normalize_texts
+from src.utils.text_cache import PreprocessedTextCache
+
+STOPWORDS = {'the', 'a', 'was'}
+REVIEWS = [
+    "The movie was wonderful!",
+    "A boring waste of time.",
+    "The movie was wonderful!",
+    "Great cast, great script.",
+]
+
+
+class PreprocessedTextCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.tmp_dir, 'cache.sqlite')
+        self.namespace = PreprocessedTextCache.make_namespace('v1', 'none', STOPWORDS)
+        self.calls = []
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def compute(self, texts):
+        self.calls.append(list(texts))
+        return normalize_texts(texts, STOPWORDS, IdentityLemmatizer())
+
+    def test_dedupes_and_reuses_entries_across_runs(self):
+        cache = PreprocessedTextCache(self.file_path, self.namespace)
+        texts, stats = cache.normalize(REVIEWS, self.compute)
+        cache.close()
+        self.assertEqual(texts, normalize_texts(REVIEWS, STOPWORDS, IdentityLemmatizer()))
+        self.assertEqual(stats, {'texts': 4, 'unique': 3, 'hits': 0, 'computed': 3})
+
+        cache = PreprocessedTextCache(self.file_path, self.namespace)
+        texts_again, stats = cache.normalize(REVIEWS + ['New review here'], self.compute)
+        cache.close()
+        self.assertEqual(texts_again[:4], texts)
+        self.assertEqual(stats, {'texts': 5, 'unique': 4, 'hits': 3, 'computed': 1})
+        self.assertEqual(self.calls[-1], ['New review here'])
+
+    def test_other_preprocessing_configuration_misses(self):
+        cache = PreprocessedTextCache(self.file_path, self.namespace)
+        cache.normalize(REVIEWS, self.compute)
+        cache.close()
+
+        for namespace in (PreprocessedTextCache.make_namespace('v2', 'none', STOPWORDS),
+                          PreprocessedTextCache.make_namespace('v1', 'wordnet', STOPWORDS),
+                          PreprocessedTextCache.make_namespace('v1', 'none', STOPWORDS | {'movie'})):
+            cache = PreprocessedTextCache(self.file_path, namespace)
+            _, stats = cache.normalize(REVIEWS, self.compute)
+            cache.close()
+            self.assertEqual(stats['hits'], 0, namespace)
+
+    def test_lemmas_round_trip(self):
+        cache = PreprocessedTextCache(self.file_path, self.namespace)
+        self.assertIsNone(cache.load_lemmas())
+        exported = {'lemmatizer': 'none', 'same': ['movie'], 'changed': {}}
+        cache.save_lemmas(exported)
+        self.assertEqual(cache.load_lemmas(), exported)
+        cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()